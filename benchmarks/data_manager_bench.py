@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for DataManager operations on synthetic detection histories
+
+Run from the project root:
+    python -m benchmarks.data_manager_bench --output results.json
+    python -m benchmarks.data_manager_bench --baseline results.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Not available on Windows
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.utils.data_manager import DataManager, TIME_FILTERS
+from src.utils.render_stats import RenderStats
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+DEFAULT_SEED = 1337
+DEFAULT_REPEATS = 5  # Runs per size; results are the median of each metric across runs
+HISTORY_DAYS = 45  # Long enough that clear_old_data(30) has work to do
+
+# Metrics compared against a baseline; higher is worse for all of them
+COMPARED_METRICS = ["p50_ms", "p95_ms", "peak_kb"]
+
+# Timer and allocator noise: smaller absolute changes are never reported as regressions
+DEFAULT_MIN_DELTA_MS = 0.5
+DEFAULT_MIN_DELTA_KB = 64
+
+def generate_history(path, size, seed=DEFAULT_SEED, now=None):
+    """Write a deterministic synthetic detection history, newest first"""
+    rng = random.Random(seed)
+    now = time.time() if now is None else now
+    
+    detections = []
+    for i in range(size):
+        # Offsets from now are deterministic, so filters select the same records every run
+        detection_time = now - rng.random() * HISTORY_DAYS * 86400
+        detections.append({
+            "id": f"DET_{int(detection_time)}_{i}",
+            "timestamp": detection_time,
+            "latitude": 28.6139 + rng.uniform(-0.01, 0.01),
+            "longitude": 77.2090 + rng.uniform(-0.01, 0.01),
+            "intensity": rng.uniform(0.3, 1.0),
+            "confidence": rng.uniform(0.7, 0.99),
+            "angle": rng.randint(0, 359),
+            "distance": rng.randint(10, 100),
+            "audio_file": f"audio_{int(detection_time)}.wav",
+            "verified": rng.choice([True, False, None])
+        })
+    
+    detections.sort(key=lambda x: x["timestamp"], reverse=True)
+    with open(path, 'w') as f:
+        json.dump(detections, f, separators=(",", ":"))
+    return [d["id"] for d in detections]
+
+def measure(operation, samples, setup=None):
+    """Time an operation, then run it once more under tracemalloc for its peak allocation"""
+    timings = []
+    for _ in range(samples):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    # Traced separately because tracemalloc slows down the timed runs
+    if setup:
+        setup()
+    tracemalloc.start()
+    operation()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    
+    total_seconds = sum(timings) / 1000
+    pct = RenderStats.percentiles(timings)
+    return {
+        "samples": samples,
+        "ops_per_sec": round(samples / total_seconds, 2) if total_seconds else 0.0,
+        "mean_ms": round(sum(timings) / samples, 4),
+        "p50_ms": round(pct[50], 4),
+        "p95_ms": round(pct[95], 4),
+        "p99_ms": round(pct[99], 4),
+        "peak_kb": round(peak / 1024, 1)
+    }
+
+def bench_size(size, seed, workdir):
+    """Run every benchmark against a history of the given size"""
+    data_file = os.path.join(workdir, f"detections_{size}.json")
+    ids = generate_history(data_file, size, seed)
+    rng = random.Random(seed)
+    
+    # Operations that rewrite the whole store get fewer samples on large histories
+    write_samples = max(3, min(100, 1000000 // size))
+    read_samples = max(5, min(200, 2000000 // size))
+    
+    data_manager = DataManager(data_file)
+    results = {}
+    
+    results["load_data"] = measure(data_manager.load_data, max(3, write_samples // 10))
+    
+    def add():
+        data_manager.add_detection({
+            "latitude": 28.6139, "longitude": 77.2090, "intensity": 0.8,
+            "confidence": 0.9, "angle": 90, "distance": 50,
+            "audio_file": "bench.wav", "verified": None
+        })
+    results["add_detection"] = measure(add, write_samples)
+    
+    for time_filter in TIME_FILTERS:
+        results[f"get_map_detections[{time_filter}]"] = measure(
+            lambda: data_manager.get_map_detections(time_filter), read_samples
+        )
+    
+    results["get_statistics"] = measure(data_manager.get_statistics, read_samples)
+    
+    lookups = [rng.choice(ids) for _ in range(1000)]
+    lookup_iter = iter(lookups * 2)
+    results["get_detection_by_id"] = measure(
+        lambda: data_manager.get_detection_by_id(next(lookup_iter)), len(lookups) - 1
+    )
+    
+    updates = iter([rng.choice(ids) for _ in range(write_samples + 1)])
+    results["update_detection"] = measure(
+        lambda: data_manager.update_detection(next(updates), {"verified": True}), write_samples
+    )
+    
+    # Each clear runs on a freshly loaded store so it always has old data to drop
+    results["clear_old_data"] = measure(
+        data_manager.clear_old_data, max(3, write_samples // 10), setup=data_manager.load_data
+    )
+    
+    os.remove(data_file)
+    return results
+
+def median_results(runs):
+    """Combine repeated runs of one size into the median of every metric and the spread between runs"""
+    combined = {}
+    for operation, metrics in runs[0].items():
+        combined[operation] = {
+            metric: statistics.median(run[operation][metric] for run in runs) for metric in metrics
+        }
+        
+        # How far apart the runs were, so a comparison can tell noise from a real change
+        combined[operation]["spread"] = {}
+        for metric in COMPARED_METRICS:
+            values = [run[operation][metric] for run in runs]
+            combined[operation]["spread"][metric] = round(max(values) - min(values), 4)
+    return combined
+
+def compare(results, baseline, threshold, min_delta_ms=DEFAULT_MIN_DELTA_MS, min_delta_kb=DEFAULT_MIN_DELTA_KB):
+    """Print changes against a baseline and return the regressions beyond the threshold and noise floor"""
+    regressions = []
+    print(f"{'size':>8}  {'operation':<38} {'metric':<8} {'baseline':>12} {'current':>12} {'change':>8}")
+    
+    for size, operations in results["results"].items():
+        base_operations = baseline.get("results", {}).get(size, {})
+        for operation, metrics in operations.items():
+            base_metrics = base_operations.get(operation)
+            if not base_metrics:
+                continue
+            
+            for metric in COMPARED_METRICS:
+                old, new = base_metrics.get(metric), metrics.get(metric)
+                if not old or new is None:
+                    continue
+                
+                change = (new - old) / old * 100
+                
+                # A change within the run-to-run spread of either side is noise, however large in percent
+                min_delta = max(
+                    min_delta_kb if metric == "peak_kb" else min_delta_ms,
+                    base_metrics.get("spread", {}).get(metric, 0),
+                    metrics.get("spread", {}).get(metric, 0)
+                )
+                flag = ""
+                if change > threshold and new - old > min_delta:
+                    flag = "  REGRESSION"
+                    regressions.append((size, operation, metric, change))
+                print(f"{size:>8}  {operation:<38} {metric:<8} {old:>12.4f} {new:>12.4f} {change:>+7.1f}%{flag}")
+    
+    return regressions
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark DataManager operations")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma separated history sizes (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help="random seed for the synthetic histories")
+    parser.add_argument("--output", metavar="PATH",
+                        help="write the results as JSON to PATH instead of stdout")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="compare against a previous results file")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="percent slowdown or memory growth reported as a regression")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS,
+                        help="runs per size, reporting the median of each metric (default: %(default)s)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="smallest latency increase in ms reported as a regression (default: %(default)s)")
+    parser.add_argument("--min-delta-kb", type=float, default=DEFAULT_MIN_DELTA_KB,
+                        help="smallest peak allocation increase in KB reported as a regression "
+                             "(default: %(default)s)")
+    return parser.parse_args()
+
+def main():
+    """Run the benchmarks and report or compare the results"""
+    args = parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    
+    results = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeats": args.repeats
+        },
+        "results": {}
+    }
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            runs = []
+            for run in range(args.repeats):
+                print(f"Benchmarking {size} detections (run {run + 1} of {args.repeats})...", file=sys.stderr)
+                runs.append(bench_size(size, args.seed, workdir))
+            results["results"][str(size)] = median_results(runs)
+    
+    if resource is not None:
+        # Linux reports kilobytes, macOS bytes
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        results["meta"]["max_rss_kb"] = max_rss // 1024 if sys.platform == "darwin" else max_rss
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    elif not args.baseline:
+        print(json.dumps(results, indent=2))
+    
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms, args.min_delta_kb)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0f}%", file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Headless benchmarks for radar and map frame construction
+
+Run from the project root:
+    python -m benchmarks.render_bench --output render.json
+    python -m benchmarks.render_bench --baseline render.json
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import platform
+from datetime import datetime
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from benchmarks.data_manager_bench import measure, compare, DEFAULT_SEED
+from src.components.renderers import RecordingCanvas, RadarRenderer, MapRenderer
+
+DEFAULT_POINTS = [100, 1000, 10000]
+CANVAS_SIZE = (800, 480)  # The Pi touchscreen
+
+def generate_points(count, seed=DEFAULT_SEED):
+    """Build deterministic radar points with screen-ready map positions"""
+    rng = random.Random(seed)
+    width, height = CANVAS_SIZE
+    return [
+        {
+            "id": f"DET_{i}",
+            "angle": rng.randint(0, 359),
+            "distance": rng.randint(10, 100),
+            "intensity": rng.uniform(0.3, 1.0),
+            "x": rng.uniform(0, width),
+            "y": rng.uniform(0, height)
+        }
+        for i in range(count)
+    ]
+
+def draw_map_frame(renderer, points):
+    """Draw a full map frame the way MapPage.draw_gis_map does"""
+    width, height = CANVAS_SIZE
+    renderer.draw_background(width, height)
+    for point in points:
+        renderer.draw_detection(point["x"], point["y"], point["intensity"])
+    renderer.draw_positions(width // 2, height // 2)
+
+def bench_points(count, seed, record):
+    """Time radar and map frames for a number of detection points"""
+    points = generate_points(count, seed)
+    samples = max(5, min(100, 100000 // count))
+    results = {}
+    
+    canvas = RecordingCanvas(*CANVAS_SIZE, record=record)
+    radar = RadarRenderer(canvas)
+    results["radar_frame"] = measure(lambda: radar.draw(points), samples)
+    canvas.reset_counts()
+    radar.draw(points)
+    results["radar_frame"]["primitives"] = canvas.primitive_count()
+    
+    angles = iter(range(10 ** 6))
+    results["radar_sweep_step"] = measure(lambda: radar.update_sweep_items(next(angles)), 1000)
+    
+    canvas = RecordingCanvas(*CANVAS_SIZE, record=record)
+    gis_map = MapRenderer(canvas)
+    results["map_frame"] = measure(lambda: draw_map_frame(gis_map, points), samples)
+    canvas.reset_counts()
+    draw_map_frame(gis_map, points)
+    results["map_frame"]["primitives"] = canvas.primitive_count()
+    
+    return results
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Benchmark radar and map drawing headlessly")
+    parser.add_argument("--points", default=",".join(str(n) for n in DEFAULT_POINTS),
+                        help="comma separated detection point counts (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help="random seed for the synthetic points")
+    parser.add_argument("--no-record", action="store_true",
+                        help="count drawing calls without recording items, to time the drawing code alone")
+    parser.add_argument("--output", metavar="PATH",
+                        help="write the results as JSON to PATH instead of stdout")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="compare against a previous results file")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="percent slowdown or memory growth reported as a regression")
+    return parser.parse_args()
+
+def main():
+    """Run the render benchmarks and report or compare the results"""
+    args = parse_args()
+    counts = [int(n) for n in args.points.split(",") if n]
+    
+    results = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "canvas": "noop" if args.no_record else "recording"
+        },
+        "results": {}
+    }
+    
+    for count in counts:
+        print(f"Benchmarking {count} points...", file=sys.stderr)
+        results["results"][str(count)] = bench_points(count, args.seed, not args.no_record)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    elif not args.baseline:
+        print(json.dumps(results, indent=2))
+    
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold:.0f}%", file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
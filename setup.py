@@ -33,6 +33,9 @@ setup(
             "customtkinter>=5.0.0",
             "tkintermapview>=1.24",
         ],
+        "archive": [
+            "zstandard>=0.21",
+        ],
         "audio": [
             "pyaudio>=0.2.11",
             "scipy>=1.9.0",
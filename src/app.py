@@ -1,27 +1,73 @@
 import tkinter as tk
-from src.config import Config
-from src.pages.login_page import LoginPage
-from src.pages.radar_page import RadarPage
-from src.pages.map_page import MapPage
+import time
+import importlib
+import logging
 from src.utils.auth import AuthManager
+from src.utils.session import SessionManager
+from src.utils.audit import AUDIT
+from src.utils.startup import STARTUP
+from src.utils.memory_watch import MemoryWatch
+from src.utils.watchdog import StallWatchdog
+from src.components.widgets import DebugOverlay
+from src.components.theme import THEME
+
+# Page modules are imported and the pages built the first time they are shown
+PAGE_CLASSES = {
+    "LoginPage": ("src.pages.login_page", "LoginPage"),
+    "RadarPage": ("src.pages.radar_page", "RadarPage"),
+    "MapPage": ("src.pages.map_page", "MapPage")
+}
+
+logger = logging.getLogger(__name__)
 
 class GILDAApp:
     """Main application class for GILDA gunshot detection system"""
     
     def __init__(self):
-        self.config = Config()
-        self.auth_manager = AuthManager()
+        self.config = THEME.config
+        self.data_manager = None
         
         # Create main window
         self.root = tk.Tk()
         self.setup_window()
+        STARTUP.mark("create window")
+        
+        # One session for the whole app, extended by the input tracking below
+        self.session = SessionManager(self.root, on_expire=self.on_session_expired)
+        self.auth_manager = AuthManager(self.session)
+        
+        # Operator actions are attributed to whoever is logged in
+        AUDIT.actor = lambda: self.session.user
+        AUDIT.start()
         
         # Initialize pages
         self.pages = {}
         self.current_page = None
         
+        # Idle tracking for display blanking
+        self.display_blanked = False
+        self.last_activity = time.monotonic()
+        self.setup_activity_tracking()
+        
         self.create_pages()
         self.show_page("LoginPage")
+        
+        # Render profiling overlay
+        self.debug_overlay = DebugOverlay(self.root)
+        self.root.bind(self.config.DEBUG_OVERLAY_KEY, self.toggle_debug_overlay)
+        if self.config.DEBUG:
+            self.debug_overlay.show()
+        
+        # Memory budgets and routine retention of old detections
+        self.memory_watch = MemoryWatch(lambda: self.data_manager)
+        self.memory_watch.start(self.root)
+        
+        # Logs a stack trace whenever a callback blocks the event loop
+        self.watchdog = StallWatchdog(self.root)
+        self.watchdog.start()
+        
+        # Startup is done once Tk first goes idle with the login page mapped
+        self.root.after_idle(self.finish_startup)
     
     def setup_window(self):
         """Setup the main application window"""
@@ -46,34 +92,63 @@ class GILDAApp:
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
     def create_pages(self):
-        """Create all application pages"""
-        # Create container frame for pages
+        """Create the container that pages are built into on first use"""
         self.container = tk.Frame(self.root, bg=self.config.PRIMARY_COLOR)
         self.container.grid(row=0, column=0, sticky="nsew")
         self.container.grid_rowconfigure(0, weight=1)
         self.container.grid_columnconfigure(0, weight=1)
+    
+    def get_page(self, page_name):
+        """Get a page, importing and building it the first time it is needed"""
+        page = self.pages.get(page_name)
+        if page is not None:
+            return page
+        
+        started = time.perf_counter()
+        module_name, class_name = PAGE_CLASSES[page_name]
+        page_class = getattr(importlib.import_module(module_name), class_name)
+        imported = time.perf_counter()
         
-        # Create pages
-        page_classes = {
-            "LoginPage": LoginPage,
-            "RadarPage": RadarPage,
-            "MapPage": MapPage
-        }
+        page = page_class(self.container, self)
+        page.grid(row=0, column=0, sticky="nsew")
+        self.pages[page_name] = page
         
-        for page_name, page_class in page_classes.items():
-            page = page_class(self.container, self)
-            page.grid(row=0, column=0, sticky="nsew")
-            self.pages[page_name] = page
+        if STARTUP.reported:
+            logger.info(
+                f"Built {page_name}: import {(imported - started) * 1000:.1f} ms, "
+                f"construct {(time.perf_counter() - imported) * 1000:.1f} ms"
+            )
+        else:
+            STARTUP.mark(f"build {page_name}")
+        return page
+    
+    def get_data_manager(self):
+        """Get the detection data store shared by all pages, loading it on first use"""
+        if self.data_manager is None:
+            if self.config.AGGREGATOR_CLIENT:
+                # Render from the shared aggregator instead of a local data file
+                from src.utils.aggregator import RemoteDataManager
+                self.data_manager = RemoteDataManager(self.config.AGGREGATOR_ADDRESS)
+                self.data_manager.start(self.root)
+            else:
+                from src.utils.data_manager import DataManager
+                self.data_manager = DataManager()
+        return self.data_manager
+    
+    def finish_startup(self):
+        """Log the boot time breakdown"""
+        STARTUP.mark("first idle")
+        STARTUP.report()
     
     def show_page(self, page_name):
         """Show the specified page"""
-        if page_name in self.pages:
+        if page_name in PAGE_CLASSES:
             # Hide current page
             if self.current_page:
                 self.pages[self.current_page].hide()
             
             # Show new page
-            page = self.pages[page_name]
+            page = self.get_page(page_name)
             page.show()
             self.current_page = page_name
             
@@ -85,22 +160,92 @@ class GILDAApp:
             }
             self.root.title(titles.get(page_name, self.config.APP_TITLE))
     
+    def setup_activity_tracking(self):
+        """Track user input and window visibility for display blanking and the session"""
+        for sequence in ("<Any-KeyPress>", "<Any-ButtonPress>", "<Motion>"):
+            self.root.bind_all(sequence, self.on_user_activity, add="+")
+        
+        self.root.bind("<Unmap>", self.on_window_unmap, add="+")
+        self.root.bind("<Map>", self.on_window_map, add="+")
+        
+        if self.config.DISPLAY_BLANK_TIMEOUT > 0:
+            self.root.after(self.config.DISPLAY_BLANK_TIMEOUT * 1000, self.check_idle)
+    
+    def on_user_activity(self, event=None):
+        """Record user input, extend the session and wake a blanked display"""
+        self.last_activity = time.monotonic()
+        self.session.extend(self.last_activity)
+        if self.display_blanked:
+            self.unblank_display()
+    
+    def on_window_unmap(self, event):
+        """Pause page timers while the main window is minimised"""
+        if event.widget is self.root:
+            self.blank_display()
+    
+    def on_window_map(self, event):
+        """Resume page timers when the main window is shown again"""
+        if event.widget is self.root:
+            self.unblank_display()
+    
+    def check_idle(self):
+        """Blank the display once there has been no input for the configured timeout"""
+        remaining = self.config.DISPLAY_BLANK_TIMEOUT - (time.monotonic() - self.last_activity)
+        if remaining <= 0:
+            self.blank_display()
+            remaining = self.config.DISPLAY_BLANK_TIMEOUT
+        self.root.after(int(remaining * 1000) + 1, self.check_idle)
+    
+    def blank_display(self):
+        """Pause all periodic work on the current page"""
+        if self.display_blanked:
+            return
+        
+        self.display_blanked = True
+        if self.current_page:
+            self.pages[self.current_page].pause_timers()
+    
+    def unblank_display(self):
+        """Resume periodic work on the current page"""
+        if not self.display_blanked:
+            return
+        
+        self.display_blanked = False
+        self.last_activity = time.monotonic()
+        if self.current_page:
+            self.pages[self.current_page].resume_timers()
+    
+    def logout(self):
+        """End the session and return to the login page"""
+        self.auth_manager.logout()
+        self.show_page("LoginPage")
+    
+    def on_session_expired(self):
+        """Return to the login page once the session has timed out"""
+        if self.current_page != "LoginPage":
+            self.show_page("LoginPage")
+    
     def toggle_fullscreen(self, event=None):
         """Toggle fullscreen mode"""
         current_state = self.root.attributes('-fullscreen')
         self.root.attributes('-fullscreen', not current_state)
     
+    def toggle_debug_overlay(self, event=None):
+        """Toggle the frame timing and render profiling overlay"""
+        self.debug_overlay.toggle()
+    
     def on_closing(self):
         """Handle application closing"""
         # Save any pending data
         try:
             # Perform cleanup
             self.auth_manager.logout()
+            AUDIT.stop()
             
             # Stop any running updates
+            self.watchdog.stop()
             for page in self.pages.values():
-                if hasattr(page, 'stop_radar_updates'):
-                    page.stop_radar_updates()
+                page.pause_timers()
             
         except Exception as e:
             print(f"Error during cleanup: {e}")
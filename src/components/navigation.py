@@ -1,5 +1,5 @@
 import tkinter as tk
-from src.config import Config
+from src.components.theme import THEME
 
 class NavigationBar(tk.Frame):
     """Navigation bar component for page switching"""
@@ -7,7 +7,7 @@ class NavigationBar(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
-        self.config = Config()
+        self.config = THEME.config
         
         self.configure(bg=self.config.SECONDARY_COLOR, height=60)
         self.pack_propagate(False)
@@ -20,7 +20,7 @@ class NavigationBar(tk.Frame):
         title = tk.Label(
             self,
             text="GILDA",
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_TITLE, "bold"),
+            font=THEME.font(self.config.FONT_SIZE_TITLE, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.TEXT_COLOR
         )
@@ -35,7 +35,7 @@ class NavigationBar(tk.Frame):
             nav_frame,
             text="Radar",
             command=lambda: self.controller.show_page("RadarPage"),
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM),
             bg=self.config.ACCENT_COLOR,
             fg=self.config.TEXT_COLOR,
             relief="flat",
@@ -49,7 +49,7 @@ class NavigationBar(tk.Frame):
             nav_frame,
             text="Map",
             command=lambda: self.controller.show_page("MapPage"),
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM),
             bg=self.config.ACCENT_COLOR,
             fg=self.config.TEXT_COLOR,
             relief="flat",
@@ -63,7 +63,7 @@ class NavigationBar(tk.Frame):
             nav_frame,
             text="Logout",
             command=self.handle_logout,
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM),
             bg=self.config.ERROR_COLOR,
             fg=self.config.TEXT_COLOR,
             relief="flat",
@@ -88,4 +88,4 @@ class NavigationBar(tk.Frame):
     def handle_logout(self):
         """Handle logout action"""
         self.disable_navigation()
-        self.controller.show_page("LoginPage")
\ No newline at end of file
+        self.controller.logout()
\ No newline at end of file
@@ -0,0 +1,409 @@
+import tkinter as tk
+from collections import Counter
+from src.config import Config
+from src.utils.trig import COS_TABLE, SIN_TABLE, TABLE_SIZE, polar_to_canvas
+from src.components.theme import THEME
+
+def intensity_color(intensity):
+    """Get the display color for a detection intensity"""
+    if intensity > 0.8:
+        return Config.ERROR_COLOR
+    elif intensity > 0.5:
+        return Config.WARNING_COLOR
+    return Config.SUCCESS_COLOR
+
+class RecordingCanvas:
+    """Stand-in for tk.Canvas that records drawing calls instead of displaying them"""
+    
+    def __init__(self, width=800, height=600, record=True):
+        self.width = width
+        self.height = height
+        self.record = record  # False counts calls without keeping items
+        self.items = {}  # item id -> {"type", "coords", "options"}
+        self.counts = Counter()  # Calls made, by primitive type or operation
+        self.next_id = 1
+    
+    def winfo_width(self):
+        return self.width
+    
+    def winfo_height(self):
+        return self.height
+    
+    def _create(self, kind, args, options):
+        """Count a new item and record it when recording"""
+        item = self.next_id
+        self.next_id += 1
+        self.counts[kind] += 1
+        
+        if self.record:
+            coords = args[0] if len(args) == 1 and isinstance(args[0], (list, tuple)) else args
+            self.items[item] = {"type": kind, "coords": list(coords), "options": options}
+        return item
+    
+    def create_line(self, *args, **options):
+        return self._create("line", args, options)
+    
+    def create_oval(self, *args, **options):
+        return self._create("oval", args, options)
+    
+    def create_rectangle(self, *args, **options):
+        return self._create("rectangle", args, options)
+    
+    def create_arc(self, *args, **options):
+        return self._create("arc", args, options)
+    
+    def create_polygon(self, *args, **options):
+        return self._create("polygon", args, options)
+    
+    def create_text(self, *args, **options):
+        return self._create("text", args, options)
+    
+    def find_withtag(self, tag_or_id):
+        """Get the ids of recorded items with a tag, or the single id given"""
+        if tag_or_id == "all":
+            return tuple(self.items)
+        if isinstance(tag_or_id, int):
+            return (tag_or_id,) if tag_or_id in self.items else ()
+        
+        matches = []
+        for item, record in self.items.items():
+            tags = record["options"].get("tags", ())
+            if tag_or_id == tags or (not isinstance(tags, str) and tag_or_id in tags):
+                matches.append(item)
+        return tuple(matches)
+    
+    def find_all(self):
+        return tuple(self.items)
+    
+    def delete(self, *tags_or_ids):
+        self.counts["delete"] += 1
+        for tag_or_id in tags_or_ids:
+            for item in self.find_withtag(tag_or_id):
+                del self.items[item]
+    
+    def coords(self, item, *args):
+        if args:
+            self.counts["coords"] += 1
+            if item in self.items:
+                self.items[item]["coords"] = list(args)
+        return self.items[item]["coords"] if item in self.items else []
+    
+    def itemconfigure(self, item, **options):
+        self.counts["itemconfigure"] += 1
+        if item in self.items:
+            self.items[item]["options"].update(options)
+    
+    itemconfig = itemconfigure
+    
+    def type(self, item):
+        return self.items[item]["type"] if item in self.items else None
+    
+    def bind(self, *args, **kwargs):
+        pass
+    
+    def tag_raise(self, *args):
+        pass
+    
+    def primitive_count(self):
+        """Get the number of items created since the last reset"""
+        return sum(
+            count for kind, count in self.counts.items()
+            if kind not in ("delete", "coords", "itemconfigure")
+        )
+    
+    def reset_counts(self):
+        """Start counting calls from zero"""
+        self.counts.clear()
+
+class RadarRenderer:
+    """Draws the radar display onto a Tk or recording canvas"""
+    
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.config = THEME.config
+        
+        # Set by draw(); the sweep items are created once per draw and moved after that
+        self.geometry = None
+        self.sweep_line = None
+        self.sweep_trail = []
+    
+    def draw(self, points, sweep_angle=0.0):
+        """Redraw rings, spokes, points and sweep; returns each point's screen position"""
+        self.canvas.delete("all")
+        self.geometry = None
+        self.sweep_line = None
+        
+        # Get canvas dimensions
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        
+        if width <= 1 or height <= 1:
+            return []
+        
+        # Calculate center and radius
+        center_x = width // 2
+        center_y = height // 2
+        max_radius = min(center_x, center_y) - 20
+        self.geometry = (center_x, center_y, max_radius)
+        
+        # Draw radar circles
+        for i in range(1, 4):
+            radius = (max_radius * i) // 3
+            self.canvas.create_oval(
+                center_x - radius, center_y - radius,
+                center_x + radius, center_y + radius,
+                outline=self.config.ACCENT_COLOR,
+                width=1
+            )
+        
+        # Draw radar lines
+        for angle in range(0, 360, 45):
+            end_x = center_x + max_radius * COS_TABLE[angle]
+            end_y = center_y + max_radius * SIN_TABLE[angle]
+            
+            self.canvas.create_line(
+                center_x, center_y, end_x, end_y,
+                fill=self.config.ACCENT_COLOR,
+                width=1
+            )
+        
+        # Draw detection points
+        positions = [self.draw_detection_point(point) for point in points]
+        
+        # Sweep is drawn last so it stays on top of the detections
+        self.create_sweep_items(sweep_angle)
+        return positions
+    
+    def draw_detection_point(self, point):
+        """Draw a detection point on the radar and return its screen position"""
+        center_x, center_y, max_radius = self.geometry
+        
+        # Convert polar coordinates to cartesian
+        distance_ratio = point['distance'] / 100.0  # Normalize to 0-1
+        x, y = polar_to_canvas(center_x, center_y, distance_ratio * max_radius, point['angle'])
+        
+        # Draw point with intensity-based color
+        self.canvas.create_oval(
+            x - 5, y - 5, x + 5, y + 5,
+            fill=intensity_color(point.get('intensity', 0.5)),
+            outline=self.config.TEXT_COLOR,
+            width=1
+        )
+        return x, y
+    
+    def create_sweep_items(self, sweep_angle):
+        """Create the sweep line and its fading trail"""
+        center_x, center_y, max_radius = self.geometry
+        bbox = (
+            center_x - max_radius, center_y - max_radius,
+            center_x + max_radius, center_y + max_radius
+        )
+        
+        # Trail segments fade out behind the sweep line
+        self.sweep_trail = []
+        for stipple in ("gray50", "gray25", "gray12"):
+            self.sweep_trail.append(self.canvas.create_arc(
+                *bbox,
+                start=0,
+                extent=self.config.RADAR_SWEEP_TRAIL // 3,
+                fill=self.config.SUCCESS_COLOR,
+                outline="",
+                stipple=stipple,
+                tags="sweep"
+            ))
+        
+        self.sweep_line = self.canvas.create_line(
+            center_x, center_y, center_x, center_y,
+            fill=self.config.GOLD_COLOR,
+            width=2,
+            tags="sweep"
+        )
+        self.update_sweep_items(sweep_angle)
+    
+    def update_sweep_items(self, sweep_angle):
+        """Move the existing sweep items to a new angle"""
+        if self.sweep_line is None:
+            return
+        
+        center_x, center_y, max_radius = self.geometry
+        angle = int(sweep_angle) % TABLE_SIZE
+        
+        self.canvas.coords(
+            self.sweep_line,
+            center_x, center_y,
+            center_x + max_radius * COS_TABLE[angle],
+            center_y + max_radius * SIN_TABLE[angle]
+        )
+        
+        # Canvas arcs run counter-clockwise while the sweep runs clockwise
+        segment = self.config.RADAR_SWEEP_TRAIL // 3
+        for i, arc in enumerate(self.sweep_trail):
+            self.canvas.itemconfigure(arc, start=-(angle - i * segment))
+
+class MapRenderer:
+    """Draws the GIS map layers onto a Tk or recording canvas"""
+    
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.config = THEME.config
+    
+    def draw_background(self, width, height):
+        """Draw the terrain, grid and map furniture under the detections"""
+        self.canvas.delete("all")
+        self.draw_terrain_features(width, height)
+        self.draw_grid_lines(width, height)
+        self.draw_map_elements(width, height)
+    
+    def draw_detection(self, x, y, intensity):
+        """Draw a detection marker at a screen position"""
+        self.canvas.create_oval(
+            x - 6, y - 6, x + 6, y + 6,
+            fill=intensity_color(intensity),
+            outline=self.config.TEXT_COLOR, width=1
+        )
+    
+    def draw_terrain_features(self, width, height):
+        """Draw terrain features like roads, buildings, etc."""
+        # Draw some roads
+        road_color = "#8B7355"  # Brown for roads
+        
+        # Horizontal road
+        self.canvas.create_rectangle(
+            0, height//2 - 10, width, height//2 + 10,
+            fill=road_color, outline=road_color
+        )
+        
+        # Vertical road
+        self.canvas.create_rectangle(
+            width//2 - 10, 0, width//2 + 10, height,
+            fill=road_color, outline=road_color
+        )
+        
+        # Draw some buildings
+        building_color = "#696969"  # Dark gray for buildings
+        
+        buildings = [
+            (width//4 - 20, height//4 - 15, width//4 + 20, height//4 + 15),
+            (3*width//4 - 25, height//4 - 20, 3*width//4 + 25, height//4 + 20),
+            (width//4 - 15, 3*height//4 - 25, width//4 + 15, 3*height//4 + 25),
+            (3*width//4 - 30, 3*height//4 - 15, 3*width//4 + 30, 3*height//4 + 15),
+        ]
+        
+        for x1, y1, x2, y2 in buildings:
+            self.canvas.create_rectangle(
+                x1, y1, x2, y2,
+                fill=building_color, outline="#FFFFFF", width=1
+            )
+    
+    def draw_grid_lines(self, width, height):
+        """Draw UTM-style grid lines"""
+        grid_color = "#4F6F4F"  # Darker green for grid
+        
+        # Vertical lines
+        for i in range(0, width, 50):
+            self.canvas.create_line(
+                i, 0, i, height,
+                fill=grid_color, width=1, dash=(2, 4)
+            )
+        
+        # Horizontal lines
+        for i in range(0, height, 50):
+            self.canvas.create_line(
+                0, i, width, i,
+                fill=grid_color, width=1, dash=(2, 4)
+            )
+    
+    def draw_map_elements(self, width, height):
+        """Draw scale, compass, and other map elements"""
+        # Compass rose (top right)
+        compass_x = width - 60
+        compass_y = 60
+        
+        # Compass circle
+        self.canvas.create_oval(
+            compass_x - 25, compass_y - 25,
+            compass_x + 25, compass_y + 25,
+            outline=self.config.GOLD_COLOR, width=2
+        )
+        
+        # North arrow
+        self.canvas.create_line(
+            compass_x, compass_y - 20,
+            compass_x, compass_y + 20,
+            fill=self.config.ERROR_COLOR, width=3, arrow=tk.FIRST
+        )
+        
+        # N label
+        self.canvas.create_text(
+            compass_x, compass_y - 35,
+            text="N", fill=self.config.TEXT_COLOR,
+            font=THEME.font(12, "bold")
+        )
+        
+        # Scale bar (bottom left)
+        scale_x = 50
+        scale_y = height - 30
+        
+        self.canvas.create_line(
+            scale_x, scale_y, scale_x + 100, scale_y,
+            fill=self.config.TEXT_COLOR, width=3
+        )
+        
+        self.canvas.create_text(
+            scale_x + 50, scale_y - 15,
+            text="1 km", fill=self.config.TEXT_COLOR,
+            font=THEME.font(10, "bold")
+        )
+    
+    def draw_positions(self, node_x, node_y):
+        """Draw node and enemy positions on the map, with the node at the given screen position"""
+        # Node position
+        node_size = 12
+        self.canvas.create_oval(
+            node_x - node_size, node_y - node_size,
+            node_x + node_size, node_y + node_size,
+            fill=self.config.SUCCESS_COLOR,
+            outline=self.config.TEXT_COLOR, width=3
+        )
+        
+        # Node label
+        self.canvas.create_text(
+            node_x, node_y - 25,
+            text="NODE", fill=self.config.TEXT_COLOR,
+            font=THEME.font(10, "bold")
+        )
+        
+        # Enemy position (offset from center)
+        enemy_x = node_x + 80
+        enemy_y = node_y - 60
+        enemy_size = 10
+        
+        self.canvas.create_oval(
+            enemy_x - enemy_size, enemy_y - enemy_size,
+            enemy_x + enemy_size, enemy_y + enemy_size,
+            fill=self.config.ERROR_COLOR,
+            outline=self.config.TEXT_COLOR, width=3
+        )
+        
+        # Enemy label
+        self.canvas.create_text(
+            enemy_x, enemy_y - 20,
+            text="ENEMY LOC", fill=self.config.TEXT_COLOR,
+            font=THEME.font(9, "bold")
+        )
+        
+        # Draw line between positions
+        self.canvas.create_line(
+            node_x, node_y, enemy_x, enemy_y,
+            fill=self.config.WARNING_COLOR, width=2, dash=(5, 5)
+        )
+        
+        # Distance marker
+        mid_x = (node_x + enemy_x) // 2
+        mid_y = (node_y + enemy_y) // 2
+        
+        self.canvas.create_text(
+            mid_x, mid_y - 10,
+            text="1.2 km", fill=self.config.WARNING_COLOR,
+            font=THEME.font(9, "bold")
+        )
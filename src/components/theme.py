@@ -0,0 +1,39 @@
+import tkinter.font as tkfont
+from src.config import Config
+
+class Theme:
+    """Single config instance and shared named fonts for all pages and widgets"""
+    
+    def __init__(self):
+        self.config = Config()
+        self.fonts = {}  # (family, size, styles) -> tkinter.font.Font
+    
+    def font(self, size, *styles, family=None):
+        """Get the shared font for a size and styles such as "bold", "italic" or "underline"
+        
+        Widgets given the same Font object share one Tk font, so Tk resolves each
+        description once instead of on every widget creation.
+        """
+        family = family or self.config.FONT_FAMILY
+        key = (family, size, styles)
+        font = self.fonts.get(key)
+        if font is not None:
+            return font
+        
+        try:
+            font = tkfont.Font(
+                family=family,
+                size=size,
+                weight="bold" if "bold" in styles else "normal",
+                slant="italic" if "italic" in styles else "roman",
+                underline="underline" in styles
+            )
+        except RuntimeError:
+            # No Tk root yet (e.g. headless rendering); a plain description still works
+            return (family, size) + styles
+        
+        self.fonts[key] = font
+        return font
+
+# Shared by every page, widget and renderer
+THEME = Theme()
@@ -1,15 +1,36 @@
 import tkinter as tk
 from tkinter import ttk
-from src.config import Config
+import time
+from datetime import datetime
+from src.utils.render_stats import RENDER_STATS
+from src.utils.latency import LATENCY
+from src.utils.alerts import AlertQueue
+from src.utils.metrics import METRICS, weak_callback
+from src.utils.time_bins import TimeBins, RESOLUTIONS
+from src.components.theme import THEME
 
 class StatusIndicator(tk.Frame):
     """Status indicator widget with color-coded states"""
     
+    STATUS_TEXTS = {
+        "active": "ACTIVE",
+        "warning": "WARNING",
+        "error": "ERROR",
+        "unknown": "UNKNOWN"
+    }
+    
     def __init__(self, parent, label="Status"):
         super().__init__(parent)
-        self.config = Config()
+        self.config = THEME.config
         self.configure(bg=self.config.SECONDARY_COLOR)
         
+        self.colors = {
+            "active": self.config.SUCCESS_COLOR,
+            "warning": self.config.WARNING_COLOR,
+            "error": self.config.ERROR_COLOR,
+            "unknown": self.config.TEXT_COLOR
+        }
+        self.current = None  # (color, text) last shown
         self.label_text = label
         self.setup_widget()
     
@@ -19,7 +40,7 @@ class StatusIndicator(tk.Frame):
         self.label = tk.Label(
             self,
             text=f"{self.label_text}:",
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.TEXT_COLOR
         )
@@ -34,12 +55,13 @@ class StatusIndicator(tk.Frame):
             highlightthickness=0
         )
         self.canvas.pack(side="left", padx=(0, 10))
+        self.oval = self.canvas.create_oval(2, 2, 18, 18)
         
         # Status text
         self.status_label = tk.Label(
             self,
             text="Unknown",
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM, "bold"),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.TEXT_COLOR
         )
@@ -50,28 +72,16 @@ class StatusIndicator(tk.Frame):
     
     def set_status(self, status, text=None):
         """Set the status indicator state"""
-        colors = {
-            "active": self.config.SUCCESS_COLOR,
-            "warning": self.config.WARNING_COLOR,
-            "error": self.config.ERROR_COLOR,
-            "unknown": self.config.TEXT_COLOR
-        }
-        
-        status_texts = {
-            "active": "ACTIVE",
-            "warning": "WARNING",
-            "error": "ERROR",
-            "unknown": "UNKNOWN"
-        }
-        
-        color = colors.get(status.lower(), self.config.TEXT_COLOR)
-        display_text = text or status_texts.get(status.lower(), status.upper())
+        color = self.colors.get(status.lower(), self.config.TEXT_COLOR)
+        display_text = text or self.STATUS_TEXTS.get(status.lower(), status.upper())
         
-        # Update circle
-        self.canvas.delete("all")
-        self.canvas.create_oval(2, 2, 18, 18, fill=color, outline=color)
+        # Periodic refreshes usually repeat the current state
+        if (color, display_text) == self.current:
+            return
+        self.current = (color, display_text)
         
-        # Update text
+        # Recolor the existing circle instead of recreating it
+        self.canvas.itemconfigure(self.oval, fill=color, outline=color)
         self.status_label.config(text=display_text, fg=color)
 
 class AlertPanel(tk.Frame):
@@ -79,10 +89,18 @@ class AlertPanel(tk.Frame):
     
     def __init__(self, parent):
         super().__init__(parent)
-        self.config = Config()
+        self.config = THEME.config
         self.configure(bg=self.config.ERROR_COLOR, relief="raised", bd=2)
         
-        self.alerts = []
+        self.alerts = AlertQueue(
+            coalesce_window=self.config.ALERT_COALESCE_WINDOW,
+            max_pending=self.config.ALERT_MAX_PENDING
+        )
+        METRICS.gauge("gilda_alert_queue_depth", "Alerts waiting to be shown",
+                      func=weak_callback(self, lambda panel: len(panel.alerts)))
+        self.current_alert = None
+        self.shown_at = 0.0
+        self.timer_id = None  # The panel's single auto-dismiss/advance timer
         self.setup_widget()
         self.hide()  # Initially hidden
     
@@ -92,7 +110,7 @@ class AlertPanel(tk.Frame):
         self.title_label = tk.Label(
             self,
             text="⚠ GUNSHOT DETECTED ⚠",
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_LARGE, "bold"),
+            font=THEME.font(self.config.FONT_SIZE_LARGE, "bold"),
             bg=self.config.ERROR_COLOR,
             fg=self.config.TEXT_COLOR
         )
@@ -102,7 +120,7 @@ class AlertPanel(tk.Frame):
         self.details_label = tk.Label(
             self,
             text="",
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM),
             bg=self.config.ERROR_COLOR,
             fg=self.config.TEXT_COLOR,
             justify="center"
@@ -114,7 +132,7 @@ class AlertPanel(tk.Frame):
             self,
             text="Acknowledge",
             command=self.dismiss_alert,
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM),
             bg=self.config.TEXT_COLOR,
             fg=self.config.ERROR_COLOR,
             relief="flat",
@@ -123,32 +141,76 @@ class AlertPanel(tk.Frame):
         )
         self.dismiss_btn.pack(pady=10)
     
-    def show_alert(self, message, details=""):
-        """Show an alert with message and details"""
-        self.title_label.config(text=message)
-        self.details_label.config(text=details)
-        self.pack(fill="x", padx=20, pady=10)
+    def show_alert(self, message, details="", priority=1, key=None, label=None):
+        """Queue an alert; bursts with the same key (e.g. sector) are coalesced and counted by label"""
+        now = time.time()
+        
+        # Fold into the alert on screen if it is part of the same burst
+        current = self.current_alert
+        if self.alerts.can_coalesce(current, key, now):
+            current.merge(details, priority, now)
+            self.details_label.config(text=current.display_details())
+            return
+        
+        self.alerts.push(message, details, priority, key, now, label)
+        
+        if current is None:
+            self.display_next()
+        else:
+            # Advance as soon as the current alert has had its minimum time on screen
+            remaining = self.config.ALERT_MIN_DISPLAY - (now - self.shown_at)
+            self.schedule(max(0.0, remaining), self.display_next)
+    
+    def schedule(self, delay, callback):
+        """Replace the panel's timer with a new one"""
+        if self.timer_id:
+            self.after_cancel(self.timer_id)
+        self.timer_id = self.after(int(delay * 1000), callback)
+    
+    def display_next(self):
+        """Display the next queued alert, or hide the panel when none are left"""
+        self.timer_id = None
+        alert = self.alerts.pop()
+        if alert is None:
+            self.current_alert = None
+            self.pack_forget()
+            return
+        
+        self.current_alert = alert
+        self.shown_at = time.time()
+        self.title_label.config(text=alert.message)
+        self.details_label.config(text=alert.display_details())
+        if not self.winfo_ismapped():
+            self.pack(fill="x", padx=20, pady=10)
         
-        # Auto-dismiss after 10 seconds
-        self.after(10000, self.dismiss_alert)
+        # Auto-dismiss, or move on sooner if more alerts are waiting
+        delay = self.config.ALERT_MIN_DISPLAY if len(self.alerts) else self.config.ALERT_DISPLAY_TIME
+        self.schedule(delay, self.display_next)
     
     def dismiss_alert(self):
-        """Dismiss the current alert"""
-        self.pack_forget()
+        """Dismiss the current alert and show the next one"""
+        if self.timer_id:
+            self.after_cancel(self.timer_id)
+        self.display_next()
     
     def hide(self):
         """Hide the alert panel"""
+        if self.timer_id:
+            self.after_cancel(self.timer_id)
+            self.timer_id = None
+        self.current_alert = None
         self.pack_forget()
 
 class DataTable(tk.Frame):
     """Data table widget for displaying tabular information"""
     
-    def __init__(self, parent, columns):
+    def __init__(self, parent, columns, height=10):
         super().__init__(parent)
-        self.config = Config()
+        self.config = THEME.config
         self.configure(bg=self.config.SECONDARY_COLOR)
         
         self.columns = columns
+        self.height = height
         self.setup_widget()
     
     def setup_widget(self):
@@ -158,7 +220,7 @@ class DataTable(tk.Frame):
             self,
             columns=self.columns,
             show="headings",
-            height=10
+            height=self.height
         )
         
         # Configure columns
@@ -185,14 +247,392 @@ class DataTable(tk.Frame):
         """Insert a row into the table"""
         self.tree.insert("", "end", values=values)
     
+    def replace_rows(self, rows):
+        """Replace all rows in the table with new ones"""
+        self.clear_table()
+        for values in rows:
+            self.tree.insert("", "end", values=values)
+    
+    def apply_diff(self, diff):
+        """Patch the table with a diff from the DataManager list APIs"""
+        # Rows are keyed by detection id so they can be patched in place
+        removed = [row_id for row_id in diff["removed"] if self.tree.exists(row_id)]
+        if removed:
+            self.tree.delete(*removed)
+        
+        for row_id, values in diff["changed"]:
+            if self.tree.exists(row_id):
+                self.tree.item(row_id, values=self._row_values(values))
+        
+        # Added rows arrive in display order with their final positions
+        for position, row_id, values in diff["added"]:
+            self.tree.insert("", position, iid=row_id, values=self._row_values(values))
+        
+        # Rows whose sort position changed, e.g. after a timestamp edit, are moved in one call
+        order = list(diff["snapshot"])
+        if list(self.tree.get_children()) != order:
+            self.tree.set_children("", *order)
+    
+    def _row_values(self, values):
+        """Wrap a preformatted string as a single-column row"""
+        return (values,) if isinstance(values, str) else values
+    
     def clear_table(self):
         """Clear all rows from the table"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
     
     def get_selected(self):
         """Get the selected row data"""
         selection = self.tree.selection()
         if selection:
             return self.tree.item(selection[0])["values"]
-        return None
\ No newline at end of file
+        return None
+
+class VirtualDataTable(tk.Frame):
+    """Data table that only materializes visible rows, paging them from a data store"""
+    
+    def __init__(self, parent, columns, store, formatters=None, sort_column="timestamp"):
+        super().__init__(parent)
+        self.config = THEME.config
+        self.configure(bg=self.config.SECONDARY_COLOR)
+        
+        # The store provides count_detections() and get_detection_page()
+        self.columns = columns
+        self.store = store
+        self.formatters = formatters or {}
+        self.sort_column = sort_column
+        self.sort_descending = True
+        
+        self.offset = 0
+        self.visible_rows = 10
+        self.row_ids = []
+        self.setup_widget()
+    
+    def setup_widget(self):
+        """Setup the virtual table"""
+        self.tree = ttk.Treeview(
+            self,
+            columns=self.columns,
+            show="headings",
+            selectmode="browse",
+            height=self.visible_rows
+        )
+        
+        for col in self.columns:
+            self.tree.heading(col, text=col.title(), command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=100, anchor="center")
+        
+        # The scrollbar maps onto the whole store, not onto the materialized rows
+        self.v_scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scroll)
+        h_scrollbar = ttk.Scrollbar(self, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(xscrollcommand=h_scrollbar.set)
+        
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.v_scrollbar.grid(row=0, column=1, sticky="ns")
+        h_scrollbar.grid(row=1, column=0, sticky="ew")
+        
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        
+        # Scrolling and resizing
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', self.on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll_rows(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_rows(3))
+        self.tree.bind('<Prior>', lambda e: self.scroll_rows(-self.visible_rows))
+        self.tree.bind('<Next>', lambda e: self.scroll_rows(self.visible_rows))
+    
+    def on_resize(self, event):
+        """Adjust the number of materialized rows to the table height"""
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        heading_height = row_height + 5
+        rows = max(1, (event.height - heading_height) // row_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.refresh()
+    
+    def on_mousewheel(self, event):
+        """Scroll with the mouse wheel"""
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+    
+    def on_scroll(self, action, amount, unit=None):
+        """Handle scrollbar drags and clicks"""
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.store.count_detections()))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
+    
+    def scroll_rows(self, rows):
+        """Scroll by a number of rows"""
+        self.scroll_to(self.offset + rows)
+        return "break"
+    
+    def scroll_to(self, offset):
+        """Scroll so the given row is at the top of the table"""
+        total = self.store.count_detections()
+        offset = max(0, min(offset, total - self.visible_rows))
+        if offset != self.offset:
+            # Row items are reused, so a selection would otherwise jump records
+            self.tree.selection_remove(self.tree.selection())
+            self.offset = offset
+            self.refresh()
+    
+    def sort_by(self, column):
+        """Sort by a column, toggling direction when it is already sorted"""
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = True
+        
+        self.offset = 0
+        self.refresh()
+    
+    def format_row(self, record):
+        """Format a store record as table values"""
+        values = []
+        for col in self.columns:
+            value = record.get(col)
+            formatter = self.formatters.get(col)
+            values.append(formatter(value) if formatter else value)
+        return values
+    
+    def refresh(self):
+        """Reload the visible page from the store, reusing existing row items"""
+        total = self.store.count_detections()
+        self.offset = max(0, min(self.offset, total - self.visible_rows))
+        records = self.store.get_detection_page(
+            self.offset, self.visible_rows, self.sort_column, self.sort_descending
+        )
+        
+        # Grow or shrink the pool of materialized rows to fit the page
+        while len(self.row_ids) < len(records):
+            self.row_ids.append(self.tree.insert("", "end"))
+        if len(self.row_ids) > len(records):
+            self.tree.delete(*self.row_ids[len(records):])
+            del self.row_ids[len(records):]
+        
+        for row_id, record in zip(self.row_ids, records):
+            self.tree.item(row_id, values=self.format_row(record), tags=(record.get("id"),))
+        
+        # Update the scrollbar to reflect the position within the whole store
+        if total:
+            self.v_scrollbar.set(self.offset / total, (self.offset + len(records)) / total)
+        else:
+            self.v_scrollbar.set(0, 1)
+    
+    def replace_store(self, store):
+        """Point the table at a different data store"""
+        self.store = store
+        self.offset = 0
+        self.refresh()
+    
+    def clear_table(self):
+        """Remove all materialized rows"""
+        if self.row_ids:
+            self.tree.delete(*self.row_ids)
+            self.row_ids = []
+        self.offset = 0
+        self.v_scrollbar.set(0, 1)
+    
+    def get_selected(self):
+        """Get the id of the selected record"""
+        selection = self.tree.selection()
+        if selection:
+            tags = self.tree.item(selection[0])["tags"]
+            return tags[0] if tags else None
+        return None
+
+class TimelineHistogram(tk.Canvas):
+    """Detection rate histogram drawn only from pre-aggregated time bins"""
+    
+    def __init__(self, parent, time_bins, on_select=None, window=86400, height=60):
+        super().__init__(parent, height=height, highlightthickness=0)
+        self.config = THEME.config
+        self.configure(bg=self.config.PRIMARY_COLOR)
+        
+        self.time_bins = time_bins
+        self.on_select = on_select
+        self.window = window
+        self.view = (0.0, 1.0)
+        
+        # Canvas items are created once and moved on redraw
+        self.bars = []
+        self.labels = [
+            self.create_text(0, 0, anchor="nw", fill=self.config.TEXT_COLOR,
+                             font=THEME.font(8))
+            for _ in range(3)
+        ]
+        self.selection = None
+        self.selection_item = self.create_rectangle(
+            0, 0, 0, 0, outline=self.config.GOLD_COLOR, width=2, state="hidden"
+        )
+        self.drag_start = None
+        
+        self.bind('<Configure>', lambda e: self.redraw())
+        self.bind('<ButtonPress-1>', self.on_press)
+        self.bind('<B1-Motion>', self.on_drag)
+        self.bind('<ButtonRelease-1>', self.on_release)
+    
+    def set_window(self, seconds):
+        """Show the last `seconds` of history and clear any selection"""
+        self.window = seconds
+        self.selection = None
+        self.redraw()
+    
+    def redraw(self):
+        """Redraw the bars from the current bin counts"""
+        width = self.winfo_width()
+        height = self.winfo_height()
+        if width <= 1 or height <= 1:
+            return
+        
+        end_time = time.time()
+        resolution = TimeBins.resolution_for(self.window)
+        counts = self.time_bins.counts(resolution, end_time - self.window, end_time)
+        self.view = (counts[0][0], counts[-1][0] + RESOLUTIONS[resolution])
+        
+        # Grow or shrink the pool of bar items to the number of bins
+        while len(self.bars) < len(counts):
+            self.bars.append(self.create_rectangle(
+                0, 0, 0, 0, fill=self.config.ACCENT_COLOR, outline=""
+            ))
+        if len(self.bars) > len(counts):
+            self.delete(*self.bars[len(counts):])
+            del self.bars[len(counts):]
+        
+        # Leave room for the axis labels
+        plot_height = height - 14
+        peak = max(count for _, count in counts) or 1
+        bar_width = width / len(counts)
+        
+        for i, (bar, (_, count)) in enumerate(zip(self.bars, counts)):
+            bar_height = plot_height * count / peak
+            self.coords(
+                bar,
+                i * bar_width, plot_height - bar_height,
+                (i + 1) * bar_width - 1, plot_height
+            )
+            self.itemconfigure(
+                bar, fill=self.config.WARNING_COLOR if count == peak and count else self.config.ACCENT_COLOR
+            )
+        
+        # Axis labels: start, end and peak rate
+        time_format = "%H:%M" if self.window <= 86400 else "%d %b"
+        start_label, end_label, peak_label = self.labels
+        self.coords(start_label, 2, plot_height + 1)
+        self.itemconfigure(start_label, text=datetime.fromtimestamp(self.view[0]).strftime(time_format))
+        self.coords(end_label, width - 2, plot_height + 1)
+        self.itemconfigure(end_label, anchor="ne",
+                           text=datetime.fromtimestamp(self.view[1]).strftime(time_format))
+        self.coords(peak_label, 2, 1)
+        self.itemconfigure(peak_label, text=f"peak {peak}/{resolution}")
+        
+        self.draw_selection()
+        self.tag_raise(self.selection_item)
+    
+    def time_at(self, x):
+        """Convert a canvas x position to a timestamp"""
+        width = max(1, self.winfo_width())
+        start, end = self.view
+        return start + (end - start) * min(max(x, 0), width) / width
+    
+    def x_at(self, timestamp):
+        """Convert a timestamp to a canvas x position"""
+        start, end = self.view
+        return (timestamp - start) / (end - start) * self.winfo_width()
+    
+    def draw_selection(self):
+        """Show or hide the selection rectangle"""
+        if self.selection is None:
+            self.itemconfigure(self.selection_item, state="hidden")
+            return
+        
+        start, end = self.selection
+        self.coords(self.selection_item, self.x_at(start), 1, self.x_at(end), self.winfo_height() - 14)
+        self.itemconfigure(self.selection_item, state="normal")
+    
+    def on_press(self, event):
+        """Start a drag selection"""
+        self.drag_start = event.x
+    
+    def on_drag(self, event):
+        """Update the drag selection"""
+        if self.drag_start is None:
+            return
+        
+        times = sorted((self.time_at(self.drag_start), self.time_at(event.x)))
+        self.selection = tuple(times)
+        self.draw_selection()
+    
+    def on_release(self, event):
+        """Finish a drag selection; a plain tap clears it"""
+        if self.drag_start is not None and abs(event.x - self.drag_start) < 5:
+            self.selection = None
+            self.draw_selection()
+        self.drag_start = None
+        
+        if self.on_select:
+            self.on_select(self.selection)
+
+class DebugOverlay(tk.Label):
+    """On-screen overlay showing frame timing and render statistics"""
+    
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.config = THEME.config
+        self.configure(
+            font=THEME.font(self.config.FONT_SIZE_SMALL, family="Courier"),
+            bg="#000000",
+            fg=self.config.GOLD_COLOR,
+            justify="left",
+            anchor="nw",
+            padx=8,
+            pady=4
+        )
+        
+        self.refresh_id = None
+        self.last_snapshot = 0.0
+    
+    def show(self):
+        """Show the overlay and start refreshing it"""
+        self.place(relx=1.0, x=-10, y=10, anchor="ne")
+        self.lift()
+        if self.refresh_id is None:
+            self.refresh()
+    
+    def hide(self):
+        """Hide the overlay and stop refreshing it"""
+        self.place_forget()
+        if self.refresh_id:
+            self.after_cancel(self.refresh_id)
+            self.refresh_id = None
+    
+    def toggle(self):
+        """Toggle overlay visibility"""
+        if self.refresh_id is None:
+            self.show()
+        else:
+            self.hide()
+    
+    def refresh(self):
+        """Update the overlay text and record a snapshot to the rolling file"""
+        self.configure(text=RENDER_STATS.format_summary() + "\n" + LATENCY.format_summary())
+        self.lift()
+        
+        now = time.time()
+        if now - self.last_snapshot >= self.config.DEBUG_STATS_INTERVAL:
+            self.last_snapshot = now
+            try:
+                RENDER_STATS.write_snapshot(
+                    self.config.DEBUG_STATS_FILE,
+                    self.config.DEBUG_STATS_MAX_BYTES,
+                    self.config.DEBUG_STATS_BACKUPS
+                )
+            except OSError as e:
+                print(f"Error writing render stats: {e}")
+        
+        self.refresh_id = self.after(self.config.DEBUG_OVERLAY_INTERVAL, self.refresh)
\ No newline at end of file
@@ -11,13 +11,107 @@ class Config:
     APP_TITLE = "GILDA - Gunshot Detection System"
     DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
     
+    # Application log (written by a background thread, rotated files are gzipped)
+    LOG_DIR = "logs"
+    LOG_MAX_BYTES = 5 * 1024 * 1024
+    LOG_BACKUPS = 5
+    LOG_JSON = os.getenv('GILDA_LOG_JSON', 'False').lower() == 'true'  # JSON lines instead of text
+    INSTANCE = os.getenv('GILDA_INSTANCE', '')  # logs go under logs/<instance>; --aggregator and --connect set one
+    
+    # Detection-to-display latency tracking
+    LATENCY_SLO_MS = 1500  # ingest to canvas draw; slower detections are logged
+    LATENCY_METRICS_FILE = os.path.join("logs", "latency_metrics.log")
+    
+    # Debug overlay (shown at startup when DEBUG is set, toggled with F12)
+    DEBUG_OVERLAY_KEY = "<F12>"
+    DEBUG_OVERLAY_INTERVAL = 500  # milliseconds between overlay refreshes
+    DEBUG_STATS_INTERVAL = 5  # seconds between rolling file snapshots
+    DEBUG_STATS_FILE = os.path.join("logs", "render_stats.log")
+    DEBUG_STATS_MAX_BYTES = 1024 * 1024
+    DEBUG_STATS_BACKUPS = 3
+    
+    # Runtime profiling (whole session when GILDA_PROFILE is set, or toggled with the key)
+    PROFILE = os.getenv('GILDA_PROFILE', 'False').lower() == 'true'
+    PROFILE_KEY = "<Control-Alt-p>"
+    PROFILE_DIR = "logs"
+    PROFILE_TOP_FUNCTIONS = 40  # functions listed in the text summary
+    
+    # Metrics export for fleet monitoring (Prometheus text on localhost only)
+    METRICS_PORT = int(os.getenv('GILDA_METRICS_PORT', '9108'))  # 0 disables the endpoint
+    METRICS_SNAPSHOT_FILE = os.path.join("logs", "metrics.json")
+    METRICS_SNAPSHOT_INTERVAL = 60  # seconds between snapshot files
+    AGGREGATOR_METRICS_PORT = int(os.getenv('GILDA_AGGREGATOR_METRICS_PORT', '9110'))  # endpoint of --aggregator
+    
     # Authentication settings
     SESSION_TIMEOUT = 3600  # 1 hour in seconds
+    SESSION_EXTEND_THROTTLE = 5  # seconds between activity-based session extensions
+    USERS_FILE = "users.json"  # salted password hashes, created with default accounts if missing
+    AUTH_KDF_ITERATIONS = int(os.getenv('GILDA_KDF_ITERATIONS', '200000'))  # PBKDF2 cost; sets login latency
+    AUTH_CACHE_TTL = 900  # seconds a verified login skips the KDF when re-entered
+    
+    # Sensor nodes
+    DEFAULT_NODE_ID = "NODE-1"  # node assigned to detections recorded without one
+    NODE_BUFFER_SIZE = 100  # recent detections kept per node for the live views
+    NODE_HEARTBEAT_WARN = 30  # seconds without a heartbeat before a node shows a warning
+    NODE_HEARTBEAT_TIMEOUT = 120  # seconds without a heartbeat before a node shows an error
+    NODE_QUIET_AFTER = 300  # seconds without a detection before a live node is shown as quiet
+    
+    # Operator audit trail (append-only, hash-chained JSON lines)
+    AUDIT_LOG_FILE = os.path.join("logs", "audit.log")
+    AUDIT_FLUSH_INTERVAL = 1.0  # seconds a record may wait before its batch is written
+    AUDIT_BATCH_SIZE = 100  # records per write and fsync
+    
+    # Display power settings
+    DISPLAY_BLANK_TIMEOUT = 0  # seconds without input before page timers pause (0 disables)
+    
+    # Event loop stall watchdog
+    WATCHDOG_INTERVAL = 100  # milliseconds between heartbeats on the Tk thread
+    WATCHDOG_STALL_MS = 500  # heartbeat gap reported as a stall
+    
+    # Memory budgets for long-running units
+    MEMORY_CHECK_INTERVAL = 60  # seconds between RSS samples
+    MEMORY_WARN_MB = 256  # log a warning above this RSS
+    MEMORY_LIMIT_MB = 384  # above this RSS, drop old detections
+    MEMORY_GROWTH_LOG_MB = 8  # log samples that grew more than this at INFO
+    DATA_RETENTION_DAYS = 30  # detection history kept by routine retention
+    MEMORY_MIN_RETENTION_DAYS = 1  # floor when retention is shortened for memory
+    MEMORY_RETENTION_INTERVAL = 3600  # seconds between routine retention passes (each rewrites the data file)
+    MEMORY_TRACEMALLOC = os.getenv('GILDA_TRACEMALLOC', 'False').lower() == 'true'
+    MEMORY_TRACE_FRAMES = 1  # stack frames kept per allocation
+    MEMORY_SNAPSHOT_INTERVAL = 1800  # seconds between tracemalloc snapshot diffs
+    MEMORY_TOP_ALLOCATORS = 10
+    
+    # Shared data plane: one headless aggregator owns the store, displays subscribe to it
+    AGGREGATOR_ADDRESS = os.getenv('GILDA_AGGREGATOR', '/tmp/gilda-aggregator.sock')  # Unix path or host:port
+    AGGREGATOR_CLIENT = os.getenv('GILDA_AGGREGATOR_CLIENT', 'False').lower() == 'true'  # UI renders from the aggregator
+    AGGREGATOR_DELTA_HISTORY = 1000  # recent deltas kept so reconnecting displays skip the snapshot
+    AGGREGATOR_MAX_BUFFER = 16 * 1024 * 1024  # bytes queued for a slow display before it is dropped
+    AGGREGATOR_RETENTION_INTERVAL = 3600  # seconds between retention passes in the aggregator
+    AGGREGATOR_POLL_INTERVAL = 100  # milliseconds between applying received updates in the UI
+    AGGREGATOR_RECONNECT_DELAY = 2  # seconds between reconnect attempts from a display
     
     # Data settings
     MAX_RADAR_POINTS = 100
+    RECENT_LIST_SIZE = 10  # detections listed beside the radar
     MAP_UPDATE_INTERVAL = 1000  # milliseconds
     
+    # Radar sweep animation
+    RADAR_SWEEP_FPS = 20  # target frames per second
+    RADAR_SWEEP_MIN_FPS = 5  # floor when throttling for CPU
+    RADAR_SWEEP_PERIOD = 4000  # milliseconds per revolution
+    RADAR_SWEEP_TRAIL = 45  # degrees of fading trail behind the sweep
+    RADAR_SWEEP_CPU_CAP = 0.25  # max fraction of one core before the sweep slows down
+    
+    # Map and radar interaction
+    TAP_RADIUS = 15  # pixels around a tap that select a detection
+    MAP_VIEW_SPAN = 0.02  # degrees of latitude/longitude shown on the map
+    
+    # Alert settings
+    ALERT_DISPLAY_TIME = 10  # seconds an alert stays up when nothing else is queued
+    ALERT_MIN_DISPLAY = 2  # seconds before a queued alert may replace the current one
+    ALERT_COALESCE_WINDOW = 3  # seconds within which same-sector alerts merge
+    ALERT_MAX_PENDING = 20  # queued alerts kept before the lowest priority is dropped
+    
     # Colors and styling - Indian Army Theme
     PRIMARY_COLOR = "#1B2F1B"      # Dark Army Green
     SECONDARY_COLOR = "#2D4A2D"    # Medium Army Green
@@ -7,50 +7,166 @@ Main entry point for the application
 import sys
 import os
 import logging
+import argparse
+import signal
 from datetime import datetime
 
 # Add project root to Python path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
-from src.app import GILDAApp
+from src.utils.startup import STARTUP
 from src.config import Config
+from src.utils.profiling import PROFILER
+from src.utils.log_pipeline import compressed_rotating_handler, queued_handler, JSONLineFormatter
 
 def setup_logging():
-    """Setup logging configuration"""
-    log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+    """Setup logging so file and console output are written off the Tk thread"""
+    log_filename = os.path.join(Config.LOG_DIR, f"gilda_{datetime.now().strftime('%Y%m%d')}.log")
+    text_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     
-    log_filename = os.path.join(log_dir, f"gilda_{datetime.now().strftime('%Y%m%d')}.log")
+    file_handler = compressed_rotating_handler(log_filename, Config.LOG_MAX_BYTES, Config.LOG_BACKUPS)
+    file_handler.setFormatter(JSONLineFormatter() if Config.LOG_JSON else text_format)
+    
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(text_format)
     
     logging.basicConfig(
         level=logging.INFO if not Config.DEBUG else logging.DEBUG,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_filename),
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[queued_handler(file_handler, console_handler)]
     )
 
+def use_instance(name):
+    """Keep this process's logs, audit chain and metrics apart from others run in the same directory"""
+    if not name:
+        return
+    
+    log_dir = os.path.join(Config.LOG_DIR, name)
+    for setting in ("LATENCY_METRICS_FILE", "DEBUG_STATS_FILE", "METRICS_SNAPSHOT_FILE", "AUDIT_LOG_FILE"):
+        setattr(Config, setting, os.path.join(log_dir, os.path.basename(getattr(Config, setting))))
+    Config.LOG_DIR = log_dir
+    Config.PROFILE_DIR = log_dir
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="GILDA Gunshot Detection System")
+    parser.add_argument("--export-archive", metavar="PATH",
+                        help="write detection history to a .gz or .zst archive and exit")
+    parser.add_argument("--import-archive", metavar="PATH",
+                        help="merge a detection archive into local history and exit")
+    parser.add_argument("--aggregator", nargs="?", const=Config.AGGREGATOR_ADDRESS, metavar="ADDRESS",
+                        help="run headless, owning the detection store and serving displays "
+                             "on a Unix socket path or host:port")
+    parser.add_argument("--connect", nargs="?", const=Config.AGGREGATOR_ADDRESS, metavar="ADDRESS",
+                        help="render from a running aggregator instead of a local data file")
+    return parser.parse_args()
+
+def run_archive_command(args):
+    """Export or import a detection archive without starting the UI"""
+    from src.utils.data_manager import DataManager
+    from src.utils import archive
+    
+    logger = logging.getLogger(__name__)
+    data_manager = DataManager()
+    
+    if args.export_archive:
+        count = archive.export_archive(data_manager, args.export_archive)
+        logger.info(f"Exported {count} detections to {args.export_archive}")
+    
+    if args.import_archive:
+        added, skipped, invalid = archive.import_archive(data_manager, args.import_archive)
+        logger.info(f"Imported {added} detections from {args.import_archive} "
+                    f"({skipped} duplicates, {invalid} malformed records skipped)")
+
+def run_aggregator(address):
+    """Own ingestion and storage without Tk, serving snapshots and deltas to displays"""
+    from src.utils.data_manager import DataManager
+    from src.utils.aggregator import AggregatorServer
+    from src.utils.audit import AUDIT
+    
+    logger = logging.getLogger(__name__)
+    server = AggregatorServer(DataManager(), address)
+    
+    # Edits are attributed to the operator named in each display's command
+    AUDIT.actor = lambda: server.current_user
+    AUDIT.start()
+    metrics_exporter = setup_metrics(Config.AGGREGATOR_METRICS_PORT)
+    signal.signal(signal.SIGTERM, lambda signum, frame: server.stop())
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Aggregator interrupted by user")
+    finally:
+        metrics_exporter.stop()
+        AUDIT.stop()
+
+def setup_profiling(app):
+    """Bind the hidden profiling key and start a session-long profile if requested"""
+    app.root.bind(Config.PROFILE_KEY, PROFILER.toggle)
+    if Config.PROFILE:
+        PROFILER.start()
+
+def setup_metrics(port=None):
+    """Start the localhost metrics endpoint and the periodic snapshot file"""
+    from src.utils.metrics import METRICS, MetricsExporter
+    
+    exporter = MetricsExporter(METRICS, port=port)
+    exporter.start()
+    return exporter
+
 def main():
     """Main application entry point"""
+    args = parse_args()
+    
+    # The aggregator and its displays usually share a working directory
+    if args.aggregator:
+        use_instance(Config.INSTANCE or "aggregator")
+    elif args.connect or Config.AGGREGATOR_CLIENT:
+        use_instance(Config.INSTANCE or "display")
+    else:
+        use_instance(Config.INSTANCE)
+    
     try:
         # Setup logging
         setup_logging()
         logger = logging.getLogger(__name__)
+        STARTUP.mark("setup logging")
+        
+        if args.export_archive or args.import_archive:
+            run_archive_command(args)
+            return
+        
+        if args.aggregator:
+            logger.info(f"Starting GILDA aggregator on {args.aggregator}")
+            run_aggregator(args.aggregator)
+            return
+        
+        if args.connect:
+            Config.AGGREGATOR_CLIENT = True
+            Config.AGGREGATOR_ADDRESS = args.connect
         
         logger.info("Starting GILDA Gunshot Detection System")
         logger.info(f"Python version: {sys.version}")
         logger.info(f"Platform: {sys.platform}")
         
+        # Imported here so archive commands never load Tk or the pages
+        from src.app import GILDAApp
+        STARTUP.mark("import app")
+        
         # Create and run application
         app = GILDAApp()
+        setup_profiling(app)
+        metrics_exporter = setup_metrics()
         
         logger.info("Application initialized successfully")
         logger.info("Starting main application loop")
         
-        app.run()
+        try:
+            app.run()
+        finally:
+            PROFILER.stop()
+            metrics_exporter.stop()
         
     except ImportError as e:
         print(f"Import error: {e}")
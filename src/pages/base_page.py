@@ -1,6 +1,9 @@
 import tkinter as tk
+from tkinter import messagebox
+from datetime import datetime
 from abc import ABC, abstractmethod
-from src.config import Config
+from src.utils.render_stats import RENDER_STATS
+from src.components.theme import THEME
 
 class BasePage(ABC, tk.Frame):
     """Base class for all pages in the application"""
@@ -8,7 +11,11 @@ class BasePage(ABC, tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
-        self.config = Config()
+        self.config = THEME.config
+        
+        # Periodic callbacks, only running while the page is visible
+        self.timers = {}
+        self.timers_active = False
         
         # Configure the frame
         self.configure(bg=self.config.PRIMARY_COLOR)
@@ -24,17 +31,67 @@ class BasePage(ABC, tk.Frame):
     def show(self):
         """Show this page"""
         self.tkraise()
+        self.resume_timers()
     
     def hide(self):
         """Hide this page"""
-        pass
+        self.pause_timers()
+    
+    def add_timer(self, name, interval, callback):
+        """Register a periodic callback that runs only while the page is visible"""
+        self.remove_timer(name)
+        self.timers[name] = {"interval": interval, "callback": callback, "after_id": None}
+        if self.timers_active:
+            self._schedule_timer(name, 0)
+    
+    def remove_timer(self, name):
+        """Unregister a periodic callback"""
+        timer = self.timers.pop(name, None)
+        if timer and timer["after_id"]:
+            self.after_cancel(timer["after_id"])
+    
+    def pause_timers(self):
+        """Stop all periodic callbacks, e.g. when hidden or the display is blanked"""
+        self.timers_active = False
+        for timer in self.timers.values():
+            if timer["after_id"]:
+                self.after_cancel(timer["after_id"])
+                timer["after_id"] = None
+    
+    def resume_timers(self):
+        """Restart all periodic callbacks, running each one straight away"""
+        if self.timers_active:
+            return
+        
+        self.timers_active = True
+        for name in self.timers:
+            self._schedule_timer(name, 0)
+    
+    def _schedule_timer(self, name, delay):
+        """Schedule the next run of a registered callback"""
+        self.timers[name]["after_id"] = RENDER_STATS.after(
+            self, delay, lambda: self._run_timer(name)
+        )
+    
+    def _run_timer(self, name):
+        """Run a registered callback and schedule its next run"""
+        timer = self.timers.get(name)
+        if timer is None:
+            return
+        
+        timer["after_id"] = None
+        next_delay = timer["callback"]()  # Callbacks may return their next delay in ms
+        
+        # The callback may have paused the page or replaced the timer
+        if self.timers_active and self.timers.get(name) is timer and timer["after_id"] is None:
+            self._schedule_timer(name, timer["interval"] if next_delay is None else next_delay)
     
     def create_title_label(self, text, row=0, column=0, columnspan=1):
         """Create a standardized title label"""
         title = tk.Label(
             self,
             text=text,
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_TITLE, "bold"),
+            font=THEME.font(self.config.FONT_SIZE_TITLE, "bold"),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.TEXT_COLOR
         )
@@ -47,7 +104,7 @@ class BasePage(ABC, tk.Frame):
             self,
             text=text,
             command=command,
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM),
             bg=self.config.ACCENT_COLOR,
             fg=self.config.TEXT_COLOR,
             activebackground=self.config.SECONDARY_COLOR,
@@ -58,4 +115,22 @@ class BasePage(ABC, tk.Frame):
             **kwargs
         )
         button.grid(row=row, column=column, pady=10, padx=10, sticky="ew")
-        return button
\ No newline at end of file
+        return button
+    
+    def show_detection_details(self, detection):
+        """Show the full record of a selected detection"""
+        if detection is None:
+            return
+        
+        detected_at = datetime.fromtimestamp(detection["timestamp"])
+        verified = {True: "YES", False: "NO"}.get(detection.get("verified"), "PENDING")
+        
+        details = (
+            f"Time: {detected_at.strftime('%d %b %Y %H:%M:%S')}\n"
+            f"Position: {detection['latitude']:.5f}, {detection['longitude']:.5f}\n"
+            f"Bearing: {int(round(detection['angle'])):03d}°  Range: {detection['distance']}\n"
+            f"Intensity: {detection['intensity']:.2f}\n"
+            f"Confidence: {detection['confidence']:.0%}\n"
+            f"Verified: {verified}"
+        )
+        messagebox.showinfo(f"Detection {detection['id']}", details)
\ No newline at end of file
@@ -2,14 +2,15 @@ import tkinter as tk
 from tkinter import messagebox
 import math
 from src.pages.base_page import BasePage
-from src.utils.auth import AuthManager
+from src.components.theme import THEME
 
 class LoginPage(BasePage):
     """Modern military-style login page for Indian Army application"""
     
     def __init__(self, parent, controller):
-        self.auth_manager = AuthManager()
+        self.auth_manager = controller.get_auth_manager()
         self.animation_step = 0
+        self.login_worker = None  # Verification running in the background
         super().__init__(parent, controller)
     
     def setup_ui(self):
@@ -31,8 +32,8 @@ class LoginPage(BasePage):
         # Footer with system info
         self.create_footer()
         
-        # Start subtle animations
-        self.animate_elements()
+        # Subtle animations, paused by BasePage whenever the page is hidden
+        self.add_timer("animate", 2000, self.animate_elements)
     
     def create_header(self):
         """Create the header with military styling"""
@@ -60,7 +61,7 @@ class LoginPage(BasePage):
         main_title = tk.Label(
             title_frame,
             text="GILDA",
-            font=(self.config.FONT_FAMILY, 32, "bold"),
+            font=THEME.font(32, "bold"),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.GOLD_COLOR
         )
@@ -69,7 +70,7 @@ class LoginPage(BasePage):
         subtitle = tk.Label(
             title_frame,
             text="Gunshot Intelligence & Location Detection Array",
-            font=(self.config.FONT_FAMILY, 12, "italic"),
+            font=THEME.font(12, "italic"),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.TEXT_COLOR
         )
@@ -78,7 +79,7 @@ class LoginPage(BasePage):
         classification = tk.Label(
             title_frame,
             text="● RESTRICTED ACCESS ●",
-            font=(self.config.FONT_FAMILY, 10, "bold"),
+            font=THEME.font(10, "bold"),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.ERROR_COLOR
         )
@@ -93,7 +94,7 @@ class LoginPage(BasePage):
         tk.Label(
             status_frame,
             text="SYSTEM\nSTATUS",
-            font=(self.config.FONT_FAMILY, 9, "bold"),
+            font=THEME.font(9, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.TEXT_COLOR,
             justify="center"
@@ -102,7 +103,7 @@ class LoginPage(BasePage):
         self.status_indicator = tk.Label(
             status_frame,
             text="● ONLINE",
-            font=(self.config.FONT_FAMILY, 8, "bold"),
+            font=THEME.font(8, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.SUCCESS_COLOR
         )
@@ -125,7 +126,7 @@ class LoginPage(BasePage):
         tk.Label(
             card_header,
             text="🔐 SECURE LOGIN",
-            font=(self.config.FONT_FAMILY, 16, "bold"),
+            font=THEME.font(16, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.GOLD_COLOR
         ).pack(expand=True)
@@ -145,14 +146,14 @@ class LoginPage(BasePage):
         tk.Label(
             form_frame,
             text="Service Number:",
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM, "bold"),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.TEXT_COLOR
         ).grid(row=0, column=0, sticky="w", pady=(0, 5))
         
         self.username_entry = tk.Entry(
             form_frame,
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM),
             bg=self.config.TEXT_COLOR,
             fg=self.config.PRIMARY_COLOR,
             relief="flat",
@@ -165,14 +166,14 @@ class LoginPage(BasePage):
         tk.Label(
             form_frame,
             text="Access Code:",
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM, "bold"),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.TEXT_COLOR
         ).grid(row=2, column=0, sticky="w", pady=(0, 5))
         
         self.password_entry = tk.Entry(
             form_frame,
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM),
             show="●",
             bg=self.config.TEXT_COLOR,
             fg=self.config.PRIMARY_COLOR,
@@ -187,7 +188,7 @@ class LoginPage(BasePage):
             form_frame,
             text="🔓 AUTHENTICATE",
             command=self.handle_login,
-            font=(self.config.FONT_FAMILY, self.config.FONT_SIZE_MEDIUM, "bold"),
+            font=THEME.font(self.config.FONT_SIZE_MEDIUM, "bold"),
             bg=self.config.SUCCESS_COLOR,
             fg=self.config.TEXT_COLOR,
             activebackground=self.config.ACCENT_COLOR,
@@ -208,7 +209,7 @@ class LoginPage(BasePage):
         tk.Label(
             security_frame,
             text="⚠ Authorized Personnel Only • All Access Monitored ⚠",
-            font=(self.config.FONT_FAMILY, 9, "bold"),
+            font=THEME.font(9, "bold"),
             bg=self.config.BORDER_COLOR,
             fg=self.config.WARNING_COLOR
         ).pack(expand=True)
@@ -233,7 +234,7 @@ class LoginPage(BasePage):
         tk.Label(
             footer_frame,
             text="Indian Army • Defense Technology",
-            font=(self.config.FONT_FAMILY, 9),
+            font=THEME.font(9),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.TEXT_COLOR
         ).grid(row=0, column=0, sticky="w", padx=20)
@@ -242,7 +243,7 @@ class LoginPage(BasePage):
         tk.Label(
             footer_frame,
             text="Version 1.0 • Secure Terminal",
-            font=(self.config.FONT_FAMILY, 9),
+            font=THEME.font(9),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.TEXT_COLOR
         ).grid(row=0, column=1)
@@ -253,7 +254,7 @@ class LoginPage(BasePage):
         tk.Label(
             footer_frame,
             text=current_time,
-            font=(self.config.FONT_FAMILY, 9),
+            font=THEME.font(9),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.TEXT_COLOR
         ).grid(row=0, column=2, sticky="e", padx=20)
@@ -300,10 +301,12 @@ class LoginPage(BasePage):
             self.status_indicator.configure(fg=color)
         
         self.animation_step += 1
-        self.after(2000, self.animate_elements)  # Animate every 2 seconds
     
     def handle_login(self):
         """Handle login attempt with enhanced feedback"""
+        if self.login_worker and not self.login_worker.finished:
+            return  # Enter pressed again while verifying
+        
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
         
@@ -313,19 +316,30 @@ class LoginPage(BasePage):
         
         # Disable button during authentication
         self.login_btn.configure(state="disabled", text="🔄 AUTHENTICATING...")
-        self.update()
         
-        # Simulate authentication delay
-        self.after(1000, lambda: self.complete_authentication(username, password))
+        # Password hashing is deliberately slow, so it runs on a worker thread
+        self.login_worker = self.auth_manager.begin_login(username, password)
+        self.add_timer("login", 50, self.poll_authentication)
+    
+    def poll_authentication(self):
+        """Wait for the verification worker, then complete the login"""
+        if not self.login_worker.finished:
+            return
+        
+        self.remove_timer("login")
+        self.complete_authentication(self.login_worker)
     
-    def complete_authentication(self, username, password):
+    def complete_authentication(self, worker):
         """Complete the authentication process"""
-        if self.auth_manager.authenticate(username, password):
+        if self.auth_manager.finish_login(worker):
             self.login_btn.configure(text="✅ ACCESS GRANTED", bg=self.config.SUCCESS_COLOR)
             self.password_entry.delete(0, tk.END)
-            
-            # Navigate after brief delay
-            self.after(1000, lambda: self.controller.show_page("RadarPage"))
+            self.controller.show_page("RadarPage")
+        elif worker.error:
+            self.show_error("Access Denied", "Authentication unavailable; contact the administrator")
+            self.login_btn.configure(state="normal", text="🔓 AUTHENTICATE", 
+                                   bg=self.config.SUCCESS_COLOR)
+            self.password_entry.delete(0, tk.END)
         else:
             self.show_error("Access Denied", "Invalid credentials")
             self.login_btn.configure(state="normal", text="🔓 AUTHENTICATE", 
@@ -1,18 +1,41 @@
 import tkinter as tk
 from tkinter import ttk
-import math
 import random
+import time
 from src.pages.base_page import BasePage
-from src.utils.data_manager import DataManager
+from src.utils.data_manager import TIME_FILTERS
+from src.utils.spatial_index import SpatialIndex
+from src.utils.render_stats import RENDER_STATS, timed
+from src.utils.latency import LATENCY
+from src.utils.profiling import hot_path
+from src.components.widgets import TimelineHistogram, DataTable
+from src.components.renderers import MapRenderer
+from src.components.theme import THEME
 
 class MapPage(BasePage):
     """Military-grade map view page for tactical positioning"""
     
     def __init__(self, parent, controller):
-        self.data_manager = DataManager()
+        self.data_manager = controller.get_data_manager()
         self.map_markers = []
         self.node_coords = {"lat": 28.6139, "lon": 77.2090}
         self.enemy_coords = {"lat": 28.6145, "lon": 77.2095}
+        
+        # Visible map area; fitted to the detections whenever they change, until zoom and pan exist
+        self.viewport = {
+            "lat": self.node_coords["lat"],
+            "lon": self.node_coords["lon"],
+            "span": THEME.config.MAP_VIEW_SPAN
+        }
+        
+        # Detections indexed by geo position, and drawn markers by screen position
+        self.geo_index = SpatialIndex(cell_size=0.001)
+        self.geo_index_revision = None
+        self.screen_index = SpatialIndex(cell_size=32)
+        
+        # Time range selected on the timeline, or None for the preset window
+        self.time_range = None
+        self.list_snapshot = None  # Rows in the detection list, for diffing
         super().__init__(parent, controller)
     
     def setup_ui(self):
@@ -35,6 +58,11 @@ class MapPage(BasePage):
         
         # Tactical information box
         self.create_tactical_info()
+        
+        # Periodic work, paused by BasePage whenever the page is hidden
+        self.add_timer("tactical", 2000, self.update_tactical_display)
+        self.add_timer("timeline", 5000, self.timeline.redraw)
+        self.add_timer("detection_list", self.config.MAP_UPDATE_INTERVAL, self.update_detection_list)
     
     def create_header(self):
         """Create header with title and navigation"""
@@ -51,7 +79,7 @@ class MapPage(BasePage):
             nav_frame,
             text="RADAR VIEW",
             command=lambda: self.controller.show_page("RadarPage"),
-            font=(self.config.FONT_FAMILY, 10, "bold"),
+            font=THEME.font(10, "bold"),
             bg=self.config.ACCENT_COLOR,
             fg=self.config.TEXT_COLOR,
             relief="raised",
@@ -65,7 +93,7 @@ class MapPage(BasePage):
             nav_frame,
             text="LOGOUT",
             command=self.handle_logout,
-            font=(self.config.FONT_FAMILY, 10, "bold"),
+            font=THEME.font(10, "bold"),
             bg=self.config.ERROR_COLOR,
             fg=self.config.TEXT_COLOR,
             relief="raised",
@@ -79,7 +107,7 @@ class MapPage(BasePage):
         title = tk.Label(
             header_frame,
             text="MAP",
-            font=(self.config.FONT_FAMILY, 36, "bold"),
+            font=THEME.font(36, "bold"),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.GOLD_COLOR
         )
@@ -100,12 +128,50 @@ class MapPage(BasePage):
         )
         self.map_canvas.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
         
+        # Detections in the selected time window, beside the map
+        self.detection_list = DataTable(map_frame, ("detections",))
+        self.detection_list.grid(row=0, column=1, sticky="ns", padx=(0, 10), pady=10)
+        self.detection_list.tree.bind("<<TreeviewSelect>>", self.on_list_select)
+        
+        # Timeline of detection counts with its time window selector
+        self.create_timeline(map_frame)
+        
         # Bind canvas events
         self.map_canvas.bind('<Configure>', self.on_canvas_resize)
+        self.map_canvas.bind('<Button-1>', self.on_map_tap)
+        RENDER_STATS.register_canvas("map", self.map_canvas)
+        self.map_renderer = MapRenderer(self.map_canvas)
         
         # Draw the GIS map
         self.after(100, self.draw_gis_map)
     
+    def create_timeline(self, parent):
+        """Create the detection timeline below the map"""
+        timeline_frame = tk.Frame(parent, bg=self.config.SECONDARY_COLOR)
+        timeline_frame.grid(row=1, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 10))
+        timeline_frame.grid_columnconfigure(1, weight=1)
+        
+        self.time_filter = tk.StringVar(value="Last 24 Hours")
+        filter_menu = tk.OptionMenu(
+            timeline_frame, self.time_filter, *TIME_FILTERS,
+            command=self.on_time_filter_change
+        )
+        filter_menu.configure(
+            font=THEME.font(10),
+            bg=self.config.BORDER_COLOR,
+            fg=self.config.TEXT_COLOR,
+            highlightthickness=0
+        )
+        filter_menu.grid(row=0, column=0, sticky="n", padx=(0, 10))
+        
+        self.timeline = TimelineHistogram(
+            timeline_frame,
+            self.data_manager.time_bins,
+            on_select=self.on_timeline_select,
+            window=TIME_FILTERS[self.time_filter.get()]
+        )
+        self.timeline.grid(row=0, column=1, sticky="ew")
+    
     def create_coordinates_display(self):
         """Create coordinates display below the map"""
         coords_frame = tk.Frame(self, bg=self.config.PRIMARY_COLOR, height=60)
@@ -121,7 +187,7 @@ class MapPage(BasePage):
         tk.Label(
             your_frame,
             text="YOUR COORDINATES:",
-            font=(self.config.FONT_FAMILY, 12, "bold"),
+            font=THEME.font(12, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.SUCCESS_COLOR
         ).pack(pady=5)
@@ -129,7 +195,7 @@ class MapPage(BasePage):
         self.your_coords_label = tk.Label(
             your_frame,
             text=f"{self.node_coords['lat']:.4f}° N, {self.node_coords['lon']:.4f}° E",
-            font=(self.config.FONT_FAMILY, 11, "bold"),
+            font=THEME.font(11, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.TEXT_COLOR
         )
@@ -142,7 +208,7 @@ class MapPage(BasePage):
         tk.Label(
             enemy_frame,
             text="ENEMY COORDINATES:",
-            font=(self.config.FONT_FAMILY, 12, "bold"),
+            font=THEME.font(12, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.ERROR_COLOR
         ).pack(pady=5)
@@ -150,7 +216,7 @@ class MapPage(BasePage):
         self.enemy_coords_label = tk.Label(
             enemy_frame,
             text=f"{self.enemy_coords['lat']:.4f}° N, {self.enemy_coords['lon']:.4f}° E",
-            font=(self.config.FONT_FAMILY, 11, "bold"),
+            font=THEME.font(11, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.TEXT_COLOR
         )
@@ -175,7 +241,7 @@ class MapPage(BasePage):
         tk.Label(
             elev_frame,
             text="ELEVATION:",
-            font=(self.config.FONT_FAMILY, 10, "bold"),
+            font=THEME.font(10, "bold"),
             bg=self.config.BORDER_COLOR,
             fg=self.config.TEXT_COLOR
         ).pack()
@@ -183,7 +249,7 @@ class MapPage(BasePage):
         self.elevation_label = tk.Label(
             elev_frame,
             text="+12.5°",
-            font=(self.config.FONT_FAMILY, 14, "bold"),
+            font=THEME.font(14, "bold"),
             bg=self.config.BORDER_COLOR,
             fg=self.config.WARNING_COLOR
         )
@@ -196,7 +262,7 @@ class MapPage(BasePage):
         tk.Label(
             range_frame,
             text="RANGE:",
-            font=(self.config.FONT_FAMILY, 10, "bold"),
+            font=THEME.font(10, "bold"),
             bg=self.config.BORDER_COLOR,
             fg=self.config.TEXT_COLOR
         ).pack()
@@ -204,7 +270,7 @@ class MapPage(BasePage):
         self.range_label = tk.Label(
             range_frame,
             text="1,247 m",
-            font=(self.config.FONT_FAMILY, 14, "bold"),
+            font=THEME.font(14, "bold"),
             bg=self.config.BORDER_COLOR,
             fg=self.config.WARNING_COLOR
         )
@@ -217,7 +283,7 @@ class MapPage(BasePage):
         tk.Label(
             angle_frame,
             text="ANGLE:",
-            font=(self.config.FONT_FAMILY, 10, "bold"),
+            font=THEME.font(10, "bold"),
             bg=self.config.BORDER_COLOR,
             fg=self.config.TEXT_COLOR
         ).pack()
@@ -225,16 +291,16 @@ class MapPage(BasePage):
         self.angle_label = tk.Label(
             angle_frame,
             text="045°",
-            font=(self.config.FONT_FAMILY, 14, "bold"),
+            font=THEME.font(14, "bold"),
             bg=self.config.BORDER_COLOR,
             fg=self.config.WARNING_COLOR
         )
         self.angle_label.pack()
     
+    @hot_path
+    @timed("draw_gis_map")
     def draw_gis_map(self):
         """Draw a realistic GIS-style map"""
-        self.map_canvas.delete("all")
-        
         # Get canvas dimensions
         width = self.map_canvas.winfo_width()
         height = self.map_canvas.winfo_height()
@@ -243,167 +309,85 @@ class MapPage(BasePage):
             self.after(100, self.draw_gis_map)
             return
         
-        # Draw map background with terrain features
-        self.draw_terrain_features(width, height)
-        
-        # Draw grid lines (UTM grid style)
-        self.draw_grid_lines(width, height)
+        # Draw terrain, UTM grid, scale and compass
+        self.map_renderer.draw_background(width, height)
         
-        # Draw scale and compass
-        self.draw_map_elements(width, height)
+        # Draw detections inside the viewport
+        self.draw_detections(width, height)
         
         # Draw node and enemy positions
-        self.draw_positions(width, height)
+        self.map_renderer.draw_positions(*self.to_screen(self.node_coords["lon"], self.node_coords["lat"],
+                                                         width, height))
+        RENDER_STATS.frame("map")
     
-    def draw_terrain_features(self, width, height):
-        """Draw terrain features like roads, buildings, etc."""
-        # Draw some roads
-        road_color = "#8B7355"  # Brown for roads
-        
-        # Horizontal road
-        self.map_canvas.create_rectangle(
-            0, height//2 - 10, width, height//2 + 10,
-            fill=road_color, outline=road_color
-        )
-        
-        # Vertical road
-        self.map_canvas.create_rectangle(
-            width//2 - 10, 0, width//2 + 10, height,
-            fill=road_color, outline=road_color
-        )
+    def refresh_geo_index(self):
+        """Rebuild the geo index and refit the viewport when the detection data has changed"""
+        if self.geo_index_revision == self.data_manager.revision:
+            return
         
-        # Draw some buildings
-        building_color = "#696969"  # Dark gray for buildings
-        
-        buildings = [
-            (width//4 - 20, height//4 - 15, width//4 + 20, height//4 + 15),
-            (3*width//4 - 25, height//4 - 20, 3*width//4 + 25, height//4 + 20),
-            (width//4 - 15, 3*height//4 - 25, width//4 + 15, 3*height//4 + 25),
-            (3*width//4 - 30, 3*height//4 - 15, 3*width//4 + 30, 3*height//4 + 15),
-        ]
-        
-        for x1, y1, x2, y2 in buildings:
-            self.map_canvas.create_rectangle(
-                x1, y1, x2, y2,
-                fill=building_color, outline="#FFFFFF", width=1
-            )
+        self.geo_index.clear()
+        west = south = float("inf")
+        east = north = float("-inf")
+        for detection in self.data_manager.detection_data:
+            lon, lat = detection["longitude"], detection["latitude"]
+            self.geo_index.insert(detection["id"], lon, lat)
+            west, east = min(west, lon), max(east, lon)
+            south, north = min(south, lat), max(north, lat)
+        self.geo_index_revision = self.data_manager.revision
+        
+        if self.geo_index:
+            self.fit_viewport(west, south, east, north)
     
-    def draw_grid_lines(self, width, height):
-        """Draw UTM-style grid lines"""
-        grid_color = "#4F6F4F"  # Darker green for grid
-        
-        # Vertical lines
-        for i in range(0, width, 50):
-            self.map_canvas.create_line(
-                i, 0, i, height,
-                fill=grid_color, width=1, dash=(2, 4)
-            )
-        
-        # Horizontal lines
-        for i in range(0, height, 50):
-            self.map_canvas.create_line(
-                0, i, width, i,
-                fill=grid_color, width=1, dash=(2, 4)
-            )
+    def fit_viewport(self, west, south, east, north):
+        """Centre the map on a bounding box, widening the view if the box doesn't fit"""
+        self.viewport["lat"] = (south + north) / 2
+        self.viewport["lon"] = (west + east) / 2
+        self.viewport["span"] = max(self.config.MAP_VIEW_SPAN, (north - south) * 1.1, (east - west) * 1.1)
     
-    def draw_map_elements(self, width, height):
-        """Draw scale, compass, and other map elements"""
-        # Compass rose (top right)
-        compass_x = width - 60
-        compass_y = 60
-        
-        # Compass circle
-        self.map_canvas.create_oval(
-            compass_x - 25, compass_y - 25,
-            compass_x + 25, compass_y + 25,
-            outline=self.config.GOLD_COLOR, width=2
-        )
-        
-        # North arrow
-        self.map_canvas.create_line(
-            compass_x, compass_y - 20,
-            compass_x, compass_y + 20,
-            fill=self.config.ERROR_COLOR, width=3, arrow=tk.FIRST
-        )
-        
-        # N label
-        self.map_canvas.create_text(
-            compass_x, compass_y - 35,
-            text="N", fill=self.config.TEXT_COLOR,
-            font=(self.config.FONT_FAMILY, 12, "bold")
-        )
-        
-        # Scale bar (bottom left)
-        scale_x = 50
-        scale_y = height - 30
-        
-        self.map_canvas.create_line(
-            scale_x, scale_y, scale_x + 100, scale_y,
-            fill=self.config.TEXT_COLOR, width=3
-        )
-        
-        self.map_canvas.create_text(
-            scale_x + 50, scale_y - 15,
-            text="1 km", fill=self.config.TEXT_COLOR,
-            font=(self.config.FONT_FAMILY, 10, "bold")
-        )
+    def to_screen(self, lon, lat, width, height):
+        """Get the canvas position of a geo position in the current viewport"""
+        west, south, east, north = self.get_viewport_bounds(width, height)
+        return (lon - west) * width / (east - west), (north - lat) * height / (north - south)
     
-    def draw_positions(self, width, height):
-        """Draw node and enemy positions on the map"""
-        center_x = width // 2
-        center_y = height // 2
-        
-        # Node position (center)
-        node_size = 12
-        self.map_canvas.create_oval(
-            center_x - node_size, center_y - node_size,
-            center_x + node_size, center_y + node_size,
-            fill=self.config.SUCCESS_COLOR,
-            outline=self.config.TEXT_COLOR, width=3
-        )
-        
-        # Node label
-        self.map_canvas.create_text(
-            center_x, center_y - 25,
-            text="NODE", fill=self.config.TEXT_COLOR,
-            font=(self.config.FONT_FAMILY, 10, "bold")
-        )
-        
-        # Enemy position (offset from center)
-        enemy_x = center_x + 80
-        enemy_y = center_y - 60
-        enemy_size = 10
-        
-        self.map_canvas.create_oval(
-            enemy_x - enemy_size, enemy_y - enemy_size,
-            enemy_x + enemy_size, enemy_y + enemy_size,
-            fill=self.config.ERROR_COLOR,
-            outline=self.config.TEXT_COLOR, width=3
-        )
-        
-        # Enemy label
-        self.map_canvas.create_text(
-            enemy_x, enemy_y - 20,
-            text="ENEMY LOC", fill=self.config.TEXT_COLOR,
-            font=(self.config.FONT_FAMILY, 9, "bold")
-        )
-        
-        # Draw line between positions
-        self.map_canvas.create_line(
-            center_x, center_y, enemy_x, enemy_y,
-            fill=self.config.WARNING_COLOR, width=2, dash=(5, 5)
-        )
-        
-        # Distance marker
-        mid_x = (center_x + enemy_x) // 2
-        mid_y = (center_y + enemy_y) // 2
-        
-        self.map_canvas.create_text(
-            mid_x, mid_y - 10,
-            text="1.2 km", fill=self.config.WARNING_COLOR,
-            font=(self.config.FONT_FAMILY, 9, "bold")
+    def get_viewport_bounds(self, width, height):
+        """Get the (west, south, east, north) bounds of the visible map area"""
+        half_lat = self.viewport["span"] / 2
+        half_lon = half_lat * width / height
+        return (
+            self.viewport["lon"] - half_lon, self.viewport["lat"] - half_lat,
+            self.viewport["lon"] + half_lon, self.viewport["lat"] + half_lat
         )
     
+    def get_time_bounds(self):
+        """Get the (start, end) time range of detections to draw"""
+        if self.time_range:
+            return self.time_range
+        return time.time() - TIME_FILTERS[self.time_filter.get()], float("inf")
+    
+    @hot_path
+    def draw_detections(self, width, height):
+        """Draw detection markers, culled to the viewport and time range"""
+        self.refresh_geo_index()
+        self.screen_index.clear()
+        
+        west, south, east, north = self.get_viewport_bounds(width, height)
+        x_scale = width / (east - west)
+        y_scale = height / (north - south)
+        start_time, end_time = self.get_time_bounds()
+        
+        for detection_id in self.geo_index.query(west, south, east, north):
+            detection = self.data_manager.get_detection_by_id(detection_id)
+            if not start_time <= detection["timestamp"] <= end_time:
+                continue
+            
+            lon, lat = self.geo_index.get_position(detection_id)
+            x = (lon - west) * x_scale
+            y = (north - lat) * y_scale
+            self.screen_index.insert(detection_id, x, y)
+            LATENCY.stamp(detection_id, "draw")
+            
+            self.map_renderer.draw_detection(x, y, detection["intensity"])
+    
     def calculate_tactical_data(self):
         """Calculate and update tactical data"""
         # Generate realistic tactical data
@@ -418,6 +402,8 @@ class MapPage(BasePage):
             "angle": angle
         }
     
+    @hot_path
+    @timed("update_tactical_display")
     def update_tactical_display(self):
         """Update tactical information display"""
         if hasattr(self, 'tactical_data'):
@@ -435,26 +421,50 @@ class MapPage(BasePage):
         
         # Recalculate tactical data
         self.calculate_tactical_data()
-        
-        # Schedule next update
-        self.after(2000, self.update_tactical_display)
     
-
-    
-
+    @hot_path
+    def update_detection_list(self):
+        """Patch the detection list with what changed since the last update"""
+        diff = self.data_manager.get_map_detection_diff(
+            self.list_snapshot, self.time_filter.get(), time_range=self.time_range
+        )
+        self.detection_list.apply_diff(diff)
+        self.list_snapshot = diff["snapshot"]
     
-
+    def on_list_select(self, event):
+        """Open the detection selected in the list"""
+        selection = self.detection_list.tree.selection()
+        if selection:
+            self.show_detection_details(self.data_manager.get_detection_by_id(selection[0]))
     
     def on_canvas_resize(self, event):
         """Handle canvas resize and redraw map"""
         self.draw_gis_map()
     
+    def on_time_filter_change(self, value):
+        """Switch the timeline and map to a preset time window"""
+        self.time_range = None
+        self.timeline.set_window(TIME_FILTERS[value])
+        self.draw_gis_map()
+        self.update_detection_list()
+    
+    def on_timeline_select(self, time_range):
+        """Limit the map to a range dragged on the timeline"""
+        self.time_range = time_range
+        self.draw_gis_map()
+        self.update_detection_list()
+    
+    def on_map_tap(self, event):
+        """Open the detection closest to a tap on the map"""
+        detection_id = self.screen_index.nearest(event.x, event.y, self.config.TAP_RADIUS)
+        if detection_id is not None:
+            self.show_detection_details(self.data_manager.get_detection_by_id(detection_id))
+    
     def handle_logout(self):
         """Handle logout"""
-        self.controller.show_page("LoginPage")
+        self.controller.logout()
     
     def show(self):
         """Show the map page and start updates"""
         super().show()
-        self.after(100, self.draw_gis_map)
-        self.update_tactical_display()
\ No newline at end of file
+        self.after(100, self.draw_gis_map)
\ No newline at end of file
@@ -1,22 +1,50 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import math
+from tkinter import ttk, messagebox
 import time
-import csv
-import os
 from datetime import datetime
 from src.pages.base_page import BasePage
-from src.utils.data_manager import DataManager
+from src.utils.data_manager import TIME_FILTERS
+from src.utils.spatial_index import SpatialIndex
+from src.utils.render_stats import RENDER_STATS, timed
+from src.utils.latency import LATENCY
+from src.utils.profiling import hot_path
+from src.utils.audit import AUDIT
+from src.utils.alerts import bearing_to_sector
+from src.components.renderers import RadarRenderer
+from src.components.widgets import StatusIndicator, AlertPanel, DataTable, VirtualDataTable
+from src.components.theme import THEME
+
+# Columns of the detection history table, and how their values are shown
+HISTORY_COLUMNS = ("timestamp", "node_id", "intensity", "confidence", "angle", "distance", "verified")
+HISTORY_FORMATTERS = {
+    "timestamp": lambda value: datetime.fromtimestamp(value).strftime("%d %b %Y %H:%M:%S"),
+    "intensity": lambda value: f"{value:.2f}",
+    "confidence": lambda value: f"{value:.0%}",
+    "angle": lambda value: f"{int(round(value)):03d}°",
+    "verified": lambda value: {True: "YES", False: "NO"}.get(value, "PENDING")
+}
 
 class RadarPage(BasePage):
     """Military-grade radar visualization page for gunshot detection"""
     
     def __init__(self, parent, controller):
-        self.data_manager = DataManager()
+        self.data_manager = controller.get_data_manager()
         self.radar_points = []
-        self.animation_id = None
+        self.radar_index = SpatialIndex(cell_size=32)
+        self.export_worker = None
+        self.history_window = None
+        self.history_revision = None
+        self.recent_snapshot = None  # Rows in the recent detections list, for diffing
+        self.node_indicators = {}  # node id -> StatusIndicator
         self.danger_detected = False
         self.blink_state = False
+        self.alerted_until = time.time()  # Detections up to this time have been alerted
+        
+        # Sweep animation state; canvas items are created once per radar draw
+        self.sweep_angle = 0.0
+        self.sweep_fps = THEME.config.RADAR_SWEEP_FPS
+        self.sweep_sample = None
+        self.sweep_stats = {"fps": self.sweep_fps, "cpu": 0.0, "frame_ms": 0.0}
         super().__init__(parent, controller)
     
     def setup_ui(self):
@@ -40,8 +68,17 @@ class RadarPage(BasePage):
         # Footer with CSV download
         self.create_footer()
         
-        # Start blinking animation
-        self.start_danger_blink()
+        # Alerts for new detections, shown over the header
+        alert_holder = tk.Frame(self, bg=self.config.PRIMARY_COLOR)
+        alert_holder.place(relx=0.5, y=0, anchor="n", relwidth=0.6)
+        self.alert_panel = AlertPanel(alert_holder)
+        
+        # Periodic work, paused by BasePage whenever the page is hidden
+        self.add_timer("danger_blink", 1000, self.update_danger_indicator)
+        self.add_timer("clock", 1000, self.update_time)
+        self.add_timer("node_health", 1000, self.update_node_status)
+        self.add_timer("radar_data", self.config.MAP_UPDATE_INTERVAL, self.update_radar_data)
+        self.add_timer("sweep", int(1000 / self.sweep_fps), self.animate_sweep)
     
     def create_header(self):
         """Create header with title and danger indicator"""
@@ -58,7 +95,7 @@ class RadarPage(BasePage):
             nav_frame,
             text="MAP VIEW",
             command=lambda: self.controller.show_page("MapPage"),
-            font=(self.config.FONT_FAMILY, 10, "bold"),
+            font=THEME.font(10, "bold"),
             bg=self.config.ACCENT_COLOR,
             fg=self.config.TEXT_COLOR,
             relief="raised",
@@ -72,7 +109,7 @@ class RadarPage(BasePage):
             nav_frame,
             text="LOGOUT",
             command=self.handle_logout,
-            font=(self.config.FONT_FAMILY, 10, "bold"),
+            font=THEME.font(10, "bold"),
             bg=self.config.ERROR_COLOR,
             fg=self.config.TEXT_COLOR,
             relief="raised",
@@ -86,7 +123,7 @@ class RadarPage(BasePage):
         title = tk.Label(
             header_frame,
             text="RADAR",
-            font=(self.config.FONT_FAMILY, 36, "bold"),
+            font=THEME.font(36, "bold"),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.GOLD_COLOR
         )
@@ -99,7 +136,7 @@ class RadarPage(BasePage):
         tk.Label(
             danger_frame,
             text="THREAT STATUS",
-            font=(self.config.FONT_FAMILY, 8, "bold"),
+            font=THEME.font(8, "bold"),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.TEXT_COLOR
         ).pack()
@@ -107,7 +144,7 @@ class RadarPage(BasePage):
         self.danger_indicator = tk.Label(
             danger_frame,
             text="●",
-            font=(self.config.FONT_FAMILY, 40, "bold"),
+            font=THEME.font(40, "bold"),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.SUCCESS_COLOR
         )
@@ -118,7 +155,7 @@ class RadarPage(BasePage):
             danger_frame,
             text="TOGGLE",
             command=self.toggle_danger,
-            font=(self.config.FONT_FAMILY, 8),
+            font=THEME.font(8),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.TEXT_COLOR,
             relief="flat",
@@ -139,7 +176,7 @@ class RadarPage(BasePage):
         coords_label = tk.Label(
             info_frame,
             text=coords_text,
-            font=(self.config.FONT_FAMILY, 12, "bold"),
+            font=THEME.font(12, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.TEXT_COLOR
         )
@@ -149,14 +186,15 @@ class RadarPage(BasePage):
         self.time_label = tk.Label(
             info_frame,
             text="",
-            font=(self.config.FONT_FAMILY, 12, "bold"),
+            font=THEME.font(12, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.GOLD_COLOR
         )
         self.time_label.grid(row=1, column=0, sticky="w", padx=20, pady=5)
         
-        # Update time
-        self.update_time()
+        # Health of each sensor node, added as nodes are first heard from
+        self.node_status_frame = tk.Frame(info_frame, bg=self.config.SECONDARY_COLOR)
+        self.node_status_frame.grid(row=0, column=1, rowspan=2, sticky="e", padx=20)
     
     def create_main_content(self):
         """Create main content area with radar and enemy coordinates"""
@@ -183,7 +221,7 @@ class RadarPage(BasePage):
         title = tk.Label(
             coords_frame,
             text="ENEMY COORDINATES",
-            font=(self.config.FONT_FAMILY, 16, "bold"),
+            font=THEME.font(16, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.ERROR_COLOR
         )
@@ -209,7 +247,7 @@ class RadarPage(BasePage):
             lbl = tk.Label(
                 data_frame,
                 text=label,
-                font=(self.config.FONT_FAMILY, 12, "bold"),
+                font=THEME.font(12, "bold"),
                 bg=self.config.SECONDARY_COLOR,
                 fg=self.config.TEXT_COLOR,
                 anchor="w"
@@ -220,7 +258,7 @@ class RadarPage(BasePage):
             val = tk.Label(
                 data_frame,
                 text=value,
-                font=(self.config.FONT_FAMILY, 14, "bold"),
+                font=THEME.font(14, "bold"),
                 bg=self.config.SECONDARY_COLOR,
                 fg=self.config.WARNING_COLOR,
                 anchor="e"
@@ -239,10 +277,15 @@ class RadarPage(BasePage):
         tk.Label(
             status_frame,
             text="⚠ LIVE TRACKING ACTIVE ⚠",
-            font=(self.config.FONT_FAMILY, 10, "bold"),
+            font=THEME.font(10, "bold"),
             bg=self.config.BORDER_COLOR,
             fg=self.config.WARNING_COLOR
         ).pack(expand=True)
+        
+        # Newest detections across all nodes, patched row by row as they arrive
+        self.recent_table = DataTable(coords_frame, ("recent detections",), height=5)
+        self.recent_table.pack(fill="x", side="bottom", padx=10, pady=(0, 10))
+        self.recent_table.tree.bind("<<TreeviewSelect>>", self.on_recent_select)
     
     def create_footer(self):
         """Create footer with CSV download option"""
@@ -258,7 +301,7 @@ class RadarPage(BasePage):
         csv_text = tk.Label(
             csv_frame,
             text="For detailed logs check ",
-            font=(self.config.FONT_FAMILY, 12),
+            font=THEME.font(12),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.TEXT_COLOR
         )
@@ -268,7 +311,7 @@ class RadarPage(BasePage):
             csv_frame,
             text="CSV",
             command=self.download_csv,
-            font=(self.config.FONT_FAMILY, 12, "bold", "underline"),
+            font=THEME.font(12, "bold", "underline"),
             bg=self.config.PRIMARY_COLOR,
             fg=self.config.ACCENT_COLOR,
             relief="flat",
@@ -276,96 +319,202 @@ class RadarPage(BasePage):
             padx=5
         )
         csv_btn.pack(side="left")
+        
+        tk.Label(
+            csv_frame,
+            text=" or the ",
+            font=THEME.font(12),
+            bg=self.config.PRIMARY_COLOR,
+            fg=self.config.TEXT_COLOR
+        ).pack(side="left")
+        
+        history_btn = tk.Button(
+            csv_frame,
+            text="HISTORY",
+            command=self.show_history,
+            font=THEME.font(12, "bold", "underline"),
+            bg=self.config.PRIMARY_COLOR,
+            fg=self.config.ACCENT_COLOR,
+            relief="flat",
+            cursor="hand2",
+            padx=5
+        )
+        history_btn.pack(side="left")
+        
+        # Export filters
+        self.export_range = tk.StringVar(value="Last 24 Hours")
+        range_menu = tk.OptionMenu(csv_frame, self.export_range, *TIME_FILTERS, "All Records")
+        range_menu.configure(
+            font=THEME.font(10),
+            bg=self.config.SECONDARY_COLOR,
+            fg=self.config.TEXT_COLOR,
+            highlightthickness=0,
+            relief="flat"
+        )
+        range_menu.pack(side="left", padx=(10, 0))
+        
+        tk.Label(
+            csv_frame,
+            text="Min Int:",
+            font=THEME.font(10),
+            bg=self.config.PRIMARY_COLOR,
+            fg=self.config.TEXT_COLOR
+        ).pack(side="left", padx=(10, 0))
+        
+        self.export_intensity = tk.StringVar(value="0.0")
+        intensity_menu = tk.OptionMenu(csv_frame, self.export_intensity, "0.0", "0.3", "0.5", "0.8")
+        intensity_menu.configure(
+            font=THEME.font(10),
+            bg=self.config.SECONDARY_COLOR,
+            fg=self.config.TEXT_COLOR,
+            highlightthickness=0,
+            relief="flat"
+        )
+        intensity_menu.pack(side="left")
+        
+        # Export progress and cancel, shown while an export runs
+        self.export_status = tk.Label(
+            csv_frame,
+            text="",
+            font=THEME.font(10),
+            bg=self.config.PRIMARY_COLOR,
+            fg=self.config.GOLD_COLOR
+        )
+        self.export_status.pack(side="left", padx=(10, 0))
+        
+        self.export_cancel_btn = tk.Button(
+            csv_frame,
+            text="CANCEL",
+            command=self.cancel_export,
+            font=THEME.font(8, "bold"),
+            bg=self.config.ERROR_COLOR,
+            fg=self.config.TEXT_COLOR,
+            relief="flat",
+            padx=10,
+            pady=2
+        )
     
     def toggle_danger(self):
         """Toggle danger detection status"""
         self.danger_detected = not self.danger_detected
         print(f"Danger status toggled: {self.danger_detected}")
     
-    def start_danger_blink(self):
-        """Start the danger indicator blinking animation"""
+    @hot_path
+    def update_danger_indicator(self):
+        """Blink the danger indicator while danger is detected"""
         if self.danger_detected:
             # Blink red when danger detected
             color = self.config.ERROR_COLOR if self.blink_state else self.config.PRIMARY_COLOR
             self.danger_indicator.configure(fg=color)
             self.blink_state = not self.blink_state
-            self.after(500, self.start_danger_blink)  # Blink every 500ms
-        else:
-            # Solid green when no danger
-            self.danger_indicator.configure(fg=self.config.SUCCESS_COLOR)
-            self.after(1000, self.start_danger_blink)  # Check every 1000ms
+            return 500  # Blink every 500ms
+        
+        # Solid green when no danger
+        self.danger_indicator.configure(fg=self.config.SUCCESS_COLOR)
+        return 1000  # Check every 1000ms
     
+    @hot_path
     def update_time(self):
         """Update the current time display"""
         current_time = datetime.now().strftime("CURRENT TIME: %d %b %Y • %H:%M:%S IST")
         self.time_label.configure(text=current_time)
-        self.after(1000, self.update_time)  # Update every second
     
-    def download_csv(self):
-        """Generate and download dummy CSV file"""
-        try:
-            # Generate dummy data
-            csv_data = self.generate_dummy_csv_data()
-            
-            # Ask user where to save
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                title="Save Detection Log",
-                initialname=f"gilda_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            )
-            
-            if filename:
-                # Write CSV file
-                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerows(csv_data)
-                
-                messagebox.showinfo("Success", f"Detection log saved to:\n{filename}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save CSV file:\n{str(e)}")
+    def show_history(self):
+        """Open the full detection history in a table that pages rows from the store"""
+        if self.history_window is not None:
+            self.history_window.lift()
+            return
+        
+        self.history_window = tk.Toplevel(self)
+        self.history_window.title("Detection History")
+        self.history_window.geometry("900x500")
+        self.history_window.configure(bg=self.config.PRIMARY_COLOR)
+        self.history_window.protocol("WM_DELETE_WINDOW", self.close_history)
+        
+        self.history_table = VirtualDataTable(
+            self.history_window, HISTORY_COLUMNS, self.data_manager, formatters=HISTORY_FORMATTERS
+        )
+        self.history_table.pack(fill="both", expand=True, padx=10, pady=10)
+        self.history_revision = self.data_manager.revision
+        self.history_table.refresh()
+        self.add_timer("history", 1000, self.update_history)
     
-    def generate_dummy_csv_data(self):
-        """Generate dummy CSV data for download"""
-        headers = ["Timestamp", "Gunshot Fired", "Enemy Latitude", "Enemy Longitude", 
-                  "Range (m)", "Angle (°)", "Elevation (°)", "Confidence"]
+    @hot_path
+    def update_history(self):
+        """Reload the visible history rows when the store has changed"""
+        if self.data_manager.revision != self.history_revision:
+            self.history_revision = self.data_manager.revision
+            self.history_table.refresh()
+    
+    def close_history(self):
+        """Close the detection history table"""
+        self.remove_timer("history")
+        self.history_window.destroy()
+        self.history_window = None
+    
+    def download_csv(self):
+        """Export the detection history to CSV in a background worker"""
+        if self.export_worker and not self.export_worker.finished:
+            return
         
-        data = [headers]
+        # Only needed when exporting, so kept out of page startup
+        from tkinter import filedialog
+        from src.utils.exporter import CSVExportWorker
         
-        # Generate 50 dummy records
-        import random
-        base_time = datetime.now()
+        # Ask user where to save
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            title="Save Detection Log",
+            initialfile=f"gilda_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        )
+        if not filename:
+            return
         
-        for i in range(50):
-            # Random time in last 24 hours
-            time_offset = random.randint(0, 86400)
-            record_time = base_time.timestamp() - time_offset
-            timestamp = datetime.fromtimestamp(record_time).strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Random detection data
-            gunshot_fired = random.choice(["YES", "NO", "NO", "NO"])  # 25% chance of gunshot
-            lat = 28.6139 + random.uniform(-0.01, 0.01)
-            lon = 77.2090 + random.uniform(-0.01, 0.01)
-            range_m = random.randint(500, 2000)
-            angle = random.randint(0, 359)
-            elevation = random.uniform(-10, 30)
-            confidence = random.uniform(0.7, 0.99)
-            
-            row = [
-                timestamp,
-                gunshot_fired,
-                f"{lat:.6f}° N",
-                f"{lon:.6f}° E",
-                range_m,
-                angle,
-                f"{elevation:.1f}",
-                f"{confidence:.2f}"
-            ]
-            
-            data.append(row)
+        # Resolve the filters into a time range and intensity floor
+        window = TIME_FILTERS.get(self.export_range.get())
+        start_time = time.time() - window if window else None
+        min_intensity = float(self.export_intensity.get())
+        
+        self.export_worker = CSVExportWorker(
+            self.data_manager.iter_detections(start_time, None, min_intensity),
+            filename,
+            total=self.data_manager.count_detections_in_range(start_time, None, min_intensity)
+        )
+        self.export_worker.start()
         
-        return data
+        self.export_cancel_btn.pack(side="left", padx=(10, 0))
+        self.add_timer("export_progress", 250, self.update_export_progress)
+    
+    def cancel_export(self):
+        """Cancel the running CSV export"""
+        if self.export_worker:
+            self.export_worker.cancel()
+    
+    @hot_path
+    def update_export_progress(self):
+        """Show export progress in the footer and report when it finishes"""
+        worker = self.export_worker
+        if not worker.finished:
+            self.export_status.configure(
+                text=f"Exporting {worker.written:,} records ({worker.progress():.0%})"
+            )
+            return
+        
+        self.remove_timer("export_progress")
+        self.export_cancel_btn.pack_forget()
+        
+        outcome = "failed" if worker.error else "cancelled" if worker.cancelled else "completed"
+        AUDIT.record("export_csv", filename=worker.filename, records=worker.written, outcome=outcome)
+        
+        if worker.error:
+            self.export_status.configure(text="Export failed")
+            messagebox.showerror("Error", f"Failed to save CSV file:\n{worker.error}")
+        elif worker.cancelled:
+            self.export_status.configure(text="Export cancelled")
+        else:
+            self.export_status.configure(text=f"Exported {worker.written:,} records")
+            messagebox.showinfo("Success", f"Detection log saved to:\n{worker.filename}")
     
     def setup_radar_canvas(self, parent):
         """Setup the radar visualization canvas"""
@@ -378,7 +527,7 @@ class RadarPage(BasePage):
         radar_title = tk.Label(
             radar_frame,
             text="TACTICAL DISPLAY",
-            font=(self.config.FONT_FAMILY, 14, "bold"),
+            font=THEME.font(14, "bold"),
             bg=self.config.SECONDARY_COLOR,
             fg=self.config.GOLD_COLOR
         )
@@ -391,8 +540,11 @@ class RadarPage(BasePage):
         )
         self.radar_canvas.grid(row=1, column=0, sticky="nsew", padx=15, pady=(0, 15))
         
-        # Bind canvas resize
+        # Bind canvas resize and tap-to-select
         self.radar_canvas.bind('<Configure>', self.on_canvas_resize)
+        self.radar_canvas.bind('<Button-1>', self.on_radar_tap)
+        RENDER_STATS.register_canvas("radar", self.radar_canvas)
+        self.radar_renderer = RadarRenderer(self.radar_canvas)
     
 
     
@@ -400,116 +552,142 @@ class RadarPage(BasePage):
         """Handle canvas resize event"""
         self.draw_radar()
     
+    def on_radar_tap(self, event):
+        """Open the detection closest to a tap on the radar"""
+        detection_id = self.radar_index.nearest(event.x, event.y, self.config.TAP_RADIUS)
+        if detection_id is not None:
+            self.show_detection_details(self.data_manager.get_detection_by_id(detection_id))
+    
+    @hot_path
+    @timed("draw_radar")
     def draw_radar(self):
         """Draw the radar display"""
-        self.radar_canvas.delete("all")
+        self.radar_index.clear()
+        positions = self.radar_renderer.draw(self.radar_points, self.sweep_angle)
         
-        # Get canvas dimensions
-        width = self.radar_canvas.winfo_width()
-        height = self.radar_canvas.winfo_height()
+        # Index the screen positions for tap-to-select
+        for point, (x, y) in zip(self.radar_points, positions):
+            self.radar_index.insert(point['id'], x, y)
+            LATENCY.stamp(point['id'], "draw")
         
-        if width <= 1 or height <= 1:
+        if self.radar_renderer.geometry:
+            RENDER_STATS.frame("radar")
+    
+    def animate_sweep(self):
+        """Advance the sweep by one frame"""
+        frame_start = time.perf_counter()
+        interval = int(1000 / self.sweep_fps)
+        
+        # Step size follows the frame rate so a revolution always takes the same time
+        self.sweep_angle = (self.sweep_angle + 360.0 * interval / self.config.RADAR_SWEEP_PERIOD) % 360
+        if self.radar_renderer.sweep_line is not None:
+            self.radar_renderer.update_sweep_items(self.sweep_angle)
+            RENDER_STATS.frame("radar")
+        
+        self.sweep_stats["frame_ms"] = (time.perf_counter() - frame_start) * 1000
+        RENDER_STATS.record("animate_sweep", self.sweep_stats["frame_ms"])
+        self.regulate_sweep_rate()
+        
+        return int(1000 / self.sweep_fps)
+    
+    def regulate_sweep_rate(self):
+        """Measure process CPU usage and lower the sweep frame rate when over budget"""
+        wall_start, cpu_start = self.sweep_sample
+        wall_now, cpu_now = time.perf_counter(), time.process_time()
+        elapsed = wall_now - wall_start
+        
+        # Sample once a second so the measurement includes Tk's redraw work
+        if elapsed < 1.0:
             return
         
-        # Calculate center and radius
-        center_x = width // 2
-        center_y = height // 2
-        max_radius = min(center_x, center_y) - 20
-        
-        # Draw radar circles
-        for i in range(1, 4):
-            radius = (max_radius * i) // 3
-            self.radar_canvas.create_oval(
-                center_x - radius, center_y - radius,
-                center_x + radius, center_y + radius,
-                outline=self.config.ACCENT_COLOR,
-                width=1
-            )
-        
-        # Draw radar lines
-        for angle in range(0, 360, 45):
-            rad = math.radians(angle)
-            end_x = center_x + max_radius * math.cos(rad)
-            end_y = center_y + max_radius * math.sin(rad)
-            
-            self.radar_canvas.create_line(
-                center_x, center_y, end_x, end_y,
-                fill=self.config.ACCENT_COLOR,
-                width=1
-            )
+        cpu = (cpu_now - cpu_start) / elapsed
+        self.sweep_sample = (wall_now, cpu_now)
+        self.sweep_stats["cpu"] = cpu
         
-        # Draw detection points
-        for point in self.radar_points:
-            self.draw_detection_point(point, center_x, center_y, max_radius)
-    
-    def draw_detection_point(self, point, center_x, center_y, max_radius):
-        """Draw a detection point on the radar"""
-        # Convert polar coordinates to cartesian
-        angle_rad = math.radians(point['angle'])
-        distance_ratio = point['distance'] / 100.0  # Normalize to 0-1
-        
-        x = center_x + (distance_ratio * max_radius * math.cos(angle_rad))
-        y = center_y + (distance_ratio * max_radius * math.sin(angle_rad))
-        
-        # Draw point with intensity-based color
-        intensity = point.get('intensity', 0.5)
-        if intensity > 0.8:
-            color = self.config.ERROR_COLOR
-        elif intensity > 0.5:
-            color = self.config.WARNING_COLOR
-        else:
-            color = self.config.SUCCESS_COLOR
-        
-        self.radar_canvas.create_oval(
-            x - 5, y - 5, x + 5, y + 5,
-            fill=color,
-            outline=self.config.TEXT_COLOR,
-            width=1
-        )
+        if cpu > self.config.RADAR_SWEEP_CPU_CAP:
+            self.sweep_fps = max(self.config.RADAR_SWEEP_MIN_FPS, self.sweep_fps * 0.75)
+        elif cpu < self.config.RADAR_SWEEP_CPU_CAP / 2:
+            self.sweep_fps = min(self.config.RADAR_SWEEP_FPS, self.sweep_fps + 1)
+        self.sweep_stats["fps"] = self.sweep_fps
     
     def handle_logout(self):
         """Handle logout"""
-        self.stop_radar_updates()
-        self.controller.show_page("LoginPage")
+        self.controller.logout()
     
     def show(self):
         """Show the radar page and start updates"""
+        # Restart CPU sampling so time spent hidden doesn't count as idle
+        self.sweep_sample = (time.perf_counter(), time.process_time())
         super().show()
-        self.start_radar_updates()
         self.after(100, self.draw_radar)  # Initial draw
     
-    def hide(self):
-        """Hide the radar page and stop updates"""
-        super().hide()
-        self.stop_radar_updates()
-    
-    def start_radar_updates(self):
-        """Start radar data updates"""
-        self.update_radar_data()
-    
-    def stop_radar_updates(self):
-        """Stop radar data updates"""
-        if self.animation_id:
-            self.after_cancel(self.animation_id)
-            self.animation_id = None
-    
+    @hot_path
+    @timed("update_radar_data")
     def update_radar_data(self):
         """Update radar data and enemy coordinates"""
         # Get new detection data
         new_detections = self.data_manager.get_recent_detections()
+        for point in new_detections:
+            LATENCY.stamp(point['id'], "dequeue")
         
-        # Update radar points
+        # Update radar points and the recent detections list
         self.radar_points = new_detections
+        self.update_recent_list()
+        self.alert_new_detections(new_detections)
         
         # Update enemy coordinates with random data
         self.update_enemy_coordinates()
         
         # Redraw radar
         self.draw_radar()
-        
-        # Schedule next update
-        self.animation_id = self.after(self.config.MAP_UPDATE_INTERVAL, self.update_radar_data)
     
+    def alert_new_detections(self, detections):
+        """Raise an alert for each detection newer than the last one alerted"""
+        # Oldest first, so a burst coalesces in the order it happened
+        for point in sorted(detections, key=lambda d: d["timestamp"]):
+            if point["timestamp"] <= self.alerted_until:
+                continue
+            self.alerted_until = point["timestamp"]
+            
+            sector = bearing_to_sector(point["angle"])
+            self.alert_panel.show_alert(
+                "⚠ GUNSHOT DETECTED ⚠",
+                f"Bearing {int(round(point['angle'])):03d}° ({sector})  Range {point['distance']} m  "
+                f"Node {point['node_id']}",
+                priority=2 if point["intensity"] > 0.8 else 1,  # Same band that draws the marker red
+                key=f"sector {sector}",
+                label="gunshots"
+            )
+    
+    def update_recent_list(self):
+        """Patch the recent detections list with what changed since the last update"""
+        diff = self.data_manager.get_recent_detection_diff(self.recent_snapshot, self.config.RECENT_LIST_SIZE)
+        self.recent_table.apply_diff(diff)
+        self.recent_snapshot = diff["snapshot"]
+    
+    def on_recent_select(self, event):
+        """Open the detection selected in the recent list"""
+        selection = self.recent_table.tree.selection()
+        if selection:
+            self.show_detection_details(self.data_manager.get_detection_by_id(selection[0]))
+    
+    @hot_path
+    def update_node_status(self):
+        """Show each sensor node's heartbeat health, and whether a live node has gone quiet"""
+        self.data_manager.heartbeat_local_node()
+        for node in self.data_manager.get_nodes():
+            indicator = self.node_indicators.get(node.node_id)
+            if indicator is None:
+                indicator = StatusIndicator(self.node_status_frame, label=node.node_id)
+                indicator.pack(side="left", padx=(10, 0))
+                self.node_indicators[node.node_id] = indicator
+            health = node.health()
+            if health == "active" and node.is_quiet():
+                indicator.set_status(health, text="QUIET")
+            else:
+                indicator.set_status(health)
+    
+    @hot_path
     def update_enemy_coordinates(self):
         """Update enemy coordinates with live data"""
         import random
@@ -0,0 +1,513 @@
+import ipaddress
+import json
+import logging
+import os
+import queue
+import secrets
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from src.config import Config
+from src.utils.data_manager import DataManager, check_detection
+from src.utils.latency import LATENCY
+from src.utils.metrics import METRICS, weak_callback
+from src.utils.audit import AUDIT, SYSTEM_USER
+
+logger = logging.getLogger(__name__)
+
+def parse_address(address):
+    """Get the socket family and address for "host:port" (TCP) or a Unix socket path"""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    return socket.AF_UNIX, address
+
+def _is_loopback(host):
+    """Whether a host name or address refers to this machine only"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def _encode(message):
+    """Encode a protocol message as one JSON line"""
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+class _Client:
+    """Connection state for one subscribed display or sensor link"""
+    
+    def __init__(self, sock):
+        self.sock = sock
+        self.inbuf = b""
+        self.outbuf = bytearray()
+        self.events = selectors.EVENT_READ
+        self.subscribed = False
+
+class AggregatorServer:
+    """Headless owner of the detection store, streaming snapshots and deltas to any number of displays
+    
+    Every message is one JSON object per line. Clients send {"op": ...}:
+      subscribe  {"epoch", "since"}: a snapshot, or only the deltas after `since` if still held
+      add        {"detection"}: ingest a detection from a sensor node
+      heartbeat  {"node_id"}: record that a sensor node is alive
+      update     {"id", "updates"} and delete {"id"}: operator edits
+    Subscribers receive {"type": "snapshot"} followed by {"type": "delta"} messages carrying
+    "added", "updated", "removed" and "nodes" (heartbeat age in seconds per node).
+    
+    Connections are not authenticated: anyone who can open the socket can ingest and edit
+    detections, and the "user" recorded in the audit log is whatever the client claims. Access
+    is limited by the socket instead, so TCP only listens on loopback and the Unix socket is
+    readable by its owner and group only.
+    """
+    
+    def __init__(self, data_manager, address=None):
+        self.store = data_manager
+        self.address = address or Config.AGGREGATOR_ADDRESS
+        self.selector = selectors.DefaultSelector()
+        self.listener = None
+        self.clients = {}  # socket -> _Client
+        self.running = False
+        
+        # Sequence numbers restart with each run, so clients also compare the epoch
+        self.epoch = secrets.token_hex(8)
+        self.seq = 0
+        self.history = deque(maxlen=Config.AGGREGATOR_DELTA_HISTORY)
+        self.current_user = None  # Operator behind the command being handled, for the audit log
+        
+        METRICS.gauge("gilda_aggregator_clients", "Connections to the aggregator",
+                      func=weak_callback(self, lambda server: len(server.clients)))
+        self.deltas = METRICS.counter("gilda_aggregator_deltas_total", "Deltas published to displays")
+        self.snapshots = METRICS.counter("gilda_aggregator_snapshots_total", "Full snapshots sent to displays")
+        self.dropped = METRICS.counter(
+            "gilda_aggregator_clients_dropped_total", "Displays disconnected for falling too far behind"
+        )
+    
+    def listen(self):
+        """Open the listening socket"""
+        family, address = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(address):
+            os.unlink(address)  # Left behind by a previous run
+        
+        if family == socket.AF_INET and not _is_loopback(address[0]):
+            raise ValueError(f"Aggregator only listens on loopback, not {address[0]}")
+        
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(address)
+        if family == socket.AF_UNIX:
+            os.chmod(address, 0o660)
+        sock.listen()
+        sock.setblocking(False)
+        
+        self.selector.register(sock, selectors.EVENT_READ)
+        self.listener = sock
+    
+    def serve_forever(self):
+        """Serve clients and apply routine retention until stopped"""
+        self.listen()
+        self.running = True
+        logger.info(f"Aggregator serving {self.store.count_detections()} detections on {self.address}")
+        
+        next_retention = time.monotonic()
+        try:
+            while self.running:
+                for key, mask in self.selector.select(timeout=1.0):
+                    if key.fileobj is self.listener:
+                        self.accept()
+                        continue
+                    
+                    client = key.data
+                    if mask & selectors.EVENT_READ:
+                        self.read(client)
+                    if mask & selectors.EVENT_WRITE and client.sock in self.clients:
+                        self.flush(client)
+                
+                if time.monotonic() >= next_retention:
+                    self.apply_retention()
+                    next_retention = time.monotonic() + Config.AGGREGATOR_RETENTION_INTERVAL
+        finally:
+            self.close()
+    
+    def stop(self):
+        """Ask the serve loop to exit; safe to call from a signal handler"""
+        self.running = False
+    
+    def close(self):
+        """Disconnect all clients and remove the listening socket"""
+        for client in list(self.clients.values()):
+            self.drop(client)
+        
+        if self.listener is not None:
+            self.selector.unregister(self.listener)
+            self.listener.close()
+            self.listener = None
+            
+            family, address = parse_address(self.address)
+            if family == socket.AF_UNIX and os.path.exists(address):
+                os.unlink(address)
+    
+    def accept(self):
+        """Accept a new connection"""
+        try:
+            sock, _ = self.listener.accept()
+        except OSError:
+            return
+        
+        sock.setblocking(False)
+        client = _Client(sock)
+        self.clients[sock] = client
+        self.selector.register(sock, client.events, client)
+    
+    def drop(self, client):
+        """Close a connection"""
+        if self.clients.pop(client.sock, None) is None:
+            return
+        self.selector.unregister(client.sock)
+        client.sock.close()
+    
+    def read(self, client):
+        """Read from a client and handle each complete line"""
+        try:
+            data = client.sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        
+        if not data:
+            self.drop(client)
+            return
+        
+        client.inbuf += data
+        while client.sock in self.clients:
+            line, sep, rest = client.inbuf.partition(b"\n")
+            if not sep:
+                break
+            client.inbuf = rest
+            if line.strip():
+                self.handle(client, line)
+    
+    def handle(self, client, line):
+        """Apply one client command"""
+        try:
+            message = json.loads(line)
+            op = message["op"]
+        except (ValueError, KeyError, TypeError) as e:
+            self.send(client, {"type": "error", "error": f"Bad message: {e}"})
+            return
+        
+        # The user is taken on trust from the client; see the class docstring
+        self.current_user = message.get("user") if isinstance(message.get("user"), str) else None
+        try:
+            error = self.apply(client, op, message)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            error = f"Bad {op} message: {e}"
+        except Exception as e:
+            # One bad message must never take down the data plane for every display
+            logger.exception(f"Error handling aggregator {op} message")
+            error = f"Error handling {op} message: {e}"
+        finally:
+            self.current_user = None
+        
+        if error:
+            self.send(client, {"type": "error", "error": error})
+    
+    def apply(self, client, op, message):
+        """Check and apply one command, returning an error message or None"""
+        if op == "subscribe":
+            since = message.get("since")
+            if since is not None and not isinstance(since, int):
+                return "since must be an integer"
+            self.subscribe(client, message.get("epoch"), since)
+        elif op == "add":
+            error = check_detection(message.get("detection"))
+            if error:
+                return error
+            detection = dict(message["detection"])
+            self.store.add_detection(detection)  # Fills in the id, timestamp and node
+            self.publish(added=[detection])
+        elif op == "heartbeat":
+            if not isinstance(message.get("node_id"), str):
+                return "node_id must be a string"
+            self.store.node_heartbeat(message["node_id"])
+            self.publish(nodes={message["node_id"]: 0.0})
+        elif op == "update":
+            if not isinstance(message.get("id"), str):
+                return "id must be a string"
+            error = check_detection(message.get("updates"), partial=True)
+            if error:
+                return error
+            if self.store.update_detection(message["id"], message["updates"]):
+                self.publish(updated=[self.store.get_detection_by_id(message["id"])])
+        elif op == "delete":
+            if not isinstance(message.get("id"), str):
+                return "id must be a string"
+            if self.store.get_detection_by_id(message["id"]) is not None:
+                self.store.delete_detection(message["id"])
+                self.publish(removed=[message["id"]])
+        else:
+            return f"Unknown op: {op}"
+        return None
+    
+    def subscribe(self, client, epoch, since):
+        """Bring a display up to date, with deltas alone when it was only briefly away"""
+        client.subscribed = True
+        oldest = self.history[0]["seq"] if self.history else self.seq + 1
+        if epoch == self.epoch and since is not None and oldest - 1 <= since <= self.seq:
+            for delta in self.history:
+                if delta["seq"] > since:
+                    self.send(client, delta)
+            return
+        
+        self.snapshots.inc()
+        self.send(client, {
+            "type": "snapshot",
+            "epoch": self.epoch,
+            "seq": self.seq,
+            "detections": self.store.detection_data,
+            "nodes": self.node_ages()
+        })
+    
+    def node_ages(self):
+        """Get seconds since each node's last heartbeat, None for nodes not heard from"""
+        return {node.node_id: node.heartbeat_age() for node in self.store.get_nodes()}
+    
+    def publish(self, **changes):
+        """Send a delta to every subscribed display"""
+        self.seq += 1
+        delta = {"type": "delta", "epoch": self.epoch, "seq": self.seq, **changes}
+        self.history.append(delta)
+        self.deltas.inc()
+        
+        data = _encode(delta)  # Encoded once for all displays
+        for client in list(self.clients.values()):
+            if client.subscribed:
+                self.send_bytes(client, data, limit=True)
+    
+    def send(self, client, message):
+        """Queue a message for one client"""
+        self.send_bytes(client, _encode(message))
+    
+    def send_bytes(self, client, data, limit=False):
+        """Queue encoded data and write as much as the socket takes now"""
+        client.outbuf += data
+        if limit and len(client.outbuf) > Config.AGGREGATOR_MAX_BUFFER:
+            logger.warning("Dropping a display that stopped reading updates")
+            self.dropped.inc()
+            self.drop(client)
+            return
+        self.flush(client)
+    
+    def flush(self, client):
+        """Write queued data, waiting for the socket to become writable if it is full"""
+        try:
+            sent = client.sock.send(client.outbuf) if client.outbuf else 0
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self.drop(client)
+            return
+        del client.outbuf[:sent]
+        
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if client.outbuf else 0)
+        if events != client.events:
+            client.events = events
+            self.selector.modify(client.sock, events, client)
+    
+    def apply_retention(self):
+        """Drop detections older than the retention window and tell displays which went"""
+        cutoff = time.time() - Config.DATA_RETENTION_DAYS * 86400
+        expired = [d["id"] for d in self.store.iter_detections(None, cutoff)]
+        if expired:
+            logger.info(f"Dropping {len(expired)} detections older than {Config.DATA_RETENTION_DAYS} days")
+            self.store.clear_old_data(Config.DATA_RETENTION_DAYS, user=SYSTEM_USER)
+            self.publish(removed=expired)
+
+class RemoteDataManager(DataManager):
+    """A display's replica of the aggregator's store
+    
+    Reads are served locally, so pages use it exactly like a DataManager. Updates arrive on a
+    background thread and are applied on the Tk thread by poll(). Edits are forwarded to the
+    aggregator and show up once it publishes them. clear_old_data only trims this replica;
+    retention of the shared history is the aggregator's job.
+    """
+    
+    def __init__(self, address=None):
+        self.address = address or Config.AGGREGATOR_ADDRESS
+        self.inbox = queue.Queue()
+        self.sock = None
+        self.send_lock = threading.Lock()
+        self.connected = None  # Unknown until the first attempt; failures are logged once
+        self.root = None
+        
+        # Position in the aggregator's delta stream, kept by the receive thread for resubscribing
+        self.epoch = None
+        self.received_seq = None
+        super().__init__(data_file=None)
+    
+    def load_data(self):
+        """Start empty; the aggregator's snapshot fills the replica"""
+        self.detection_data = []
+        self._row_cache = {}
+        self._row_versions = {}
+        self.time_bins.rebuild(self.detection_data)
+        self.rebuild_node_buffers()
+        self.revision += 1
+    
+    def save_data(self):
+        """Nothing to write; the aggregator owns storage"""
+        return True
+    
+    def start(self, root):
+        """Connect in the background and apply updates on the Tk thread"""
+        self.root = root
+        threading.Thread(target=self.receive_loop, name="aggregator-client", daemon=True).start()
+        self.root.after(Config.AGGREGATOR_POLL_INTERVAL, self.poll)
+    
+    def receive_loop(self):
+        """Stay subscribed to the aggregator, reconnecting whenever the connection drops"""
+        family, address = parse_address(self.address)
+        while True:
+            try:
+                with socket.socket(family, socket.SOCK_STREAM) as sock:
+                    sock.connect(address)
+                    with sock.makefile("rb") as stream:
+                        self.sock = sock
+                        self.send({"op": "subscribe", "epoch": self.epoch, "since": self.received_seq})
+                        logger.info(f"Connected to aggregator at {self.address}")
+                        self.connected = True
+                        
+                        for line in stream:
+                            message = json.loads(line)
+                            if message.get("type") == "error":
+                                logger.warning(f"Aggregator error: {message.get('error')}")
+                                continue
+                            self.epoch = message["epoch"]
+                            self.received_seq = message["seq"]
+                            self.inbox.put(message)
+                        logger.warning("Aggregator closed the connection")
+            except (OSError, ValueError) as e:
+                if self.connected is not False:
+                    logger.warning(f"Aggregator at {self.address} unavailable: {e}")
+            
+            self.sock = None
+            self.connected = False
+            time.sleep(Config.AGGREGATOR_RECONNECT_DELAY)
+    
+    def send(self, message):
+        """Send a command to the aggregator, returning whether it was sent"""
+        with self.send_lock:
+            sock = self.sock
+            if sock is None:
+                return False
+            try:
+                sock.sendall(_encode(message))
+                return True
+            except OSError as e:
+                print(f"Error sending to aggregator: {e}")
+                return False
+    
+    def poll(self):
+        """Apply received snapshots and deltas, then reschedule"""
+        try:
+            while True:
+                message = self.inbox.get_nowait()
+                if message["type"] == "snapshot":
+                    self.apply_snapshot(message)
+                else:
+                    self.apply_delta(message)
+        except queue.Empty:
+            pass
+        except Exception as e:
+            print(f"Error applying aggregator update: {e}")
+        
+        self.root.after(Config.AGGREGATOR_POLL_INTERVAL, self.poll)
+    
+    def set_node_ages(self, ages):
+        """Set node heartbeats from the ages reported by the aggregator"""
+        now = time.monotonic()
+        for node_id, age in ages.items():
+            node = self.get_node(node_id)
+            if age is not None:
+                node.heartbeat(now - age)
+    
+    def apply_snapshot(self, message):
+        """Replace the replica with the aggregator's full store"""
+        self.detection_data = message["detections"]
+        self._row_cache = {}
+        self._row_versions = {}
+        self.time_bins.rebuild(self.detection_data)
+        self.rebuild_node_buffers()
+        self.set_node_ages(message["nodes"])
+        self.revision += 1
+    
+    def apply_delta(self, message):
+        """Apply one delta from the aggregator"""
+        added = message.get("added", [])
+        for detection in added:
+            LATENCY.stamp(detection["id"], "ingest", detection["timestamp"])
+            self.detection_data.append(detection)
+            self.get_node(detection.get("node_id", Config.DEFAULT_NODE_ID)).add(detection)
+            self.time_bins.add(detection["timestamp"])
+        if added:
+            self.revision += 1  # So the id index below sees the new detections
+            self._index_added(added)
+        
+        rebuild_nodes = False
+        changed = False
+        for detection in message.get("updated", []):
+            existing = self.get_detection_by_id(detection["id"])
+            if existing is None:
+                continue
+            changed = True
+            if existing["timestamp"] != detection["timestamp"]:
+                self.time_bins.remove(existing["timestamp"])
+                self.time_bins.add(detection["timestamp"])
+                rebuild_nodes = True
+            rebuild_nodes = rebuild_nodes or existing.get("node_id") != detection.get("node_id")
+            existing.update(detection)
+            self._row_cache.pop(detection["id"], None)
+            self._row_versions[detection["id"]] = self._row_versions.get(detection["id"], 0) + 1
+        
+        removed = set(message.get("removed", []))
+        if removed:
+            for detection_id in removed:
+                existing = self.get_detection_by_id(detection_id)
+                if existing is not None:
+                    self.time_bins.remove(existing["timestamp"])
+                    self.get_node(existing.get("node_id", Config.DEFAULT_NODE_ID)).discard(detection_id)
+                self._row_cache.pop(detection_id, None)
+                self._row_versions.pop(detection_id, None)
+            self.detection_data = [d for d in self.detection_data if d["id"] not in removed]
+            self.time_bins.prune()
+        
+        if rebuild_nodes:
+            self.rebuild_node_buffers()
+        self.set_node_ages(message.get("nodes", {}))
+        if changed or removed:
+            self.revision += 1  # Invalidates the sort indexes, which only track additions
+    
+    def add_detection(self, detection_data):
+        """Send a detection to the aggregator; its id is assigned there"""
+        self.send({"op": "add", "detection": detection_data, "user": AUDIT.actor()})
+        return None
+    
+    def node_heartbeat(self, node_id):
+        """Forward a node heartbeat to the aggregator"""
+        self.send({"op": "heartbeat", "node_id": node_id})
+    
+    def heartbeat_local_node(self):
+        """Displays host no node; liveness comes from the ages the aggregator reports"""
+    
+    def update_detection(self, detection_id, updates):
+        """Ask the aggregator to update a detection"""
+        return self.send({"op": "update", "id": detection_id, "updates": updates, "user": AUDIT.actor()})
+    
+    def delete_detection(self, detection_id):
+        """Ask the aggregator to delete a detection"""
+        self.send({"op": "delete", "id": detection_id, "user": AUDIT.actor()})
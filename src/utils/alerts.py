@@ -0,0 +1,124 @@
+import heapq
+import itertools
+import time
+from src.utils.metrics import METRICS
+
+DROPPED = METRICS.counter("gilda_alerts_dropped_total", "Alerts dropped because the queue was full")
+
+SECTORS = ["N", "NE", "E", "SE", "S", "SW", "W", "NW"]
+
+def bearing_to_sector(angle):
+    """Get the compass sector name for a bearing in degrees"""
+    return SECTORS[int((angle % 360) / 45.0 + 0.5) % 8]
+
+class Alert:
+    """A pending or displayed alert, possibly standing for a burst of events"""
+    
+    def __init__(self, message, details, priority, key, timestamp, label=None):
+        self.message = message
+        self.label = label or "alerts"  # What a burst counts, e.g. "gunshots"
+        self.details = details
+        self.priority = priority
+        self.key = key
+        self.count = 1
+        self.first_time = timestamp
+        self.last_time = timestamp
+        self.entry = None  # The live heap entry; older entries are skipped
+    
+    def merge(self, details, priority, timestamp):
+        """Fold another event of the same burst into this alert"""
+        self.details = details
+        self.priority = max(self.priority, priority)
+        self.count += 1
+        self.last_time = timestamp
+    
+    def display_details(self):
+        """Get the details text, summarising bursts"""
+        if self.count == 1:
+            return self.details
+        
+        span = self.last_time - self.first_time
+        summary = f"{self.count} × {self.label} in {span:.0f} s"
+        if self.key:
+            summary += f" ({self.key})"
+        return f"{summary}\n{self.details}" if self.details else summary
+
+class AlertQueue:
+    """Priority queue of alerts that coalesces bursts and bounds its size"""
+    
+    def __init__(self, coalesce_window=3.0, max_pending=20):
+        self.coalesce_window = coalesce_window
+        self.max_pending = max_pending
+        self.heap = []
+        self.pending = {}  # key -> Alert, for coalescing
+        self.size = 0
+        self.dropped = 0
+        self.counter = itertools.count()
+    
+    def __len__(self):
+        return self.size
+    
+    def can_coalesce(self, alert, key, timestamp):
+        """Check whether an event belongs to the burst of an existing alert"""
+        return (
+            alert is not None and key is not None and alert.key == key
+            and timestamp - alert.last_time <= self.coalesce_window
+        )
+    
+    def push(self, message, details="", priority=1, key=None, timestamp=None, label=None):
+        """Queue an alert, merging it into a pending burst with the same key"""
+        timestamp = time.time() if timestamp is None else timestamp
+        
+        alert = self.pending.get(key)
+        if self.can_coalesce(alert, key, timestamp):
+            old_priority = alert.priority
+            alert.merge(details, priority, timestamp)
+            if alert.priority != old_priority:
+                self._push_entry(alert)
+            return alert
+        
+        alert = Alert(message, details, priority, key, timestamp, label)
+        if key is not None:
+            self.pending[key] = alert
+        self._push_entry(alert)
+        self.size += 1
+        
+        if self.size > self.max_pending:
+            self._drop_lowest()
+        return alert
+    
+    def pop(self):
+        """Get the highest priority alert, oldest first among equals"""
+        while self.heap:
+            entry = heapq.heappop(self.heap)
+            alert = entry[2]
+            if alert.entry is not entry:
+                continue  # Superseded by a priority change or dropped
+            
+            alert.entry = None
+            self.size -= 1
+            if self.pending.get(alert.key) is alert:
+                del self.pending[alert.key]
+            return alert
+        return None
+    
+    def _push_entry(self, alert):
+        """Add a heap entry for an alert, invalidating any previous one"""
+        entry = (-alert.priority, next(self.counter), alert)
+        alert.entry = entry
+        heapq.heappush(self.heap, entry)
+    
+    def _drop_lowest(self):
+        """Drop the lowest priority, newest pending alert to bound the queue"""
+        live = [entry for entry in self.heap if entry[2].entry is entry]
+        victim = max(live)[2]
+        victim.entry = None
+        if self.pending.get(victim.key) is victim:
+            del self.pending[victim.key]
+        self.size -= 1
+        self.dropped += 1
+        DROPPED.inc()
+        
+        # Compact the heap so stale entries don't accumulate
+        self.heap = [entry for entry in live if entry[2] is not victim]
+        heapq.heapify(self.heap)
@@ -0,0 +1,78 @@
+import gzip
+import io
+import json
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_FORMAT = "gilda-detections"
+ARCHIVE_VERSION = 1
+CHUNK_SIZE = 5000
+
+def _open_archive(path, mode):
+    """Open an archive file as text, choosing compression from the extension"""
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed; use a .gz archive instead")
+        
+        raw = open(path, mode + "b")
+        if mode == "w":
+            stream = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    
+    # Level 1 is several times faster than the default for little size difference
+    return gzip.open(path, mode + "t", encoding="utf-8", compresslevel=1)
+
+def export_archive(data_manager, path, start_time=None, end_time=None):
+    """Write detections to a compressed NDJSON archive, oldest first"""
+    count = 0
+    with _open_archive(path, "w") as f:
+        f.write(json.dumps({"format": ARCHIVE_FORMAT, "version": ARCHIVE_VERSION}) + "\n")
+        
+        # Write in chunks so large stores never build one huge string
+        encoder = json.JSONEncoder(separators=(",", ":"))
+        chunk = []
+        for detection in data_manager.iter_detections(start_time, end_time):
+            chunk.append(encoder.encode(detection))
+            if len(chunk) >= CHUNK_SIZE:
+                f.write("\n".join(chunk) + "\n")
+                count += len(chunk)
+                chunk = []
+        
+        if chunk:
+            f.write("\n".join(chunk) + "\n")
+            count += len(chunk)
+    
+    return count
+
+def iter_archive(path, chunk_size=CHUNK_SIZE):
+    """Read an archive as chunks of detection records"""
+    with _open_archive(path, "r") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != ARCHIVE_FORMAT:
+            raise ValueError(f"{path} is not a detection archive")
+        if header.get("version", 0) > ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported archive version {header.get('version')}")
+        
+        # Decode a chunk of lines as one JSON array, which is much faster than line by line
+        lines = []
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            lines.append(line)
+            if len(lines) >= chunk_size:
+                yield json.loads("[" + ",".join(lines) + "]")
+                lines = []
+        
+        if lines:
+            yield json.loads("[" + ",".join(lines) + "]")
+
+def import_archive(data_manager, path):
+    """Merge an archive into the data store, skipping ids it already has and malformed records"""
+    records = (record for chunk in iter_archive(path) for record in chunk)
+    return data_manager.merge_detections(records)
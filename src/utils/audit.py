@@ -0,0 +1,280 @@
+import atexit
+import bisect
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from src.config import Config
+from src.utils.metrics import METRICS
+
+# Hash that the first record of a new log chains from
+GENESIS_HASH = "0" * 64
+
+# User recorded for actions the app takes on its own, such as routine retention
+SYSTEM_USER = "system"
+
+RECORDED = METRICS.counter("gilda_audit_records_total", "Operator actions written to the audit log")
+WRITE_ERRORS = METRICS.counter("gilda_audit_write_errors_total", "Failed audit log batch writes")
+BATCH_SECONDS = METRICS.histogram("gilda_audit_batch_seconds", "Time to write and sync one audit batch")
+
+def _record_hash(prev_hash, body):
+    """Hash a record body together with the hash of the record before it"""
+    return hashlib.sha256((prev_hash + body).encode("utf-8")).hexdigest()
+
+def _parse_record(line):
+    """Get the record on one log line, or None if the line is blank, torn or not a record"""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get("seq"), int) or \
+            not isinstance(record.get("hash"), str):
+        return None
+    return record
+
+def _canonical(record):
+    """Serialise the hashed fields of a record in a stable form"""
+    fields = {key: record[key] for key in ("seq", "time", "user", "action", "details")}
+    return json.dumps(fields, sort_keys=True, separators=(",", ":"))
+
+class AuditLog:
+    """Append-only, hash-chained log of operator actions, written in batches by a background thread"""
+    
+    def __init__(self, path=None, flush_interval=Config.AUDIT_FLUSH_INTERVAL,
+                 batch_size=Config.AUDIT_BATCH_SIZE):
+        self.path = path  # Config.AUDIT_LOG_FILE when started, so main can pick the instance's log first
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.actor = lambda: None  # Returns the logged-in user; set by the app
+        
+        self.queue = queue.Queue()
+        self.writer = None
+        self.stopped = threading.Event()
+        
+        # Chain state, only touched by the writer thread once started
+        self.last_seq = 0
+        self.last_hash = GENESIS_HASH
+        self.pending = []  # A batch whose write failed, retried before anything newer
+    
+    def start(self):
+        """Start the background writer; actions recorded before this are ignored"""
+        if self.writer is not None:
+            return
+        
+        self.path = self.path or Config.AUDIT_LOG_FILE
+        log_dir = os.path.dirname(self.path)
+        if log_dir and not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+        self.last_seq, self.last_hash = self.read_chain_tail()
+        
+        self.stopped.clear()
+        self.writer = threading.Thread(target=self.write_loop, name="audit-writer", daemon=True)
+        self.writer.start()
+    
+    def stop(self):
+        """Write out everything recorded so far and stop the writer"""
+        if self.writer is None:
+            return
+        
+        self.stopped.set()
+        self.writer.join(timeout=5)
+        self.writer = None
+    
+    def record(self, action, user=None, **details):
+        """Queue one operator action; returns at once, the write happens in the background"""
+        if self.writer is None:
+            return
+        
+        self.queue.put({
+            "time": time.time(),
+            "user": user if user is not None else self.actor(),
+            "action": action,
+            "details": details
+        })
+    
+    def read_chain_tail(self):
+        """Get the sequence number and hash of the last complete record, cutting off a torn tail"""
+        try:
+            f = open(self.path, 'rb+')
+        except FileNotFoundError:
+            return 0, GENESIS_HASH
+        
+        with f:
+            end = start = f.seek(0, os.SEEK_END)
+            data = b""
+            last, last_end = None, 0
+            while last is None:
+                # Read backwards a chunk at a time until a whole, valid record is in the buffer
+                read = min(4096, start)
+                start -= read
+                f.seek(start)
+                data = f.read(read) + data
+                
+                line_end = data.rfind(b"\n")
+                while line_end >= 0:
+                    line_start = data.rfind(b"\n", 0, line_end) + 1
+                    if line_start == 0 and start > 0:
+                        break  # May be cut off; read further back
+                    record = _parse_record(data[line_start:line_end])
+                    if record is not None:
+                        last, last_end = record, start + line_end + 1
+                        break
+                    line_end = line_start - 1
+                
+                if start == 0:
+                    break
+            
+            # A crash mid-write leaves a partial line; drop it so new records start on a clean line
+            if last_end < end:
+                print(f"Truncating {end - last_end} bytes of incomplete audit records from {self.path}")
+                f.truncate(last_end)
+        
+        if last is None:
+            return 0, GENESIS_HASH
+        return last["seq"], last["hash"]
+    
+    def write_loop(self):
+        """Collect queued records into batches and append them to the log"""
+        failures = 0
+        while True:
+            batch = self.pending or self.next_batch()
+            if not batch:
+                if self.stopped.is_set():
+                    return
+                continue
+            
+            if self.write_batch(batch):
+                self.pending = []
+                failures = 0
+                continue
+            
+            # Keep the batch for the next cycle; at shutdown, make a few quick attempts before giving up
+            self.pending = batch
+            failures += 1
+            if not self.stopped.is_set():
+                self.stopped.wait(self.flush_interval)
+            elif failures < 3:
+                time.sleep(0.2)
+            else:
+                print(f"Error: {len(self.pending)} audit records not written at shutdown")
+                return
+    
+    def next_batch(self):
+        """Wait up to the flush interval for records, returning at most a batch of them"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0 or (self.stopped.is_set() and self.queue.empty()):
+                break
+            try:
+                batch.append(self.queue.get(timeout=min(timeout, 0.25)))
+            except queue.Empty:
+                pass
+        return batch
+    
+    def write_batch(self, batch):
+        """Chain, append and sync one batch of records, returning whether it was written"""
+        start = time.perf_counter()
+        lines = []
+        seq, prev_hash = self.last_seq, self.last_hash
+        for record in batch:
+            seq += 1
+            record["seq"] = seq
+            record["prev"] = prev_hash
+            record["hash"] = prev_hash = _record_hash(prev_hash, _canonical(record))
+            lines.append(json.dumps(record, separators=(",", ":")))
+        
+        size = None
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                size = f.tell()
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            print(f"Error writing audit log: {e}")
+            WRITE_ERRORS.inc()
+            
+            # Remove anything partly written, so the retry doesn't chain after half a batch
+            if size is not None:
+                try:
+                    os.truncate(self.path, size)
+                except OSError:
+                    pass
+            return False
+        
+        self.last_seq, self.last_hash = seq, prev_hash
+        RECORDED.inc(len(batch))
+        BATCH_SECONDS.observe(time.perf_counter() - start)
+        return True
+
+class AuditReader:
+    """Indexed queries over an audit log, reading only the records that match"""
+    
+    def __init__(self, path=None):
+        self.path = path or Config.AUDIT_LOG_FILE
+        self.indexed_size = 0  # Bytes of the file covered by the index
+        
+        # Sorted (time, offset) pairs, for all records and per user
+        self.all_records = []
+        self.by_user = {}
+    
+    def refresh(self):
+        """Index records appended since the last refresh"""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.indexed_size)
+                offset = self.indexed_size
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Partially written; picked up next time
+                    if line.strip():
+                        record = json.loads(line)
+                        entry = (record["time"], offset)
+                        bisect.insort(self.all_records, entry)
+                        bisect.insort(self.by_user.setdefault(record["user"], []), entry)
+                    offset += len(line)
+                self.indexed_size = offset
+        except FileNotFoundError:
+            pass
+    
+    def query(self, user=None, start_time=None, end_time=None):
+        """Get the records for a user (or everyone) between two times, oldest first"""
+        self.refresh()
+        entries = self.all_records if user is None else self.by_user.get(user, [])
+        
+        lo = 0 if start_time is None else bisect.bisect_left(entries, (start_time,))
+        hi = len(entries) if end_time is None else bisect.bisect_right(entries, (end_time, float("inf")))
+        
+        records = []
+        with open(self.path, 'rb') as f:
+            for _, offset in entries[lo:hi]:
+                f.seek(offset)
+                records.append(json.loads(f.readline()))
+        return records
+    
+    def verify(self):
+        """Check the hash chain, returning the sequence number of the first bad record or None"""
+        prev_hash = GENESIS_HASH
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break  # Partially written
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record["prev"] != prev_hash or \
+                            record["hash"] != _record_hash(prev_hash, _canonical(record)):
+                        return record["seq"]
+                    prev_hash = record["hash"]
+        except FileNotFoundError:
+            pass
+        return None
+
+# Shared by the app and the data store; started by the app so tools and benchmarks don't write to it
+AUDIT = AuditLog()
+atexit.register(AUDIT.stop)
@@ -1,84 +1,227 @@
 import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
 import time
-from datetime import datetime, timedelta
+from src.config import Config
+from src.utils.metrics import METRICS
+from src.utils.audit import AUDIT
+
+VERIFY_SECONDS = METRICS.histogram("gilda_password_verify_seconds", "Time spent verifying a password")
+
+# Accounts created when no user store exists yet (change these on deployed units)
+DEFAULT_USERS = {
+    "admin": "admin123",
+    "operator": "operator123",
+    "guest": "guest123"
+}
+
+class UserStoreError(Exception):
+    """The user store exists but can't be read; logins are refused rather than reset to defaults"""
+
+def _logins(result):
+    return METRICS.counter("gilda_logins_total", "Login attempts", labels={"result": result})
+
+class VerificationWorker(threading.Thread):
+    """Background worker that checks a password so the KDF cost stays off the Tk thread"""
+    
+    def __init__(self, auth_manager, username, password):
+        super().__init__(daemon=True)
+        self.auth_manager = auth_manager
+        self.username = username
+        self.password = password
+        
+        # Read by the UI thread while verification runs
+        self.verified = False
+        self.error = None
+        self.finished = False
+    
+    def run(self):
+        try:
+            self.verified = self.auth_manager.verify_password(self.username, self.password)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.password = None
+            self.finished = True
 
 class AuthManager:
     """Authentication manager for user login/logout"""
     
-    def __init__(self):
-        # Default credentials (in production, use proper database/config)
-        self.users = {
-            "admin": self._hash_password("admin123"),
-            "operator": self._hash_password("operator123"),
-            "guest": self._hash_password("guest123")
+    def __init__(self, session, users_file=Config.USERS_FILE, iterations=Config.AUTH_KDF_ITERATIONS):
+        self.session = session  # The application's SessionManager
+        self.users_file = users_file
+        self.iterations = iterations
+        self.users = None  # Loaded on first use, off the Tk thread when logging in
+        self.users_lock = threading.Lock()
+        
+        # Recently verified credentials, kept as keyed digests so passwords are never held
+        self.cache_key = secrets.token_bytes(32)
+        self.verified_cache = {}  # username -> (digest, expiry)
+    
+    def _hash_password(self, password, salt=None, iterations=None):
+        """Hash a password with salted PBKDF2-HMAC-SHA256"""
+        salt = salt or secrets.token_bytes(16)
+        iterations = iterations or self.iterations
+        digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+        return {
+            "algorithm": "pbkdf2_sha256",
+            "iterations": iterations,
+            "salt": salt.hex(),
+            "hash": digest.hex()
         }
+    
+    def _load_users(self):
+        """Load the user store, creating it with the default accounts only if missing (needs users_lock)"""
+        if self.users is not None:
+            return
+        
+        try:
+            with open(self.users_file, 'r') as f:
+                users = json.load(f)
+        except FileNotFoundError:
+            users = None
+        except (OSError, ValueError) as e:
+            # Never fall back to the defaults here: that would reset every password
+            raise UserStoreError(f"Cannot read user store {self.users_file}: {e}") from e
+        
+        if users is not None:
+            if not isinstance(users, dict):
+                raise UserStoreError(f"User store {self.users_file} is not a JSON object")
+            self.users = users
+            return
         
-        self.current_user = None
-        self.login_time = None
-        self.session_timeout = 3600  # 1 hour
+        self.users = {username: self._hash_password(password)
+                      for username, password in DEFAULT_USERS.items()}
+        self._save_users()
     
-    def _hash_password(self, password):
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+    def _save_users(self):
+        """Write the user store atomically, readable by the owner only (needs users_lock)"""
+        try:
+            temp_path = self.users_file + ".tmp"
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.users, f, indent=2)
+            os.replace(temp_path, self.users_file)
+        except Exception as e:
+            print(f"Error saving users: {e}")
     
-    def authenticate(self, username, password):
-        """Authenticate user with username and password - Development mode allows any credentials"""
-        # For development: accept any non-empty credentials
-        if username.strip() and password.strip():
-            self.current_user = username
-            self.login_time = time.time()
-            print(f"Development mode: Login successful for {username}")
+    def _cache_digest(self, username, password):
+        """Keyed digest of a credential pair for the verification cache"""
+        return hmac.new(self.cache_key, f"{username}\0{password}".encode(), hashlib.sha256).digest()
+    
+    def verify_password(self, username, password):
+        """Check a password against the user store; slow by design, so call off the Tk thread"""
+        digest = self._cache_digest(username, password)
+        cached = self.verified_cache.get(username)
+        if cached and cached[1] > time.monotonic() and hmac.compare_digest(cached[0], digest):
             return True
         
-        return False
-    
-    def is_authenticated(self):
-        """Check if user is currently authenticated"""
-        if not self.current_user or not self.login_time:
+        start = time.perf_counter()
+        with self.users_lock:
+            self._load_users()
+            record = self.users.get(username)
+        
+        if record is None:
+            # Spend the same time on unknown users so they can't be told apart
+            self._hash_password(password)
+            VERIFY_SECONDS.observe(time.perf_counter() - start)
             return False
         
-        # Check session timeout
-        if time.time() - self.login_time > self.session_timeout:
-            self.logout()
+        candidate = self._hash_password(password, bytes.fromhex(record["salt"]), record["iterations"])
+        verified = hmac.compare_digest(candidate["hash"], record["hash"])
+        VERIFY_SECONDS.observe(time.perf_counter() - start)
+        if not verified:
             return False
         
+        # Rehash with the current cost when it has been tuned since the password was set
+        if record["iterations"] != self.iterations:
+            with self.users_lock:
+                self.users[username] = self._hash_password(password)
+                self._save_users()
+        
+        self.verified_cache[username] = (digest, time.monotonic() + Config.AUTH_CACHE_TTL)
         return True
     
+    def begin_login(self, username, password):
+        """Start verifying credentials in the background; pass the worker to finish_login when done"""
+        worker = VerificationWorker(self, username, password)
+        worker.start()
+        return worker
+    
+    def finish_login(self, worker):
+        """Start a session if a finished verification succeeded"""
+        if worker.error:
+            print(f"Error verifying credentials: {worker.error}")
+        
+        if worker.verified:
+            self.start_session(worker.username)
+            return True
+        
+        _logins("failure").inc()
+        AUDIT.record("login_failed", user=worker.username)
+        return False
+    
+    def authenticate(self, username, password):
+        """Authenticate user with username and password, blocking for the KDF"""
+        if self.verify_password(username, password):
+            self.start_session(username)
+            return True
+        
+        _logins("failure").inc()
+        AUDIT.record("login_failed", user=username)
+        return False
+    
+    def start_session(self, username):
+        """Log in a verified user"""
+        self.session.start(username)
+        _logins("success").inc()
+        AUDIT.record("login", user=username)
+    
+    def is_authenticated(self):
+        """Check if user is currently authenticated"""
+        return self.session.is_active()
+    
     def logout(self):
         """Logout current user"""
-        self.current_user = None
-        self.login_time = None
+        if self.session.user:
+            AUDIT.record("logout", user=self.session.user)
+        self.session.end()
     
     def get_current_user(self):
         """Get current authenticated user"""
-        if self.is_authenticated():
-            return self.current_user
-        return None
+        return self.session.user
     
     def extend_session(self):
         """Extend current session"""
-        if self.is_authenticated():
-            self.login_time = time.time()
+        self.session.extend(force=True)
     
     def get_session_remaining(self):
         """Get remaining session time in seconds"""
-        if not self.is_authenticated():
-            return 0
-        
-        elapsed = time.time() - self.login_time
-        remaining = self.session_timeout - elapsed
-        return max(0, remaining)
+        return self.session.remaining()
+    
+    def set_password(self, username, password):
+        """Store a new password hash and drop any cached verification"""
+        record = self._hash_password(password)
+        with self.users_lock:
+            self._load_users()
+            self.users[username] = record
+            self._save_users()
+        self.verified_cache.pop(username, None)
+        AUDIT.record("set_password", target=username)
     
     def add_user(self, username, password):
         """Add a new user (admin function)"""
-        if self.current_user == "admin":
-            self.users[username] = self._hash_password(password)
+        if self.session.user == "admin":
+            self.set_password(username, password)
             return True
         return False
     
     def change_password(self, username, old_password, new_password):
         """Change user password"""
-        if self.authenticate(username, old_password):
-            self.users[username] = self._hash_password(new_password)
+        if self.verify_password(username, old_password):
+            self.set_password(username, new_password)
             return True
-        return False
\ No newline at end of file
+        return False
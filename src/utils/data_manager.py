@@ -1,15 +1,87 @@
 import random
 import time
-from datetime import datetime, timedelta
+import bisect
+from datetime import datetime
 import json
 import os
+from src.utils.latency import LATENCY
+from src.utils.time_bins import TimeBins
+from src.utils.metrics import METRICS, weak_callback
+from src.utils.audit import AUDIT
+from src.utils.nodes import SensorNode, merge_recent
+from src.config import Config
+
+# Store metrics, shared by every DataManager instance
+INGESTED = METRICS.counter("gilda_detections_ingested_total", "Detections added to the store")
+PERSISTED = METRICS.counter("gilda_detections_persisted_total", "Detections written to the data file")
+SAVE_ERRORS = METRICS.counter("gilda_store_save_errors_total", "Failed writes of the data file")
+SAVE_SECONDS = METRICS.histogram("gilda_store_save_seconds", "Time to write the data file")
+
+def _dropped(reason):
+    return METRICS.counter("gilda_detections_dropped_total", "Detections removed or rejected by the store",
+                           labels={"reason": reason})
+
+# Fields every ingested detection must carry, as numbers, for the store and the displays
+DETECTION_FIELDS = ("latitude", "longitude", "intensity", "confidence", "angle", "distance")
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def check_detection(detection, partial=False):
+    """Get a reason a detection (or, if partial, a set of updates) can't be stored, or None"""
+    if not isinstance(detection, dict):
+        return "detection must be an object"
+    
+    for field in DETECTION_FIELDS + ("timestamp",):
+        if field in detection:
+            if not _is_number(detection[field]):
+                return f"{field} must be a number"
+        elif not partial and field != "timestamp":
+            return f"{field} is missing"
+    
+    if "node_id" in detection and not isinstance(detection["node_id"], str):
+        return "node_id must be a string"
+    if partial and "id" in detection:
+        return "id can't be changed"
+    return None
+
+def _sort_key(field):
+    """Key ordering detections by a field, with records missing it after all real values"""
+    return lambda d: (d.get(field) is None, d.get(field))
+
+# Look-back windows for the time filters offered in the UI, in seconds
+TIME_FILTERS = {
+    "Last Hour": 3600,
+    "Last 24 Hours": 86400,
+    "Last Week": 604800,
+    "Last Month": 2592000
+}
 
 class DataManager:
     """Data manager for gunshot detection data"""
     
-    def __init__(self):
+    def __init__(self, data_file="detection_data.json"):
+        # In no particular order (new detections are appended); ordered views come from
+        # the sort indexes (get_sort_index, iter_detections) and the node buffers (get_recent)
         self.detection_data = []
-        self.data_file = "detection_data.json"
+        self.data_file = data_file
+        self.revision = 0  # Bumped on every change so views can skip redundant rebuilds
+        self._id_index = {}
+        self._id_index_revision = None
+        self._sort_indexes = {}
+        self._sort_indexes_revision = None
+        
+        # Formatted display rows per detection, dropped when a detection changes
+        self._row_cache = {}
+        self._row_versions = {}
+        
+        # Per-minute/hour/day detection counts for the timeline
+        self.time_bins = TimeBins()
+        
+        # Sensor nodes by id, each with a ring buffer of its latest detections
+        self.nodes = {}
+        METRICS.gauge("gilda_store_detections", "Detections held in the store",
+                      func=weak_callback(self, lambda store: len(store.detection_data)))
         self.load_data()
     
     def load_data(self):
@@ -23,14 +95,26 @@ class DataManager:
         else:
             # Generate some sample data for testing
             self.generate_sample_data()
+        
+        self._row_cache = {}
+        self._row_versions = {}
+        self.time_bins.rebuild(self.detection_data)
+        self.rebuild_node_buffers()
+        self.revision += 1
     
     def save_data(self):
-        """Save detection data to file"""
+        """Save detection data to file, returning whether it was written"""
+        start = time.perf_counter()
         try:
             with open(self.data_file, 'w') as f:
-                json.dump(self.detection_data, f, indent=2)
+                json.dump(self.detection_data, f, separators=(",", ":"))
         except Exception as e:
             print(f"Error saving data: {e}")
+            SAVE_ERRORS.inc()
+            return False
+        
+        SAVE_SECONDS.observe(time.perf_counter() - start)
+        return True
     
     def generate_sample_data(self):
         """Generate sample detection data for testing"""
@@ -55,22 +139,105 @@ class DataManager:
             
             self.detection_data.append(detection)
         
-        # Sort by timestamp (newest first)
-        self.detection_data.sort(key=lambda x: x["timestamp"], reverse=True)
         self.save_data()
     
+    def get_node(self, node_id):
+        """Get a sensor node, registering it the first time it is seen"""
+        node = self.nodes.get(node_id)
+        if node is None:
+            node = self.nodes[node_id] = SensorNode(node_id)
+        return node
+    
+    def get_nodes(self):
+        """Get all known sensor nodes, ordered by id"""
+        return [self.nodes[node_id] for node_id in sorted(self.nodes)]
+    
+    def node_heartbeat(self, node_id):
+        """Record a heartbeat from a sensor node"""
+        self.get_node(node_id).heartbeat()
+    
+    def heartbeat_local_node(self):
+        """Record that this unit's own node is alive; the UI calls this while it runs"""
+        # The local node is hosted by this process, so the process running is its liveness source
+        self.node_heartbeat(Config.DEFAULT_NODE_ID)
+    
+    def rebuild_node_buffers(self):
+        """Refill every node's recent-detection buffer from the full history"""
+        by_node = {}
+        for detection in self.detection_data:
+            by_node.setdefault(detection.get("node_id", Config.DEFAULT_NODE_ID), []).append(detection)
+        
+        for node in self.nodes.values():
+            if node.node_id not in by_node:
+                node.reset([])
+        for node_id, detections in by_node.items():
+            self.get_node(node_id).reset(detections)
+    
     def add_detection(self, detection_data):
         """Add a new detection"""
         detection_data["id"] = f"DET_{int(time.time())}_{len(self.detection_data)}"
         detection_data["timestamp"] = time.time()
+        detection_data.setdefault("node_id", Config.DEFAULT_NODE_ID)
+        LATENCY.stamp(detection_data["id"], "ingest", detection_data["timestamp"])
         
-        self.detection_data.insert(0, detection_data)  # Add to beginning
-        self.save_data()
+        # History order doesn't matter; ordered views come from the node buffers and sort indexes
+        self.detection_data.append(detection_data)
+        self.get_node(detection_data["node_id"]).add(detection_data)
+        self.time_bins.add(detection_data["timestamp"])
+        self.revision += 1
+        self._index_added([detection_data])
+        INGESTED.inc()
+        if self.save_data():
+            PERSISTED.inc()
+        LATENCY.stamp(detection_data["id"], "persist")
         return detection_data["id"]
     
+    def merge_detections(self, records):
+        """Merge detection records into the store, skipping duplicate ids and malformed records"""
+        known = {d["id"] for d in self.detection_data}
+        accepted = []
+        skipped = 0
+        invalid = 0
+        
+        # Check everything before touching the store, so a bad record can't leave it half-merged
+        for record in records:
+            error = check_detection(record)
+            if error is None and not isinstance(record.get("id"), str):
+                error = "id must be a string"
+            if error is None and "timestamp" not in record:
+                error = "timestamp is missing"
+            if error:
+                invalid += 1
+                continue
+            if record["id"] in known:
+                skipped += 1
+                continue
+            known.add(record["id"])
+            accepted.append(record)
+        
+        added = len(accepted)
+        self.detection_data.extend(accepted)
+        for record in accepted:
+            self.time_bins.add(record["timestamp"])
+        
+        if added:
+            self.rebuild_node_buffers()
+            self.revision += 1
+            INGESTED.inc(added)
+            if self.save_data():
+                PERSISTED.inc(added)
+        
+        _dropped("duplicate").inc(skipped)
+        _dropped("invalid").inc(invalid)
+        return added, skipped, invalid
+    
+    def get_recent(self, limit=10):
+        """Get the newest detections across all nodes, newest first"""
+        return merge_recent(self.nodes.values(), limit)
+    
     def get_recent_detections(self, limit=10):
         """Get recent detections for radar display"""
-        recent = self.detection_data[:limit]
+        recent = self.get_recent(limit)
         
         # Convert to radar format
         radar_points = []
@@ -80,7 +247,8 @@ class DataManager:
                 "distance": detection["distance"],
                 "intensity": detection["intensity"],
                 "timestamp": detection["timestamp"],
-                "id": detection["id"]
+                "id": detection["id"],
+                "node_id": detection.get("node_id", Config.DEFAULT_NODE_ID)
             })
         
         return radar_points
@@ -93,79 +261,205 @@ class DataManager:
         count = sum(1 for d in self.detection_data if d["timestamp"] >= today_timestamp)
         return count
     
-    def get_recent_detection_list(self, limit=10):
-        """Get recent detections as formatted strings"""
-        recent = self.detection_data[:limit]
-        formatted_list = []
-        
-        for detection in recent:
+    def format_recent_row(self, detection):
+        """Format a detection for the recent detections list"""
+        rows = self._row_cache.setdefault(detection["id"], {})
+        row = rows.get("recent")
+        if row is None:
             dt = datetime.fromtimestamp(detection["timestamp"])
             time_str = dt.strftime("%H:%M:%S")
             intensity_str = f"{detection['intensity']:.1f}"
             confidence_str = f"{detection['confidence']:.0%}"
             
-            formatted_list.append(
-                f"{time_str} | Int: {intensity_str} | Conf: {confidence_str}"
-            )
-        
-        return formatted_list
+            row = rows["recent"] = f"{time_str} | Int: {intensity_str} | Conf: {confidence_str}"
+        return row
     
-    def get_map_detections(self, time_filter="Last 24 Hours", min_intensity=0.0):
-        """Get detections for map display with filters"""
-        # Calculate time threshold
-        now = time.time()
-        time_thresholds = {
-            "Last Hour": now - 3600,
-            "Last 24 Hours": now - 86400,
-            "Last Week": now - 604800,
-            "Last Month": now - 2592000
-        }
-        
-        threshold = time_thresholds.get(time_filter, now - 86400)
-        
-        # Filter detections
-        filtered = [
-            d for d in self.detection_data
-            if d["timestamp"] >= threshold and d["intensity"] >= min_intensity
-        ]
-        
-        # Format for display
-        formatted_list = []
-        for detection in filtered:
+    def format_map_row(self, detection):
+        """Format a detection for the map detections list"""
+        rows = self._row_cache.setdefault(detection["id"], {})
+        row = rows.get("map")
+        if row is None:
             dt = datetime.fromtimestamp(detection["timestamp"])
             time_str = dt.strftime("%m/%d %H:%M")
             lat_str = f"{detection['latitude']:.4f}"
             lon_str = f"{detection['longitude']:.4f}"
             intensity_str = f"{detection['intensity']:.2f}"
             
-            formatted_list.append(
-                f"{time_str} | {lat_str}, {lon_str} | Int: {intensity_str}"
-            )
+            row = rows["map"] = f"{time_str} | {lat_str}, {lon_str} | Int: {intensity_str}"
+        return row
+    
+    def get_recent_detection_list(self, limit=10):
+        """Get recent detections as formatted strings"""
+        return [self.format_recent_row(d) for d in self.get_recent(limit)]
+    
+    def get_recent_detection_diff(self, previous=None, limit=10):
+        """Get changes to the recent detections list since a previous snapshot"""
+        return self._diff_rows(previous, self.get_recent(limit), self.format_recent_row)
+    
+    def filter_map_detections(self, time_filter="Last 24 Hours", min_intensity=0.0, time_range=None):
+        """Get detections matching the map filters"""
+        # An explicit (start, end) range, e.g. from the timeline, overrides the preset
+        if time_range is not None:
+            start_time, end_time = time_range
+            return list(self.iter_detections(start_time, end_time, min_intensity))[::-1]
+        
+        # Calculate time threshold
+        threshold = time.time() - TIME_FILTERS.get(time_filter, 86400)
+        
+        # Filter detections, newest first
+        return list(self.iter_detections(threshold, None, min_intensity))[::-1]
+    
+    def get_map_detections(self, time_filter="Last 24 Hours", min_intensity=0.0, time_range=None):
+        """Get detections for map display with filters"""
+        filtered = self.filter_map_detections(time_filter, min_intensity, time_range)
+        return [self.format_map_row(d) for d in filtered]
+    
+    def get_map_detection_diff(self, previous=None, time_filter="Last 24 Hours", min_intensity=0.0,
+                               time_range=None):
+        """Get changes to the map detections list since a previous snapshot"""
+        filtered = self.filter_map_detections(time_filter, min_intensity, time_range)
+        return self._diff_rows(previous, filtered, self.format_map_row)
+    
+    def _diff_rows(self, previous, detections, formatter):
+        """Diff a list of detections against a snapshot of {id: version}"""
+        previous = previous or {}
+        snapshot = {}  # In display order, so tables can check that their rows are still in order
+        added = []
+        changed = []
+        
+        for position, detection in enumerate(detections):
+            detection_id = detection["id"]
+            version = self._row_versions.get(detection_id, 0)
+            snapshot[detection_id] = version
+            
+            # Only rows that are new or have changed get formatted
+            if detection_id not in previous:
+                added.append((position, detection_id, formatter(detection)))
+            elif previous[detection_id] != version:
+                changed.append((detection_id, formatter(detection)))
+        
+        removed = [detection_id for detection_id in previous if detection_id not in snapshot]
         
-        return formatted_list
+        return {
+            "added": added,
+            "removed": removed,
+            "changed": changed,
+            "snapshot": snapshot
+        }
     
     def get_detection_by_id(self, detection_id):
         """Get specific detection by ID"""
-        for detection in self.detection_data:
-            if detection["id"] == detection_id:
-                return detection
-        return None
+        if self._id_index_revision != self.revision:
+            self._id_index = {d["id"]: d for d in self.detection_data}
+            self._id_index_revision = self.revision
+        return self._id_index.get(detection_id)
+    
+    def count_detections(self):
+        """Get the total number of stored detections"""
+        return len(self.detection_data)
+    
+    def get_sort_index(self, sort_by):
+        """Get detections sorted ascending by a field, cached until the data changes"""
+        if self._sort_indexes_revision != self.revision:
+            self._sort_indexes = {}
+            self._sort_indexes_revision = self.revision
+        
+        index = self._sort_indexes.get(sort_by)
+        if index is None:
+            # Missing values sort after all real values, so descending pages list them first
+            index = sorted(self.detection_data, key=_sort_key(sort_by))
+            self._sort_indexes[sort_by] = index
+        return index
+    
+    def _index_added(self, detections):
+        """Insert new detections into the cached sort indexes; call right after bumping the revision"""
+        if self._sort_indexes_revision != self.revision - 1:
+            return  # Already stale; rebuilt on next use
+        
+        for sort_by, index in self._sort_indexes.items():
+            key = _sort_key(sort_by)
+            for detection in detections:
+                # Build a new list so iterators already bound to the old one are unaffected
+                position = bisect.bisect_right(_KeyView(index, key), key(detection))
+                index = index[:position] + [detection] + index[position:]
+            self._sort_indexes[sort_by] = index
+        self._sort_indexes_revision = self.revision
+    
+    def get_detection_page(self, offset, limit, sort_by="timestamp", descending=True):
+        """Get one page of detections in sorted order"""
+        index = self.get_sort_index(sort_by)
+        total = len(index)
+        offset = max(0, min(offset, total))
+        
+        if not descending:
+            return index[offset:offset + limit]
+        
+        # Walk the ascending index backwards instead of keeping a second copy
+        end = total - offset
+        start = max(0, end - limit)
+        return index[start:end][::-1]
+    
+    def _time_range_bounds(self, index, start_time, end_time):
+        """Get the slice of a timestamp-sorted index covering a time range"""
+        timestamps = _KeyView(index, _timestamp)
+        lo = 0 if start_time is None else bisect.bisect_left(timestamps, start_time)
+        hi = len(index) if end_time is None else bisect.bisect_right(timestamps, end_time)
+        return lo, hi
+    
+    def count_detections_in_range(self, start_time=None, end_time=None, min_intensity=0.0):
+        """Count detections between two timestamps, optionally above an intensity floor"""
+        if min_intensity > 0:
+            # Intensity isn't indexed, so this walks the time range
+            return sum(1 for _ in self.iter_detections(start_time, end_time, min_intensity))
+        
+        lo, hi = self._time_range_bounds(self.get_sort_index("timestamp"), start_time, end_time)
+        return max(0, hi - lo)
+    
+    def iter_detections(self, start_time=None, end_time=None, min_intensity=0.0):
+        """Iterate detections oldest first, optionally filtered by time and intensity"""
+        # The index is bound here, so the iterator can run on a worker thread
+        # while the UI keeps changing the data
+        index = self.get_sort_index("timestamp")
+        lo, hi = self._time_range_bounds(index, start_time, end_time)
+        return (
+            index[i] for i in range(lo, hi)
+            if index[i]["intensity"] >= min_intensity
+        )
     
     def update_detection(self, detection_id, updates):
         """Update detection data"""
         for i, detection in enumerate(self.detection_data):
             if detection["id"] == detection_id:
+                if "timestamp" in updates:
+                    self.time_bins.remove(detection["timestamp"])
+                    self.time_bins.add(updates["timestamp"])
                 self.detection_data[i].update(updates)
+                if "timestamp" in updates or "node_id" in updates:
+                    self.rebuild_node_buffers()
+                self._row_cache.pop(detection_id, None)
+                self._row_versions[detection_id] = self._row_versions.get(detection_id, 0) + 1
+                self.revision += 1
                 self.save_data()
+                AUDIT.record("update_detection", detection_id=detection_id, updates=updates)
                 return True
         return False
     
     def delete_detection(self, detection_id):
         """Delete a detection"""
+        detection = self.get_detection_by_id(detection_id)
+        if detection is not None:
+            self.time_bins.remove(detection["timestamp"])
+            self.get_node(detection.get("node_id", Config.DEFAULT_NODE_ID)).discard(detection_id)
+            _dropped("deleted").inc()
+        
         self.detection_data = [
             d for d in self.detection_data if d["id"] != detection_id
         ]
+        self._row_cache.pop(detection_id, None)
+        self._row_versions.pop(detection_id, None)
+        self.revision += 1
         self.save_data()
+        AUDIT.record("delete_detection", detection_id=detection_id, found=detection is not None)
     
     def get_statistics(self):
         """Get detection statistics"""
@@ -190,11 +484,44 @@ class DataManager:
             "avg_confidence": avg_confidence
         }
     
-    def clear_old_data(self, days_to_keep=30):
-        """Clear detection data older than specified days"""
+    def clear_old_data(self, days_to_keep=30, user=None):
+        """Clear detection data older than specified days; user defaults to the logged-in operator"""
         cutoff_time = time.time() - (days_to_keep * 86400)
         
+        expired = 0
+        for d in self.detection_data:
+            if d["timestamp"] < cutoff_time:
+                self.time_bins.remove(d["timestamp"])
+                expired += 1
+        _dropped("expired").inc(expired)
+        
         self.detection_data = [
             d for d in self.detection_data if d["timestamp"] >= cutoff_time
         ]
-        self.save_data()
\ No newline at end of file
+        self.time_bins.prune()
+        self.rebuild_node_buffers()
+        
+        # Drop cached rows for detections that no longer exist
+        kept = {d["id"] for d in self.detection_data}
+        self._row_cache = {k: v for k, v in self._row_cache.items() if k in kept}
+        self._row_versions = {k: v for k, v in self._row_versions.items() if k in kept}
+        self.revision += 1
+        self.save_data()
+        AUDIT.record("clear_old_data", user=user, days_to_keep=days_to_keep, removed=expired)
+
+def _timestamp(detection):
+    return detection["timestamp"]
+
+class _KeyView:
+    """Sequence view of the sort keys in a sorted index, for bisecting without copying"""
+    # bisect only takes key= from Python 3.10, and we support 3.7
+    
+    def __init__(self, index, key):
+        self.index = index
+        self.key = key
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def __getitem__(self, i):
+        return self.key(self.index[i])
\ No newline at end of file
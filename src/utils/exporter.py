@@ -0,0 +1,85 @@
+import csv
+import os
+import threading
+from datetime import datetime
+
+class CSVExportWorker(threading.Thread):
+    """Background worker that streams detection records to a CSV file"""
+    
+    HEADERS = ["Timestamp", "Detection ID", "Latitude", "Longitude", "Range",
+               "Angle (°)", "Intensity", "Confidence", "Verified"]
+    
+    def __init__(self, records, filename, total=0):
+        super().__init__(daemon=True)
+        self.records = records
+        self.filename = filename
+        self.total = total
+        
+        # Read by the UI thread while the export runs
+        self.written = 0
+        self.error = None
+        self.finished = False
+        self._cancel = threading.Event()
+    
+    def cancel(self):
+        """Ask the worker to stop and discard the partial file"""
+        self._cancel.set()
+    
+    @property
+    def cancelled(self):
+        """Whether the export was cancelled"""
+        return self._cancel.is_set()
+    
+    def progress(self):
+        """Get export progress as a fraction between 0 and 1"""
+        if self.finished:
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(1.0, self.written / self.total)
+    
+    def format_row(self, detection):
+        """Format a detection record as a CSV row"""
+        verified = {True: "YES", False: "NO"}.get(detection.get("verified"), "")
+        return [
+            datetime.fromtimestamp(detection["timestamp"]).strftime("%Y-%m-%d %H:%M:%S"),
+            detection["id"],
+            f"{detection['latitude']:.6f}",
+            f"{detection['longitude']:.6f}",
+            detection["distance"],
+            detection["angle"],
+            f"{detection['intensity']:.2f}",
+            f"{detection['confidence']:.2f}",
+            verified
+        ]
+    
+    def run(self):
+        """Write records one row at a time so memory use stays constant"""
+        opened = False
+        try:
+            with open(self.filename, 'w', newline='', encoding='utf-8') as csvfile:
+                opened = True
+                writer = csv.writer(csvfile)
+                writer.writerow(self.HEADERS)
+                
+                for detection in self.records:
+                    if self._cancel.is_set():
+                        break
+                    writer.writerow(self.format_row(detection))
+                    self.written += 1
+            
+            if self._cancel.is_set():
+                self.remove_partial_file()
+        except Exception as e:
+            self.error = e
+            if opened:
+                self.remove_partial_file()
+        finally:
+            self.finished = True
+    
+    def remove_partial_file(self):
+        """Delete the file of an export that didn't finish"""
+        try:
+            os.remove(self.filename)
+        except OSError as e:
+            print(f"Error removing partial export {self.filename}: {e}")
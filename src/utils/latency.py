@@ -0,0 +1,112 @@
+import time
+import json
+import logging
+from collections import OrderedDict, deque
+from src.config import Config
+from src.utils.render_stats import RenderStats, rolling_file_logger
+from src.utils.metrics import METRICS
+
+# Pipeline stages, in the order a detection passes through them
+STAGES = ("ingest", "persist", "dequeue", "draw")
+
+logger = logging.getLogger(__name__)
+
+class LatencyTracker:
+    """Tracks detection-to-display latency through each pipeline stage"""
+    
+    def __init__(self, max_tracked=1000, window=500):
+        self.max_tracked = max_tracked
+        self.in_flight = OrderedDict()  # detection id -> {stage: wall clock time}
+        self.histograms = {stage: deque(maxlen=window) for stage in STAGES[1:]}
+        self.completed = 0
+        self.violations = 0
+        self.metrics_logger = None
+        
+        self.latency_histogram = METRICS.histogram(
+            "gilda_detection_latency_seconds", "Time from detection ingest to canvas draw"
+        )
+        self.violation_counter = METRICS.counter(
+            "gilda_latency_slo_violations_total", "Detections drawn later than the latency SLO"
+        )
+        METRICS.gauge("gilda_latency_in_flight", "Detections ingested but not yet drawn",
+                      func=lambda: len(self.in_flight))
+    
+    def stamp(self, detection_id, stage, when=None):
+        """Record the time a detection reached a pipeline stage"""
+        # Wall clock time, so stamps stay comparable when ingest runs in another process
+        when = time.time() if when is None else when
+        
+        if stage == "ingest":
+            self.in_flight[detection_id] = {"ingest": when}
+            if len(self.in_flight) > self.max_tracked:
+                self.in_flight.popitem(last=False)
+            return
+        
+        stamps = self.in_flight.get(detection_id)
+        if stamps is None or stage in stamps:
+            return  # Not tracked, or this stage was already reached
+        
+        stamps[stage] = when
+        self.histograms[stage].append((when - stamps["ingest"]) * 1000)
+        
+        if stage == "draw":
+            del self.in_flight[detection_id]
+            self.complete(detection_id, stamps)
+    
+    def complete(self, detection_id, stamps):
+        """Check a fully drawn detection against the SLO and record it"""
+        self.completed += 1
+        total_ms = (stamps["draw"] - stamps["ingest"]) * 1000
+        self.latency_histogram.observe(total_ms / 1000)
+        
+        if total_ms > Config.LATENCY_SLO_MS:
+            self.violations += 1
+            self.violation_counter.inc()
+            logger.warning(
+                f"Detection {detection_id} took {total_ms:.0f} ms to reach the display "
+                f"(SLO {Config.LATENCY_SLO_MS} ms)"
+            )
+        
+        record = {"id": detection_id, "total_ms": round(total_ms, 1)}
+        for stage in STAGES[1:]:
+            if stage in stamps:
+                record[f"{stage}_ms"] = round((stamps[stage] - stamps["ingest"]) * 1000, 1)
+        self.write_metrics(record)
+    
+    def write_metrics(self, record):
+        """Append a latency record to the rolling metrics file"""
+        try:
+            if self.metrics_logger is None:
+                self.metrics_logger = rolling_file_logger(
+                    "gilda.latency_metrics",
+                    Config.LATENCY_METRICS_FILE,
+                    Config.DEBUG_STATS_MAX_BYTES,
+                    Config.DEBUG_STATS_BACKUPS
+                )
+            
+            record["time"] = time.time()
+            self.metrics_logger.info(json.dumps(record))
+        except OSError as e:
+            print(f"Error writing latency metrics: {e}")
+    
+    def summary(self):
+        """Get latency percentiles since ingest for each stage"""
+        return {
+            "stages": {
+                stage: RenderStats.percentiles(samples)
+                for stage, samples in self.histograms.items()
+            },
+            "completed": self.completed,
+            "slo_violations": self.violations
+        }
+    
+    def format_summary(self):
+        """Format latency percentiles as overlay text"""
+        stats = self.summary()
+        lines = [f"Latency (SLO {Config.LATENCY_SLO_MS} ms, {stats['slo_violations']} over):"]
+        for stage, pct in stats["stages"].items():
+            lines.append(f"  ingest->{stage}: p50 {pct[50]:.0f} / p95 {pct[95]:.0f} / p99 {pct[99]:.0f} ms")
+        return "\n".join(lines)
+
+# Shared tracker used by the data layer and the pages
+LATENCY = LatencyTracker()
@@ -0,0 +1,89 @@
+import atexit
+import copy
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+
+# Listeners started by queued_handler, stopped at exit so queued records are flushed
+_listeners = []
+
+class JSONLineFormatter(logging.Formatter):
+    """Formats each log record as one JSON object per line"""
+    
+    def format(self, record):
+        entry = {
+            "time": record.created,
+            "asctime": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage()
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry)
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the traceback as its own field instead of folding it into the message"""
+    
+    exception_formatter = logging.Formatter()
+    
+    def prepare(self, record):
+        # Merge the arguments now, while they still hold their values at the time of the call
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        
+        # Render the traceback once here so the queued record doesn't keep the frames alive
+        if record.exc_info:
+            record.exc_text = record.exc_text or self.exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def _gzip_namer(name):
+    """Name rotated log files with a .gz suffix"""
+    return name + ".gz"
+
+def _gzip_rotator(source, dest):
+    """Compress a rotated log file"""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+def compressed_rotating_handler(log_file, max_bytes, backup_count):
+    """Create a size-rotated file handler that gzips the files it rotates out"""
+    log_dir = os.path.dirname(log_file)
+    if log_dir and not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+    
+    handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+    )
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    return handler
+
+def queued_handler(*handlers):
+    """Get a handler that passes records to `handlers` on a background thread"""
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    
+    # Records are formatted by the target handlers, so only the message is merged here
+    return _RecordQueueHandler(log_queue)
+
+def stop_listeners():
+    """Write out queued records and stop the background writers"""
+    while _listeners:
+        _listeners.pop().stop()
+
+atexit.register(stop_listeners)
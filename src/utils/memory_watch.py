@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+import tracemalloc
+from src.config import Config
+from src.utils.metrics import METRICS, current_rss_bytes
+from src.utils.audit import SYSTEM_USER
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+class MemoryWatch:
+    """Samples process memory, logs growth and enforces memory budgets with data retention"""
+    
+    def __init__(self, get_store):
+        self.get_store = get_store  # Returns the DataManager, or None if it isn't loaded yet
+        self.retention_days = Config.DATA_RETENTION_DAYS
+        self.start_rss = current_rss_bytes()
+        self.last_rss = self.start_rss
+        self.retention_rss = None  # RSS after the last budget-triggered retention
+        self.last_retention = None  # time.monotonic() of the last routine retention pass
+        self.over_warning = False
+        self.last_snapshot = None
+        self.last_snapshot_time = time.monotonic()
+        self.root = None
+        
+        self.retention_runs = METRICS.counter(
+            "gilda_memory_retention_runs_total", "Data retention passes triggered by the memory budget"
+        )
+        METRICS.gauge("gilda_memory_retention_days", "Days of detection history currently kept",
+                      func=lambda: self.retention_days)
+    
+    def start(self, root):
+        """Start periodic checks on the Tk thread, and tracemalloc if configured"""
+        self.root = root
+        if Config.MEMORY_TRACEMALLOC and not tracemalloc.is_tracing():
+            tracemalloc.start(Config.MEMORY_TRACE_FRAMES)
+            self.last_snapshot = tracemalloc.take_snapshot()
+        self.root.after(Config.MEMORY_CHECK_INTERVAL * 1000, self.check)
+    
+    def check(self):
+        """Sample RSS, apply retention and budgets, then reschedule"""
+        try:
+            rss = current_rss_bytes()
+            if rss is not None:
+                self.log_growth(rss)
+                self.enforce_budgets(rss)
+            else:
+                self.apply_retention()
+            
+            if tracemalloc.is_tracing() and \
+                    time.monotonic() - self.last_snapshot_time >= Config.MEMORY_SNAPSHOT_INTERVAL:
+                self.last_snapshot_time = time.monotonic()
+                threading.Thread(target=self.diff_allocations, name="memory-snapshot", daemon=True).start()
+        except Exception as e:
+            print(f"Error checking memory: {e}")
+        
+        self.root.after(Config.MEMORY_CHECK_INTERVAL * 1000, self.check)
+    
+    def log_growth(self, rss):
+        """Log RSS and its growth since startup and since the previous sample"""
+        since_last = rss - (self.last_rss or rss)
+        since_start = rss - (self.start_rss or rss)
+        self.last_rss = rss
+        
+        level = logging.INFO if since_last > Config.MEMORY_GROWTH_LOG_MB * MB else logging.DEBUG
+        logger.log(
+            level,
+            f"RSS {rss / MB:.1f} MB ({since_last / MB:+.1f} MB since last sample, "
+            f"{since_start / MB:+.1f} MB since start)"
+        )
+    
+    def enforce_budgets(self, rss):
+        """Warn above the soft budget; drop old history above the hard limit, and restore it below the budget"""
+        over_warning = rss > Config.MEMORY_WARN_MB * MB
+        if over_warning and not self.over_warning:
+            logger.warning(f"Memory use {rss / MB:.1f} MB is over the {Config.MEMORY_WARN_MB} MB budget")
+        self.over_warning = over_warning
+        
+        # Freed memory is not always returned to the OS, so only act again if RSS kept growing
+        if rss > Config.MEMORY_LIMIT_MB * MB and \
+                (self.retention_rss is None or rss > self.retention_rss * 1.05):
+            if self.retention_rss is not None:
+                self.retention_days = max(Config.MEMORY_MIN_RETENTION_DAYS, self.retention_days // 2)
+            logger.warning(
+                f"Memory use {rss / MB:.1f} MB is over the {Config.MEMORY_LIMIT_MB} MB limit; "
+                f"keeping {self.retention_days} days of detections"
+            )
+            self.retention_runs.inc()
+            self.apply_retention(force=True)
+            self.retention_rss = current_rss_bytes() or rss
+            return
+        
+        # Back under the soft budget: lengthen retention again, one step per check
+        if not over_warning and self.retention_days < Config.DATA_RETENTION_DAYS:
+            self.retention_days = min(Config.DATA_RETENTION_DAYS, self.retention_days * 2)
+            logger.info(
+                f"Memory use {rss / MB:.1f} MB is under the {Config.MEMORY_WARN_MB} MB budget; "
+                f"keeping {self.retention_days} days of detections"
+            )
+            if self.retention_days == Config.DATA_RETENTION_DAYS:
+                self.retention_rss = None
+        self.apply_retention()
+    
+    def apply_retention(self, force=False):
+        """Drop detections older than the retention window, if there are any"""
+        store = self.get_store()
+        if store is None:
+            return
+        
+        # The pass and its save of the data file run on the Tk thread, like every store write,
+        # so routine passes are spaced out; only the memory limit forces one sooner
+        now = time.monotonic()
+        if not force and self.last_retention is not None and \
+                now - self.last_retention < Config.MEMORY_RETENTION_INTERVAL:
+            return
+        self.last_retention = now
+        
+        cutoff = time.time() - self.retention_days * 86400
+        expired = store.count_detections_in_range(None, cutoff)
+        if expired:
+            logger.info(f"Dropping {expired} detections older than {self.retention_days} days")
+            store.clear_old_data(self.retention_days, user=SYSTEM_USER)
+        elif force:
+            logger.warning("No detections old enough to drop; memory is held elsewhere")
+    
+    def diff_allocations(self):
+        """Log the allocation sites that grew most since the previous tracemalloc snapshot"""
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        
+        if self.last_snapshot is not None:
+            stats = snapshot.compare_to(self.last_snapshot, "lineno")[:Config.MEMORY_TOP_ALLOCATORS]
+            lines = [f"Top allocation growth (traced {tracemalloc.get_traced_memory()[0] / MB:.1f} MB):"]
+            lines.extend(f"  {stat}" for stat in stats)
+            logger.info("\n".join(lines))
+        self.last_snapshot = snapshot
@@ -0,0 +1,273 @@
+import bisect
+import json
+import os
+import threading
+import time
+import weakref
+from src.config import Config
+
+# Histogram bucket upper bounds in seconds, suited to draw and save times
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+def current_rss_bytes():
+    """Get the resident set size of this process, or None where it can't be read"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def weak_callback(obj, func):
+    """Get a gauge callback reading func(obj) that doesn't keep obj alive; no sample once it is gone"""
+    ref = weakref.ref(obj)
+    
+    def read():
+        target = ref()
+        return None if target is None else func(target)
+    return read
+
+class Counter:
+    """A count that only goes up"""
+    
+    kind = "counter"
+    
+    def __init__(self):
+        self.value = 0
+    
+    def inc(self, amount=1):
+        """Add to the count"""
+        self.value += amount
+    
+    def samples(self, name):
+        return [(name, {}, self.value)]
+
+class Gauge:
+    """A value that can go up and down, or be read from a callback when collected"""
+    
+    kind = "gauge"
+    
+    def __init__(self):
+        self.value = 0
+        self.func = None
+    
+    def set(self, value):
+        """Set the current value"""
+        self.value = value
+    
+    def inc(self, amount=1):
+        self.value += amount
+    
+    def dec(self, amount=1):
+        self.value -= amount
+    
+    def samples(self, name):
+        if self.func is None:
+            return [(name, {}, self.value)]
+        try:
+            value = self.func()
+        except Exception:
+            return []  # A failing callback must not break the whole export
+        return [] if value is None else [(name, {}, value)]
+
+class Histogram:
+    """Distribution of observed values over fixed buckets"""
+    
+    kind = "histogram"
+    
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value):
+        """Record one observation"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def samples(self, name):
+        result = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            result.append((f"{name}_bucket", {"le": repr(float(bound))}, cumulative))
+        result.append((f"{name}_bucket", {"le": "+Inf"}, self.count))
+        result.append((f"{name}_sum", {}, self.sum))
+        result.append((f"{name}_count", {}, self.count))
+        return result
+
+def _escape_label(value):
+    """Escape a label value for the Prometheus text format"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels):
+    """Format a label set in Prometheus text syntax"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+class MetricsRegistry:
+    """Process-wide registry of named counters, gauges and histograms"""
+    
+    def __init__(self):
+        self.families = {}  # name -> {"type", "help", "children": {label key: metric}}
+        self.lock = threading.Lock()
+    
+    def _register(self, metric_class, name, help_text, labels, **kwargs):
+        """Get or create the metric for a name and label set"""
+        key = tuple(sorted((labels or {}).items()))
+        with self.lock:
+            family = self.families.setdefault(
+                name, {"type": metric_class.kind, "help": help_text, "children": {}}
+            )
+            if family["type"] != metric_class.kind:
+                raise ValueError(f"Metric {name} is already registered as a {family['type']}")
+            
+            metric = family["children"].get(key)
+            if metric is None:
+                metric = family["children"][key] = metric_class(**kwargs)
+            return metric
+    
+    def counter(self, name, help_text, labels=None):
+        """Get or create a counter"""
+        return self._register(Counter, name, help_text, labels)
+    
+    def gauge(self, name, help_text, labels=None, func=None):
+        """Get or create a gauge; `func` replaces any earlier callback"""
+        gauge = self._register(Gauge, name, help_text, labels)
+        if func is not None:
+            gauge.func = func
+        return gauge
+    
+    def histogram(self, name, help_text, labels=None, buckets=DEFAULT_BUCKETS):
+        """Get or create a histogram"""
+        return self._register(Histogram, name, help_text, labels, buckets=buckets)
+    
+    def collect(self):
+        """Get (name, type, help, samples) for every family, reading callback gauges now"""
+        with self.lock:
+            families = [
+                (name, family["type"], family["help"], list(family["children"].items()))
+                for name, family in sorted(self.families.items())
+            ]
+        
+        collected = []
+        for name, kind, help_text, children in families:
+            samples = []
+            for key, metric in children:
+                for sample_name, extra_labels, value in metric.samples(name):
+                    samples.append((sample_name, {**dict(key), **extra_labels}, value))
+            collected.append((name, kind, help_text, samples))
+        return collected
+    
+    def format_prometheus(self):
+        """Format all metrics in the Prometheus text exposition format"""
+        lines = []
+        for name, kind, help_text, samples in self.collect():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+    
+    def snapshot(self):
+        """Get all metrics as a JSON-serialisable dict"""
+        return {
+            "time": time.time(),
+            "metrics": {
+                name: {
+                    "type": kind,
+                    "samples": [
+                        {"name": sample_name, "labels": labels, "value": value}
+                        for sample_name, labels, value in samples
+                    ]
+                }
+                for name, kind, help_text, samples in self.collect()
+            }
+        }
+    
+    def write_snapshot(self, path):
+        """Write a snapshot file, replacing the previous one atomically"""
+        try:
+            log_dir = os.path.dirname(path)
+            if log_dir and not os.path.exists(log_dir):
+                os.makedirs(log_dir)
+            
+            temp_path = path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error writing metrics snapshot: {e}")
+
+class MetricsExporter:
+    """Serves the registry on localhost for scraping and writes periodic snapshot files"""
+    
+    def __init__(self, registry, port=None, snapshot_file=None, interval=Config.METRICS_SNAPSHOT_INTERVAL):
+        self.registry = registry
+        self.port = port if port is not None else Config.METRICS_PORT
+        self.snapshot_file = snapshot_file or Config.METRICS_SNAPSHOT_FILE
+        self.interval = interval
+        self.server = None
+        self.stopped = threading.Event()
+    
+    def start(self):
+        """Start the HTTP endpoint and snapshot writer threads"""
+        if self.port:
+            self.start_server()
+        
+        if self.snapshot_file and self.interval > 0:
+            threading.Thread(target=self.snapshot_loop, name="metrics-snapshot", daemon=True).start()
+    
+    def start_server(self):
+        """Serve /metrics on the loopback interface"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self.registry
+        
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                
+                body = registry.format_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass  # Scrapes would otherwise flood stderr
+        
+        try:
+            self.server = ThreadingHTTPServer(("127.0.0.1", self.port), MetricsHandler)
+        except OSError as e:
+            print(f"Error starting metrics endpoint on port {self.port}: {e}")
+            return
+        
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+    
+    def snapshot_loop(self):
+        """Write a snapshot every interval until stopped"""
+        while not self.stopped.wait(self.interval):
+            self.registry.write_snapshot(self.snapshot_file)
+    
+    def stop(self):
+        """Stop serving and write a final snapshot"""
+        self.stopped.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        if self.snapshot_file:
+            self.registry.write_snapshot(self.snapshot_file)
+
+# Shared registry; modules register their metrics on it at import or construction
+METRICS = MetricsRegistry()
+
+METRICS.gauge("gilda_process_resident_memory_bytes", "Resident memory of the UI process",
+              func=current_rss_bytes)
+METRICS.gauge("gilda_process_start_time_seconds", "Unix time the process started").set(time.time())
@@ -0,0 +1,66 @@
+import heapq
+import itertools
+import time
+from collections import deque
+from src.config import Config
+
+def _timestamp(detection):
+    return detection["timestamp"]
+
+class SensorNode:
+    """One sensor node: a bounded buffer of its latest detections and its heartbeat"""
+    
+    def __init__(self, node_id, capacity=Config.NODE_BUFFER_SIZE):
+        self.node_id = node_id
+        self.recent = deque(maxlen=capacity)  # Newest first; the oldest fall off the end
+        self.last_heartbeat = None  # time.monotonic() of the last sign of life
+    
+    def add(self, detection):
+        """Record a new detection from this node"""
+        self.recent.appendleft(detection)
+        self.heartbeat()
+    
+    def heartbeat(self, now=None):
+        """Record that the node is alive"""
+        self.last_heartbeat = time.monotonic() if now is None else now
+    
+    def discard(self, detection_id):
+        """Drop a detection from the buffer, if it is there"""
+        for detection in self.recent:
+            if detection["id"] == detection_id:
+                self.recent.remove(detection)
+                return
+    
+    def reset(self, detections):
+        """Refill the buffer with the newest of `detections`"""
+        newest = heapq.nlargest(self.recent.maxlen, detections, key=_timestamp)
+        self.recent.clear()
+        self.recent.extend(newest)
+    
+    def heartbeat_age(self, now=None):
+        """Get seconds since the last heartbeat, or None if the node hasn't been heard from"""
+        if self.last_heartbeat is None:
+            return None
+        return (time.monotonic() if now is None else now) - self.last_heartbeat
+    
+    def is_quiet(self, now=None):
+        """Whether the node has reported no detection for NODE_QUIET_AFTER seconds (wall-clock `now`)"""
+        if not self.recent:
+            return True
+        return (time.time() if now is None else now) - self.recent[0]["timestamp"] >= Config.NODE_QUIET_AFTER
+    
+    def health(self, now=None):
+        """Get the node's liveness as a StatusIndicator status; a quiet node is still active"""
+        age = self.heartbeat_age(now)
+        if age is None:
+            return "unknown"
+        if age < Config.NODE_HEARTBEAT_WARN:
+            return "active"
+        if age < Config.NODE_HEARTBEAT_TIMEOUT:
+            return "warning"
+        return "error"
+
+def merge_recent(nodes, limit):
+    """Get the newest `limit` detections across nodes by merging their newest-first buffers"""
+    merged = heapq.merge(*(node.recent for node in nodes), key=_timestamp, reverse=True)
+    return list(itertools.islice(merged, limit))
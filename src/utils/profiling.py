@@ -0,0 +1,127 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+from datetime import datetime
+from functools import wraps
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+class HotPathStats:
+    """Call counts and cumulative time of hot draw and update methods"""
+    
+    def __init__(self):
+        self.calls = {}
+        self.totals = {}  # name -> cumulative seconds
+    
+    def record(self, name, seconds):
+        """Count one call of a hot path"""
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+    
+    def reset(self):
+        """Start counting from zero"""
+        self.calls = {}
+        self.totals = {}
+    
+    def summary(self):
+        """Get per-method call counts and times, most expensive first"""
+        return [
+            {
+                "name": name,
+                "calls": self.calls[name],
+                "total_ms": self.totals[name] * 1000,
+                "mean_ms": self.totals[name] * 1000 / self.calls[name]
+            }
+            for name in sorted(self.totals, key=self.totals.get, reverse=True)
+        ]
+    
+    def format_summary(self):
+        """Format the hot path table as text"""
+        lines = [f"{'method':<40} {'calls':>8} {'total ms':>12} {'mean ms':>10}"]
+        for row in self.summary():
+            lines.append(
+                f"{row['name']:<40} {row['calls']:>8} {row['total_ms']:>12.1f} {row['mean_ms']:>10.3f}"
+            )
+        return "\n".join(lines)
+
+def hot_path(func):
+    """Decorator that counts calls and cumulative time of a draw or update method"""
+    name = func.__qualname__
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            HOT_PATHS.record(name, time.perf_counter() - start)
+    return wrapper
+
+class Profiler:
+    """cProfile session on the Tk thread that can be started and stopped at runtime"""
+    
+    def __init__(self, log_dir=None):
+        self.log_dir = log_dir  # Config.PROFILE_DIR if not given, read when a profile is saved
+        self.profile = None
+        self.started = None
+    
+    @property
+    def running(self):
+        """Whether a profile is being recorded"""
+        return self.profile is not None
+    
+    def start(self):
+        """Start recording a profile of the calling thread"""
+        if self.running:
+            return
+        
+        HOT_PATHS.reset()
+        self.profile = cProfile.Profile()
+        self.started = time.time()
+        self.profile.enable()
+        logger.info("Profiling started")
+    
+    def stop(self):
+        """Stop recording and dump the profile to the log directory"""
+        if not self.running:
+            return None
+        
+        self.profile.disable()
+        profile, self.profile = self.profile, None
+        
+        try:
+            log_dir = self.log_dir or Config.PROFILE_DIR
+            os.makedirs(log_dir, exist_ok=True)
+            path = os.path.join(log_dir, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            profile.dump_stats(path + ".prof")
+            
+            # Readable summary next to the binary dump, for when there is no pstats viewer at hand
+            text = io.StringIO()
+            stats = pstats.Stats(profile, stream=text)
+            stats.sort_stats("cumulative").print_stats(Config.PROFILE_TOP_FUNCTIONS)
+            with open(path + ".txt", 'w') as f:
+                f.write(f"Profiled {time.time() - self.started:.1f} s\n\n")
+                f.write("Hot paths:\n")
+                f.write(HOT_PATHS.format_summary() + "\n\n")
+                f.write(text.getvalue())
+        except OSError as e:
+            print(f"Error writing profile: {e}")
+            return None
+        
+        logger.info(f"Profile written to {path}.prof")
+        return path + ".prof"
+    
+    def toggle(self, event=None):
+        """Start profiling, or stop and dump the current profile"""
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+# Shared counters and profiler used by the pages and main.py
+HOT_PATHS = HotPathStats()
+PROFILER = Profiler()
@@ -0,0 +1,156 @@
+import time
+import json
+import logging
+import threading
+from collections import deque
+from functools import wraps
+from src.utils.log_pipeline import compressed_rotating_handler, queued_handler
+from src.utils.metrics import METRICS
+
+class RenderStats:
+    """Collects draw timings, frame rate and timer lateness for on-device profiling"""
+    
+    def __init__(self, window=240):
+        self.window = window
+        self.timings = {}
+        self.frames = {}  # surface name -> deque of frame times
+        self.frames_lock = threading.Lock()  # fps() is also read by the metrics exporter thread
+        self.lateness = deque(maxlen=window)
+        self.canvases = {}
+        self.file_logger = None
+    
+    def record(self, name, duration_ms):
+        """Record how long a draw or update call took"""
+        samples = self.timings.get(name)
+        if samples is None:
+            samples = self.timings[name] = deque(maxlen=self.window)
+        samples.append(duration_ms)
+    
+    def frame(self, surface):
+        """Mark that a frame was drawn on a surface (a canvas such as "radar" or "map")"""
+        with self.frames_lock:
+            frames = self.frames.get(surface)
+            if frames is None:
+                frames = self.frames[surface] = deque(maxlen=self.window)
+            frames.append(time.perf_counter())
+        
+        if len(frames) == 1:
+            METRICS.gauge("gilda_render_fps", "Frames drawn per second", labels={"surface": surface},
+                          func=lambda: self.fps(surface))
+    
+    def record_lateness(self, lateness_ms):
+        """Record how late an after() callback fired"""
+        self.lateness.append(max(0.0, lateness_ms))
+    
+    def register_canvas(self, name, canvas):
+        """Register a canvas whose item count should be reported"""
+        self.canvases[name] = canvas
+    
+    def after(self, widget, delay, callback):
+        """Schedule a callback with widget.after() and record its lateness"""
+        due = time.perf_counter() + delay / 1000.0
+        
+        def run():
+            self.record_lateness((time.perf_counter() - due) * 1000)
+            callback()
+        
+        return widget.after(delay, run)
+    
+    def fps(self, surface):
+        """Get frames drawn on a surface during the last second"""
+        cutoff = time.perf_counter() - 1.0
+        with self.frames_lock:
+            frames = list(self.frames.get(surface, ()))
+        return sum(1 for t in frames if t >= cutoff)
+    
+    @staticmethod
+    def percentiles(samples, points=(50, 95, 99)):
+        """Get nearest-rank percentiles of a sample window"""
+        if not samples:
+            return {p: 0.0 for p in points}
+        
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return {p: ordered[min(last, int(round(p / 100.0 * last)))] for p in points}
+    
+    def canvas_item_counts(self):
+        """Get the current number of items on each registered canvas"""
+        counts = {}
+        for name, canvas in self.canvases.items():
+            try:
+                counts[name] = len(canvas.find_all())
+            except Exception:
+                counts[name] = 0
+        return counts
+    
+    def summary(self):
+        """Get a snapshot of all collected statistics"""
+        with self.frames_lock:
+            surfaces = sorted(self.frames)
+        return {
+            "fps": {surface: self.fps(surface) for surface in surfaces},
+            "timings": {
+                name: self.percentiles(samples) for name, samples in self.timings.items()
+            },
+            "canvas_items": self.canvas_item_counts(),
+            "after_lateness": self.percentiles(self.lateness)
+        }
+    
+    def format_summary(self):
+        """Format the current statistics as overlay text"""
+        stats = self.summary()
+        fps = ", ".join(f"{surface} {count}" for surface, count in stats["fps"].items())
+        lines = [f"FPS: {fps or '-'}"]
+        
+        for name, pct in sorted(stats["timings"].items()):
+            lines.append(f"{name}: p50 {pct[50]:.1f} / p95 {pct[95]:.1f} / p99 {pct[99]:.1f} ms")
+        
+        items = ", ".join(f"{name} {count}" for name, count in stats["canvas_items"].items())
+        lines.append(f"Canvas items: {items or '-'}")
+        
+        late = stats["after_lateness"]
+        lines.append(f"after() late: p50 {late[50]:.1f} / p95 {late[95]:.1f} ms")
+        return "\n".join(lines)
+    
+    def write_snapshot(self, log_file, max_bytes, backup_count):
+        """Append the current statistics to a rolling JSON-lines file"""
+        if self.file_logger is None:
+            self.file_logger = rolling_file_logger(
+                "gilda.render_stats", log_file, max_bytes, backup_count
+            )
+        
+        snapshot = self.summary()
+        snapshot["time"] = time.time()
+        self.file_logger.info(json.dumps(snapshot))
+
+def rolling_file_logger(name, log_file, max_bytes, backup_count):
+    """Create a logger that writes bare messages to a size-rotated file off the calling thread"""
+    handler = compressed_rotating_handler(log_file, max_bytes, backup_count)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    file_logger = logging.getLogger(name)
+    file_logger.setLevel(logging.INFO)
+    file_logger.propagate = False
+    file_logger.addHandler(queued_handler(handler))
+    return file_logger
+
+# Shared collector used by all pages and the debug overlay
+RENDER_STATS = RenderStats()
+
+def timed(name):
+    """Decorator that records the duration of a draw or update method"""
+    def decorator(func):
+        histogram = METRICS.histogram("gilda_draw_duration_seconds", "Duration of draw and update methods",
+                                      labels={"method": name})
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                RENDER_STATS.record(name, elapsed * 1000)
+                histogram.observe(elapsed)
+        return wrapper
+    return decorator
@@ -0,0 +1,85 @@
+import logging
+import time
+from src.config import Config
+from src.utils.metrics import METRICS
+from src.utils.audit import AUDIT
+
+ACTIVE_SESSIONS = METRICS.gauge("gilda_active_sessions", "Operators currently logged in")
+EXPIRED_SESSIONS = METRICS.counter("gilda_sessions_expired_total", "Sessions ended by inactivity")
+
+logger = logging.getLogger(__name__)
+
+class SessionManager:
+    """The application's single operator session, expired by one scheduled Tk callback"""
+    
+    def __init__(self, root, on_expire=None, timeout=Config.SESSION_TIMEOUT,
+                 extend_throttle=Config.SESSION_EXTEND_THROTTLE):
+        self.root = root
+        self.on_expire = on_expire
+        self.timeout = timeout
+        self.extend_throttle = extend_throttle
+        
+        self.user = None
+        self.expires_at = None  # time.monotonic() deadline
+        self.last_extended = 0.0
+        self.expiry_id = None
+    
+    def start(self, user):
+        """Begin a session for a verified user"""
+        self.end()
+        self.user = user
+        self.extend(force=True)
+        self.schedule_expiry(self.timeout)
+        ACTIVE_SESSIONS.set(1)
+    
+    def end(self):
+        """End the session, if any"""
+        if self.expiry_id:
+            self.root.after_cancel(self.expiry_id)
+            self.expiry_id = None
+        if self.user:
+            ACTIVE_SESSIONS.set(0)
+        self.user = None
+        self.expires_at = None
+    
+    def is_active(self):
+        """Whether someone is logged in; expiry ends the session, so no clock read is needed"""
+        return self.user is not None
+    
+    def extend(self, now=None, force=False):
+        """Push the deadline back after activity, at most once per throttle interval"""
+        if self.user is None:
+            return
+        
+        now = time.monotonic() if now is None else now
+        if not force and now - self.last_extended < self.extend_throttle:
+            return
+        
+        # Only the deadline moves; the pending callback checks it when it fires
+        self.last_extended = now
+        self.expires_at = now + self.timeout
+    
+    def remaining(self):
+        """Get remaining session time in seconds"""
+        if self.user is None:
+            return 0
+        return max(0, self.expires_at - time.monotonic())
+    
+    def schedule_expiry(self, delay):
+        """Schedule the expiry check `delay` seconds from now"""
+        self.expiry_id = self.root.after(int(delay * 1000) + 1, self.check_expiry)
+    
+    def check_expiry(self):
+        """End the session if the deadline has passed, otherwise wait for the new deadline"""
+        self.expiry_id = None
+        remaining = self.remaining()
+        if remaining > 0:
+            self.schedule_expiry(remaining)
+            return
+        
+        logger.info(f"Session for {self.user} expired after {self.timeout} s without activity")
+        EXPIRED_SESSIONS.inc()
+        AUDIT.record("session_expired", user=self.user)
+        self.end()
+        if self.on_expire:
+            self.on_expire()
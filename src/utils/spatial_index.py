@@ -0,0 +1,93 @@
+import math
+
+class SpatialIndex:
+    """Uniform grid spatial index for hit-testing and viewport culling"""
+    
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        self.points = {}
+    
+    def __len__(self):
+        return len(self.points)
+    
+    def _cell(self, x, y):
+        """Get the grid cell key containing a point"""
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+    
+    def clear(self):
+        """Remove all points from the index"""
+        self.cells.clear()
+        self.points.clear()
+    
+    def insert(self, item_id, x, y):
+        """Insert or move a point in the index"""
+        if item_id in self.points:
+            self.remove(item_id)
+        
+        self.points[item_id] = (x, y)
+        self.cells.setdefault(self._cell(x, y), set()).add(item_id)
+    
+    def remove(self, item_id):
+        """Remove a point from the index"""
+        position = self.points.pop(item_id, None)
+        if position is None:
+            return False
+        
+        key = self._cell(*position)
+        bucket = self.cells.get(key)
+        if bucket is not None:
+            bucket.discard(item_id)
+            if not bucket:
+                del self.cells[key]
+        return True
+    
+    def get_position(self, item_id):
+        """Get the indexed position of a point"""
+        return self.points.get(item_id)
+    
+    def query(self, x1, y1, x2, y2):
+        """Get ids of all points inside the given rectangle"""
+        min_x, max_x = min(x1, x2), max(x1, x2)
+        min_y, max_y = min(y1, y2), max(y1, y2)
+        
+        col_start, row_start = self._cell(min_x, min_y)
+        col_end, row_end = self._cell(max_x, max_y)
+        
+        # Scan whichever is smaller: the covered cells or the occupied cells
+        covered = (col_end - col_start + 1) * (row_end - row_start + 1)
+        if covered > len(self.cells):
+            keys = [
+                key for key in self.cells
+                if col_start <= key[0] <= col_end and row_start <= key[1] <= row_end
+            ]
+        else:
+            keys = [
+                (col, row)
+                for col in range(col_start, col_end + 1)
+                for row in range(row_start, row_end + 1)
+            ]
+        
+        results = []
+        for key in keys:
+            for item_id in self.cells.get(key, ()):
+                x, y = self.points[item_id]
+                if min_x <= x <= max_x and min_y <= y <= max_y:
+                    results.append(item_id)
+        
+        return results
+    
+    def nearest(self, x, y, max_distance):
+        """Get the id of the closest point within max_distance, or None"""
+        best_id = None
+        best_distance = max_distance * max_distance
+        
+        for item_id in self.query(x - max_distance, y - max_distance,
+                                  x + max_distance, y + max_distance):
+            px, py = self.points[item_id]
+            distance = (px - x) ** 2 + (py - y) ** 2
+            if distance <= best_distance:
+                best_id = item_id
+                best_distance = distance
+        
+        return best_id
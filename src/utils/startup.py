@@ -0,0 +1,37 @@
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class StartupTimer:
+    """Breaks boot time down into named stages for the startup log"""
+    
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.stages = []  # (stage name, seconds spent in it)
+        self.reported = False
+    
+    def mark(self, stage):
+        """Record the time spent since the previous mark under a stage name"""
+        now = time.perf_counter()
+        self.stages.append((stage, now - self.last))
+        self.last = now
+    
+    def total(self):
+        """Get the time since the process started timing, in seconds"""
+        return self.last - self.start
+    
+    def report(self):
+        """Log the stage breakdown once startup has finished"""
+        if self.reported:
+            return
+        
+        self.reported = True
+        lines = [f"Startup took {self.total() * 1000:.0f} ms:"]
+        for stage, seconds in self.stages:
+            lines.append(f"  {stage}: {seconds * 1000:.1f} ms")
+        logger.info("\n".join(lines))
+
+# Created on first import, which main.py does before anything heavy
+STARTUP = StartupTimer()
@@ -0,0 +1,102 @@
+import time
+
+# Bin widths in seconds (days are local calendar days, so 23 or 25 hours across DST changes)
+# and how long each resolution is kept
+RESOLUTIONS = {
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400
+}
+
+# UTC offsets are whole quarter hours, so no block this long spans a local midnight
+DAY_LOOKUP_BLOCK = 900
+
+RETENTION = {
+    "minute": 2 * 86400,
+    "hour": 45 * 86400,
+    "day": 400 * 86400
+}
+
+class TimeBins:
+    """Detection counts per minute, hour and day, maintained as detections arrive"""
+    
+    def __init__(self):
+        self.bins = {name: {} for name in RESOLUTIONS}
+        self.days = {}  # DAY_LOOKUP_BLOCK number -> local_day() result, as localtime() is slow
+    
+    def local_day(self, timestamp):
+        """Get (start, end, UTC offset) of the local day holding a timestamp; no offset on DST-change days"""
+        block = int(timestamp // DAY_LOOKUP_BLOCK)
+        day = self.days.get(block)
+        if day is None:
+            local = time.localtime(timestamp)
+            start = int(time.mktime((local.tm_year, local.tm_mon, local.tm_mday, 0, 0, 0, 0, 0, -1)))
+            end = int(time.mktime((local.tm_year, local.tm_mon, local.tm_mday + 1, 0, 0, 0, 0, 0, -1)))
+            offset = time.localtime(start).tm_gmtoff
+            if time.localtime(end - 1).tm_gmtoff != offset:
+                offset = None
+            if len(self.days) >= 100000:
+                self.days.clear()
+            day = self.days[block] = (start, end, offset)
+        return day
+    
+    def bin_start(self, resolution, timestamp):
+        """Get the start of the bin holding a timestamp, aligned to local time"""
+        start, end, offset = self.local_day(timestamp)
+        if resolution == "day":
+            return start
+        if offset is None:
+            offset = time.localtime(timestamp).tm_gmtoff
+        width = RESOLUTIONS[resolution]
+        return int((timestamp + offset) // width) * width - offset
+    
+    def add(self, timestamp, count=1):
+        """Count a detection in every resolution"""
+        for name in RESOLUTIONS:
+            key = self.bin_start(name, timestamp)
+            bucket = self.bins[name]
+            bucket[key] = bucket.get(key, 0) + count
+    
+    def remove(self, timestamp):
+        """Uncount a deleted detection"""
+        for name in RESOLUTIONS:
+            key = self.bin_start(name, timestamp)
+            bucket = self.bins[name]
+            remaining = bucket.get(key, 0) - 1
+            if remaining > 0:
+                bucket[key] = remaining
+            else:
+                bucket.pop(key, None)
+    
+    def rebuild(self, detections):
+        """Recount all bins from scratch"""
+        self.bins = {name: {} for name in RESOLUTIONS}
+        for detection in detections:
+            self.add(detection["timestamp"])
+        self.prune()
+    
+    def prune(self, now=None):
+        """Drop bins older than each resolution's retention"""
+        now = time.time() if now is None else now
+        for name, bucket in self.bins.items():
+            cutoff = now - RETENTION[name]
+            for key in [k for k in bucket if k + RESOLUTIONS[name] <= cutoff]:
+                del bucket[key]
+    
+    @staticmethod
+    def resolution_for(span, max_bins=120):
+        """Get the finest resolution that covers a time span in at most max_bins bins"""
+        for name, width in RESOLUTIONS.items():
+            if span / width <= max_bins and span <= RETENTION[name]:
+                return name
+        return "day"
+    
+    def counts(self, resolution, start_time, end_time):
+        """Get (bin start, count) pairs for every bin overlapping a time range"""
+        bucket = self.bins[resolution]
+        counts = []
+        key = self.bin_start(resolution, start_time)
+        while key <= end_time:
+            counts.append((key, bucket.get(key, 0)))
+            key = self.local_day(key)[1] if resolution == "day" else key + RESOLUTIONS[resolution]
+        return counts
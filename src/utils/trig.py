@@ -0,0 +1,16 @@
+import math
+
+# Lookup tables indexed by whole degrees, so per-frame drawing never calls
+# math.radians/cos/sin. Angles grow clockwise on screen because canvas y
+# points down.
+TABLE_SIZE = 360
+COS_TABLE = tuple(math.cos(math.radians(angle)) for angle in range(TABLE_SIZE))
+SIN_TABLE = tuple(math.sin(math.radians(angle)) for angle in range(TABLE_SIZE))
+
+def polar_to_canvas(center_x, center_y, radius, angle):
+    """Convert a whole-degree polar position to canvas coordinates"""
+    index = int(angle) % TABLE_SIZE
+    return (
+        center_x + radius * COS_TABLE[index],
+        center_y + radius * SIN_TABLE[index]
+    )
@@ -0,0 +1,111 @@
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from src.config import Config
+from src.utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# Scheduling and instrumentation frames every page timer runs through; the callback is below them
+WRAPPER_FRAMES = {
+    ("render_stats.py", "run"),
+    ("render_stats.py", "wrapper"),
+    ("profiling.py", "wrapper"),
+    ("base_page.py", "_run_timer"),
+    ("base_page.py", "<lambda>"),
+}
+
+class StallWatchdog:
+    """Detects Tk mainloop stalls from a helper thread and logs what the loop was stuck in"""
+    
+    def __init__(self, root, interval_ms=Config.WATCHDOG_INTERVAL, threshold_ms=Config.WATCHDOG_STALL_MS):
+        self.root = root
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.main_thread_id = threading.get_ident()  # Created on the Tk thread
+        
+        # Written by the Tk thread, read by the helper thread
+        self.last_beat = time.monotonic()
+        self.stall_started = None
+        self.stopped = threading.Event()
+        
+        self.stalls = METRICS.counter("gilda_ui_stalls_total", "Times the Tk event loop stalled")
+        self.stall_seconds = METRICS.histogram("gilda_ui_stall_seconds", "Duration of Tk event loop stalls")
+        self.lateness = METRICS.histogram(
+            "gilda_ui_heartbeat_lateness_seconds", "How late the watchdog heartbeat ran on the Tk thread"
+        )
+    
+    def start(self):
+        """Start the heartbeat on the Tk thread and the monitor thread"""
+        self.last_beat = time.monotonic()
+        self.root.after(int(self.interval * 1000), self.beat)
+        threading.Thread(target=self.monitor, name="ui-watchdog", daemon=True).start()
+    
+    def stop(self):
+        """Stop monitoring"""
+        self.stopped.set()
+    
+    def beat(self):
+        """Heartbeat run by the Tk loop; records lateness and ends any stall in progress"""
+        now = time.monotonic()
+        previous, self.last_beat = self.last_beat, now  # Before clearing the stall, so it can't be re-reported
+        self.lateness.observe(max(0.0, now - previous - self.interval))
+        
+        stall_started = self.stall_started
+        if stall_started is not None:
+            self.stall_started = None
+            self.stall_seconds.observe(now - stall_started)
+            logger.warning(f"UI event loop recovered after {(now - stall_started) * 1000:.0f} ms")
+        
+        if not self.stopped.is_set():
+            self.root.after(int(self.interval * 1000), self.beat)
+    
+    def monitor(self):
+        """Watch the heartbeat and capture the Tk thread's stack when it stops beating"""
+        while not self.stopped.wait(self.threshold / 5):
+            last_beat = self.last_beat
+            if self.stall_started is None and time.monotonic() - last_beat > self.threshold:
+                self.stall_started = last_beat
+                self.stalls.inc()
+                self.report_stall(time.monotonic() - last_beat)
+    
+    def report_stall(self, elapsed):
+        """Log the Tk thread's current stack and the callback it is running"""
+        frame = sys._current_frames().get(self.main_thread_id)
+        if frame is None:
+            return
+        
+        stack = traceback.extract_stack(frame)
+        logger.warning(
+            f"UI event loop stalled for {elapsed * 1000:.0f} ms in {self.find_callback(stack)}\n"
+            + "".join(traceback.format_list(stack)).rstrip()
+        )
+    
+    @staticmethod
+    def find_callback(stack):
+        """Get the Tk callback at the bottom of a stack, or its innermost application frame"""
+        paths = [os.path.normpath(entry.filename).split(os.sep) for entry in stack]
+        
+        # Tk invokes Python callbacks through tkinter's CallWrapper.__call__ (and after()'s callit)
+        for i, entry in enumerate(stack):
+            if entry.name == "__call__" and "tkinter" in paths[i]:
+                frames = [
+                    (callback, path) for callback, path in zip(stack[i + 1:], paths[i + 1:])
+                    if "tkinter" not in path
+                ]
+                if not frames:
+                    break
+                
+                # Name the page callback, not the timer and timing wrappers around it
+                for callback, path in frames:
+                    if (path[-1], callback.name) not in WRAPPER_FRAMES:
+                        return f"{callback.name} ({callback.filename}:{callback.lineno})"
+                callback = frames[-1][0]
+                return f"{callback.name} ({callback.filename}:{callback.lineno})"
+        
+        app_frames = [entry for entry, path in zip(stack, paths) if "src" in path]
+        entry = app_frames[-1] if app_frames else stack[-1]
+        return f"{entry.name} ({entry.filename}:{entry.lineno})"
@@ -0,0 +1,42 @@
+import time
+import pytest
+from src.utils.data_manager import DataManager
+
+@pytest.fixture
+def store(tmp_path):
+    """An empty DataManager writing to a temporary file"""
+    path = tmp_path / "detections.json"
+    path.write_text("[]")
+    return DataManager(str(path))
+
+@pytest.fixture
+def make_detection():
+    """Factory for complete detection records"""
+    counter = iter(range(1, 1000000))
+    
+    def make(**fields):
+        number = next(counter)
+        detection = {
+            "id": f"DET_TEST_{number}",
+            "timestamp": time.time() - number,
+            "latitude": 28.6139,
+            "longitude": 77.2090,
+            "intensity": 0.5,
+            "confidence": 0.9,
+            "angle": 90,
+            "distance": 50,
+            "node_id": "NODE-1"
+        }
+        detection.update(fields)
+        return detection
+    return make
+
+@pytest.fixture
+def local_timezone(monkeypatch):
+    """Switch the process time zone for one test"""
+    def switch(name):
+        monkeypatch.setenv("TZ", name)
+        time.tzset()
+    yield switch
+    monkeypatch.undo()
+    time.tzset()
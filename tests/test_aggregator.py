@@ -0,0 +1,157 @@
+import json
+import socket
+from collections import deque
+import pytest
+from src.utils.aggregator import AggregatorServer, RemoteDataManager, _Client, parse_address
+
+class Display:
+    """One end of a socket pair registered with the server as a client connection"""
+    
+    def __init__(self, server):
+        self.server = server
+        self.peer, sock = socket.socketpair()
+        sock.setblocking(False)
+        self.client = _Client(sock)
+        server.clients[sock] = self.client
+        server.selector.register(sock, self.client.events, self.client)
+        self.buffer = b""
+    
+    def send(self, message):
+        line = message if isinstance(message, bytes) else json.dumps(message).encode()
+        self.server.handle(self.client, line)
+    
+    def receive(self):
+        """Get every message the server has written so far"""
+        self.peer.setblocking(False)
+        try:
+            while True:
+                data = self.peer.recv(65536)
+                if not data:
+                    break
+                self.buffer += data
+        except BlockingIOError:
+            pass
+        *lines, self.buffer = self.buffer.split(b"\n")
+        return [json.loads(line) for line in lines]
+
+@pytest.fixture
+def server(store):
+    server = AggregatorServer(store, address="127.0.0.1:0")
+    yield server
+    server.close()
+
+def subscribe(server, epoch=None, since=None):
+    display = Display(server)
+    display.send({"op": "subscribe", "epoch": epoch, "since": since})
+    return display
+
+def detection(**fields):
+    return {"latitude": 1.0, "longitude": 2.0, "intensity": 0.5, "confidence": 0.9,
+            "angle": 45, "distance": 30, **fields}
+
+def test_parse_address():
+    assert parse_address("127.0.0.1:7800") == (socket.AF_INET, ("127.0.0.1", 7800))
+    assert parse_address(":7800") == (socket.AF_INET, ("127.0.0.1", 7800))
+    assert parse_address("/run/gilda.sock") == (socket.AF_UNIX, "/run/gilda.sock")
+
+def test_tcp_only_listens_on_loopback(store):
+    with pytest.raises(ValueError):
+        AggregatorServer(store, address="0.0.0.0:0").listen()
+
+def test_new_display_gets_a_snapshot_then_deltas(server):
+    server.store.add_detection(detection())
+    display = subscribe(server)
+    
+    (snapshot,) = display.receive()
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["seq"] == 0
+    assert len(snapshot["detections"]) == 1
+    
+    sensor = Display(server)
+    sensor.send({"op": "add", "detection": detection(node_id="NODE-2")})
+    (delta,) = display.receive()
+    assert delta["type"] == "delta"
+    assert delta["seq"] == 1
+    assert delta["added"][0]["node_id"] == "NODE-2"
+    assert sensor.receive() == []  # Sensor links aren't subscribed
+
+def test_reconnect_resumes_with_missed_deltas(server):
+    first = subscribe(server)
+    epoch = first.receive()[0]["epoch"]
+    for _ in range(3):
+        server.publish(nodes={"NODE-1": 0.0})
+    
+    resumed = subscribe(server, epoch=epoch, since=1)
+    assert [(message["type"], message["seq"]) for message in resumed.receive()] == [("delta", 2), ("delta", 3)]
+
+def test_stale_resume_falls_back_to_a_snapshot(server):
+    server.history = deque(maxlen=2)
+    first = subscribe(server)
+    epoch = first.receive()[0]["epoch"]
+    for _ in range(5):
+        server.publish(nodes={"NODE-1": 0.0})
+    
+    assert subscribe(server, epoch=epoch, since=1).receive()[0]["type"] == "snapshot"
+    assert subscribe(server, epoch="other-run", since=4).receive()[0]["type"] == "snapshot"
+
+def test_bad_messages_get_errors_and_the_server_carries_on(server):
+    display = subscribe(server)
+    display.receive()
+    
+    for message in [b"not json", {"no_op": 1}, {"op": "add", "detection": "abc"},
+                    {"op": "add", "detection": detection(angle="north")}, {"op": "subscribe", "since": "1"},
+                    {"op": "update", "id": 5, "updates": {}}, {"op": "heartbeat", "node_id": 3},
+                    {"op": "shutdown"}]:
+        display.send(message)
+        replies = display.receive()
+        assert [reply["type"] for reply in replies] == ["error"], message
+    
+    display.send({"op": "add", "detection": detection()})
+    assert display.receive()[0]["type"] == "delta"
+
+def test_edits_are_published(server):
+    display = subscribe(server)
+    display.receive()
+    display.send({"op": "add", "detection": detection()})
+    detection_id = display.receive()[0]["added"][0]["id"]
+    
+    display.send({"op": "update", "id": detection_id, "updates": {"intensity": 0.9}})
+    assert display.receive()[0]["updated"][0]["intensity"] == 0.9
+    
+    display.send({"op": "delete", "id": detection_id})
+    assert display.receive()[0]["removed"] == [detection_id]
+    assert server.store.count_detections() == 0
+
+def test_replica_follows_the_server(server):
+    replica = RemoteDataManager(address="127.0.0.1:0")
+    sensor = Display(server)
+    sensor.send({"op": "add", "detection": detection(node_id="NODE-1")})
+    
+    display = subscribe(server)
+    replica.apply_snapshot(display.receive()[0])
+    
+    sensor.send({"op": "add", "detection": detection(node_id="NODE-2")})
+    sensor.send({"op": "heartbeat", "node_id": "NODE-3"})
+    first_id = server.store.detection_data[0]["id"]
+    sensor.send({"op": "update", "id": first_id, "updates": {"verified": True}})
+    sensor.send({"op": "delete", "id": server.store.detection_data[1]["id"]})
+    for delta in display.receive():
+        replica.apply_delta(delta)
+    
+    assert [d["id"] for d in replica.detection_data] == [first_id]
+    assert replica.get_detection_by_id(first_id)["verified"] is True
+    assert [node.node_id for node in replica.get_nodes()] == ["NODE-1", "NODE-2", "NODE-3"]
+    assert replica.get_node("NODE-3").health() == "active"
+    assert replica.count_detections_in_range() == 1
+
+def test_heartbeat_deltas_leave_the_replica_revision_alone(server):
+    replica = RemoteDataManager(address="127.0.0.1:0")
+    display = subscribe(server)
+    replica.apply_snapshot(display.receive()[0])
+    revision = replica.revision
+    
+    server.publish(nodes={"NODE-2": 0.0})
+    replica.apply_delta(display.receive()[0])
+    
+    assert replica.revision == revision
+    assert replica.get_node("NODE-2").health() == "active"
@@ -0,0 +1,66 @@
+from src.utils.alerts import AlertQueue, bearing_to_sector
+
+def test_bearing_to_sector():
+    assert [bearing_to_sector(angle) for angle in (0, 22, 23, 90, 180, 270, 337.4, 337.5, 359, 405)] == \
+        ["N", "N", "NE", "E", "S", "W", "NW", "N", "N", "NE"]
+
+def test_burst_in_one_sector_coalesces():
+    queue = AlertQueue(coalesce_window=3.0)
+    for i in range(5):
+        queue.push("GUNSHOT", f"shot {i}", key="sector NE", timestamp=100.0 + i * 0.5, label="gunshots")
+    queue.push("GUNSHOT", "other sector", key="sector S", timestamp=101.0, label="gunshots")
+    
+    assert len(queue) == 2
+    burst = queue.pop()
+    assert burst.count == 5
+    assert burst.display_details() == "5 × gunshots in 2 s (sector NE)\nshot 4"
+    assert queue.pop().display_details() == "other sector"
+
+def test_events_outside_the_window_start_a_new_alert():
+    queue = AlertQueue(coalesce_window=3.0)
+    queue.push("GUNSHOT", key="sector N", timestamp=100.0)
+    queue.push("GUNSHOT", key="sector N", timestamp=104.0)
+    queue.push("GUNSHOT", key=None, timestamp=104.5)
+    queue.push("GUNSHOT", key=None, timestamp=104.6)
+    
+    assert len(queue) == 4
+
+def test_label_defaults_to_a_neutral_word():
+    queue = AlertQueue()
+    queue.push("⚠ GUNSHOT DETECTED ⚠", key="sector E", timestamp=100.0)
+    alert = queue.push("⚠ GUNSHOT DETECTED ⚠", key="sector E", timestamp=101.0)
+    
+    assert alert.display_details() == "2 × alerts in 1 s (sector E)"
+
+def test_higher_priority_first_then_oldest():
+    queue = AlertQueue()
+    queue.push("low", priority=1, timestamp=100.0)
+    queue.push("high", priority=3, timestamp=101.0)
+    queue.push("also low", priority=1, timestamp=102.0)
+    
+    assert [queue.pop().message for _ in range(3)] == ["high", "low", "also low"]
+    assert queue.pop() is None
+
+def test_burst_takes_its_highest_priority():
+    queue = AlertQueue()
+    queue.push("routine", priority=2, timestamp=100.0)
+    queue.push("burst", priority=1, key="sector W", timestamp=100.0)
+    queue.push("burst", priority=3, key="sector W", timestamp=101.0)
+    
+    assert queue.pop().message == "burst"
+    assert queue.pop().message == "routine"
+    assert queue.pop() is None
+
+def test_full_queue_drops_the_lowest_priority_newest_alert():
+    queue = AlertQueue(max_pending=3)
+    queue.push("a", priority=2, timestamp=100.0)
+    queue.push("b", priority=1, timestamp=101.0)
+    queue.push("c", priority=1, key="sector N", timestamp=102.0)
+    queue.push("d", priority=3, timestamp=103.0)
+    
+    assert len(queue) == 3
+    assert queue.dropped == 1
+    assert [queue.pop().message for _ in range(3)] == ["d", "a", "b"]
+    
+    # The dropped alert's burst is gone too, so the next event starts afresh
+    assert queue.push("c", key="sector N", timestamp=102.5).count == 1
@@ -0,0 +1,58 @@
+import gzip
+import json
+import pytest
+from src.utils import archive
+from src.utils.data_manager import DataManager
+
+@pytest.fixture
+def other_store(tmp_path):
+    path = tmp_path / "other.json"
+    path.write_text("[]")
+    return DataManager(str(path))
+
+def test_round_trip_through_gzip(store, other_store, make_detection, tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "CHUNK_SIZE", 2)  # Exercise more than one chunk
+    store.merge_detections([make_detection(id=f"D{i}", timestamp=1000.0 + i) for i in range(5)])
+    path = str(tmp_path / "history.gz")
+    
+    assert archive.export_archive(store, path) == 5
+    assert other_store.merge_detections([make_detection(id="D0", timestamp=1000.0)]) == (1, 0, 0)
+    assert archive.import_archive(other_store, path) == (4, 1, 0)
+    assert [d["id"] for d in other_store.iter_detections()] == ["D0", "D1", "D2", "D3", "D4"]
+    assert other_store.get_detection_by_id("D3") == store.get_detection_by_id("D3")
+
+def test_export_honours_the_time_range(store, make_detection, tmp_path):
+    store.merge_detections([make_detection(timestamp=1000.0 + i) for i in range(5)])
+    path = str(tmp_path / "history.gz")
+    
+    assert archive.export_archive(store, path, 1001, 1003) == 3
+    assert sum(len(chunk) for chunk in archive.iter_archive(path)) == 3
+
+def test_malformed_records_are_counted_not_imported(other_store, make_detection, tmp_path):
+    path = str(tmp_path / "history.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"format": archive.ARCHIVE_FORMAT, "version": 1}) + "\n")
+        f.write(json.dumps(make_detection(id="good")) + "\n\n")
+        f.write(json.dumps({"id": "bad", "angle": "north"}) + "\n")
+    
+    assert archive.import_archive(other_store, path) == (1, 0, 1)
+    assert other_store.count_detections() == 1
+
+def test_rejects_files_that_are_not_archives(other_store, tmp_path):
+    foreign = str(tmp_path / "foreign.gz")
+    with gzip.open(foreign, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"format": "something-else"}) + "\n")
+    newer = str(tmp_path / "newer.gz")
+    with gzip.open(newer, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"format": archive.ARCHIVE_FORMAT, "version": archive.ARCHIVE_VERSION + 1}) + "\n")
+    
+    for path in (foreign, newer):
+        with pytest.raises(ValueError):
+            archive.import_archive(other_store, path)
+    assert other_store.count_detections() == 0
+
+def test_zst_needs_zstandard(store, tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "zstandard", None)
+    
+    with pytest.raises(RuntimeError):
+        archive.export_archive(store, str(tmp_path / "history.zst"))
@@ -0,0 +1,113 @@
+import json
+import pytest
+from src.utils import audit as audit_module
+from src.utils.audit import AuditLog, AuditReader, GENESIS_HASH
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "audit" / "audit.log")
+
+def write_records(path, actions, user="operator"):
+    """Record actions through a running log and wait for them to be written"""
+    log = AuditLog(path, flush_interval=0.05)
+    log.start()
+    for i, action in enumerate(actions):
+        log.record(action, user=user, index=i)
+    log.stop()
+    return log
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_records_are_chained(log_path):
+    write_records(log_path, ["login", "update_detection", "logout"])
+    records = read_lines(log_path)
+    
+    assert [record["seq"] for record in records] == [1, 2, 3]
+    assert records[0]["prev"] == GENESIS_HASH
+    assert records[1]["prev"] == records[0]["hash"]
+    assert records[2]["details"] == {"index": 2}
+    assert AuditReader(log_path).verify() is None
+
+def test_restart_continues_the_chain(log_path):
+    write_records(log_path, ["login"])
+    write_records(log_path, ["logout"])
+    records = read_lines(log_path)
+    
+    assert [record["seq"] for record in records] == [1, 2]
+    assert records[1]["prev"] == records[0]["hash"]
+    assert AuditReader(log_path).verify() is None
+
+def test_verify_finds_tampering(log_path):
+    write_records(log_path, ["login", "delete_detection", "logout"])
+    records = read_lines(log_path)
+    records[1]["details"]["index"] = 99
+    with open(log_path, "w", encoding="utf-8") as f:
+        f.write("".join(json.dumps(record) + "\n" for record in records))
+    
+    assert AuditReader(log_path).verify() == 2
+
+def test_reader_queries_by_user_and_time(log_path):
+    log = AuditLog(log_path)
+    log.start()
+    log.stop()
+    for i, user in enumerate(["admin", "operator", "admin", "guest"]):
+        log.write_batch([{"time": 100.0 + i, "user": user, "action": "login", "details": {}}])
+    
+    reader = AuditReader(log_path)
+    assert [record["seq"] for record in reader.query(user="admin")] == [1, 3]
+    assert [record["seq"] for record in reader.query(start_time=101, end_time=102)] == [2, 3]
+    
+    log.write_batch([{"time": 104.0, "user": "admin", "action": "logout", "details": {}}])
+    assert [record["action"] for record in reader.query(user="admin", start_time=102)] == ["login", "logout"]
+
+def test_torn_last_record_is_cut_off(log_path):
+    write_records(log_path, ["login", "logout"])
+    with open(log_path, "rb") as f:
+        complete = f.read()
+    with open(log_path, "ab") as f:
+        f.write(b'{"seq":3,"time":1')  # A crash in the middle of a write
+    
+    log = AuditLog(log_path)
+    seq, last_hash = log.read_chain_tail()
+    
+    assert (seq, last_hash) == (2, read_lines(log_path)[-1]["hash"])
+    with open(log_path, "rb") as f:
+        assert f.read() == complete
+
+def test_unreadable_log_starts_a_new_chain(log_path, tmp_path):
+    write_records(log_path, [])
+    with open(log_path, "wb") as f:
+        f.write(b"not json")
+    
+    assert AuditLog(log_path).read_chain_tail() == (0, GENESIS_HASH)
+
+def test_failed_batch_is_retried(log_path, monkeypatch):
+    real_fsync = audit_module.os.fsync
+    failures = [2]
+    
+    def flaky_fsync(fd):
+        if failures[0]:
+            failures[0] -= 1
+            raise OSError("disk full")
+        real_fsync(fd)
+    
+    monkeypatch.setattr(audit_module.os, "fsync", flaky_fsync)
+    write_records(log_path, ["login", "logout"])
+    
+    records = read_lines(log_path)
+    assert [(record["seq"], record["action"]) for record in records] == [(1, "login"), (2, "logout")]
+    assert AuditReader(log_path).verify() is None
+
+def test_log_path_is_read_from_config_when_started(tmp_path, monkeypatch):
+    log = AuditLog()
+    path = str(tmp_path / "display" / "audit.log")
+    monkeypatch.setattr(audit_module.Config, "AUDIT_LOG_FILE", path)
+    
+    log.start()
+    log.record("login", user="operator")
+    log.stop()
+    
+    assert [record["action"] for record in read_lines(path)] == ["login"]
+    assert AuditReader().path == path
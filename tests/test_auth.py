@@ -0,0 +1,114 @@
+import json
+import os
+import stat
+import pytest
+from src.utils import auth as auth_module
+from src.utils.auth import AuthManager, UserStoreError, DEFAULT_USERS
+
+ITERATIONS = 1000  # Keep the KDF cheap in tests
+
+class FakeSession:
+    def __init__(self):
+        self.user = None
+    
+    def start(self, user):
+        self.user = user
+
+class FakeClock:
+    """Stands in for the time module so tests control the cache expiry"""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def monotonic(self):
+        return self.now
+    
+    def perf_counter(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(auth_module, "time", clock)
+    return clock
+
+@pytest.fixture
+def users_file(tmp_path):
+    return str(tmp_path / "users.json")
+
+def make_auth(users_file, iterations=ITERATIONS):
+    return AuthManager(FakeSession(), users_file=users_file, iterations=iterations)
+
+def test_missing_store_is_created_with_hashed_defaults(users_file):
+    auth = make_auth(users_file)
+    
+    assert auth.verify_password("admin", DEFAULT_USERS["admin"])
+    with open(users_file) as f:
+        users = json.load(f)
+    assert sorted(users) == sorted(DEFAULT_USERS)
+    assert users["admin"]["algorithm"] == "pbkdf2_sha256"
+    assert users["admin"]["iterations"] == ITERATIONS
+    assert DEFAULT_USERS["admin"] not in json.dumps(users)
+    assert users["admin"]["salt"] != users["operator"]["salt"]
+    assert stat.S_IMODE(os.stat(users_file).st_mode) == 0o600
+
+def test_wrong_passwords_and_unknown_users_are_refused(users_file):
+    auth = make_auth(users_file)
+    
+    assert not auth.verify_password("admin", "admin124")
+    assert not auth.verify_password("nobody", "admin123")
+    assert not auth.authenticate("admin", "wrong")
+    assert auth.session.user is None
+    
+    assert auth.authenticate("operator", DEFAULT_USERS["operator"])
+    assert auth.session.user == "operator"
+
+def test_unreadable_store_refuses_logins_instead_of_resetting(users_file):
+    with open(users_file, "w") as f:
+        f.write("{not json")
+    auth = make_auth(users_file)
+    
+    with pytest.raises(UserStoreError):
+        auth.verify_password("admin", DEFAULT_USERS["admin"])
+    with open(users_file) as f:
+        assert f.read() == "{not json"
+
+def test_verified_logins_are_cached_until_the_ttl(users_file, clock, monkeypatch):
+    auth = make_auth(users_file)
+    assert auth.verify_password("admin", DEFAULT_USERS["admin"])
+    
+    hashed = []
+    original = auth._hash_password
+    monkeypatch.setattr(auth, "_hash_password", lambda *args: hashed.append(args) or original(*args))
+    
+    assert auth.verify_password("admin", DEFAULT_USERS["admin"])
+    assert hashed == []
+    assert not auth.verify_password("admin", "wrong")  # A cached login doesn't vouch for other passwords
+    assert len(hashed) == 1
+    
+    clock.now += auth_module.Config.AUTH_CACHE_TTL + 1
+    assert auth.verify_password("admin", DEFAULT_USERS["admin"])
+    assert len(hashed) == 2
+
+def test_set_password_drops_the_cached_login(users_file):
+    auth = make_auth(users_file)
+    assert auth.verify_password("guest", DEFAULT_USERS["guest"])
+    
+    auth.set_password("guest", "new-secret")
+    
+    assert not auth.verify_password("guest", DEFAULT_USERS["guest"])
+    assert make_auth(users_file).verify_password("guest", "new-secret")
+
+def test_older_hashes_are_migrated_to_the_current_cost(users_file):
+    make_auth(users_file, iterations=500).verify_password("admin", DEFAULT_USERS["admin"])
+    
+    auth = make_auth(users_file)
+    assert not auth.verify_password("admin", "wrong")
+    assert auth.users["admin"]["iterations"] == 500  # Only a verified password is rehashed
+    
+    assert auth.verify_password("admin", DEFAULT_USERS["admin"])
+    with open(users_file) as f:
+        users = json.load(f)
+    assert users["admin"]["iterations"] == ITERATIONS
+    assert users["operator"]["iterations"] == 500
+    assert make_auth(users_file).verify_password("admin", DEFAULT_USERS["admin"])
@@ -0,0 +1,89 @@
+from src.utils import data_manager as data_manager_module
+from src.utils.audit import SYSTEM_USER
+from src.utils.data_manager import check_detection
+
+def test_check_detection():
+    complete = {"latitude": 1, "longitude": 2, "intensity": 0.5, "confidence": 0.9, "angle": 10, "distance": 20}
+    
+    assert check_detection(complete) is None
+    assert check_detection("abc") == "detection must be an object"
+    assert check_detection({**complete, "angle": "north"}) == "angle must be a number"
+    assert check_detection({**complete, "verified": True, "intensity": True}) == "intensity must be a number"
+    assert check_detection({"latitude": 1}) == "longitude is missing"
+    assert check_detection({"latitude": 1}, partial=True) is None
+    assert check_detection({"id": "X"}, partial=True) == "id can't be changed"
+
+def test_merge_skips_duplicates_and_malformed_records(store, make_detection):
+    store.merge_detections([make_detection(id="A")])
+    records = [
+        make_detection(id="A"),
+        make_detection(id="B"),
+        make_detection(id="B"),
+        {"id": "C", "timestamp": 1.0},
+        make_detection(id=7),
+        make_detection(id="D", angle="north")
+    ]
+    
+    assert store.merge_detections(records) == (1, 2, 3)
+    assert sorted(d["id"] for d in store.detection_data) == ["A", "B"]
+
+def test_merge_leaves_store_untouched_when_reading_fails(store, make_detection):
+    store.merge_detections([make_detection(id="A")])
+    revision = store.revision
+    
+    def records():
+        yield make_detection(id="B")
+        raise ValueError("corrupt archive")
+    
+    try:
+        store.merge_detections(records())
+    except ValueError:
+        pass
+    assert [d["id"] for d in store.detection_data] == ["A"]
+    assert store.revision == revision
+
+def test_sort_indexes_follow_new_detections(store, make_detection):
+    store.merge_detections([make_detection(intensity=value / 10) for value in range(10)])
+    by_intensity = store.get_sort_index("intensity")
+    exporting = store.iter_detections()
+    
+    for value in (0.05, 0.95, 0.45):
+        store.add_detection(make_detection(intensity=value))
+    
+    index = store.get_sort_index("intensity")
+    assert [d["intensity"] for d in index] == sorted(d["intensity"] for d in store.detection_data)
+    assert len(by_intensity) == 10  # Lists already handed out are never changed
+    assert len(list(exporting)) == 10
+
+def test_new_detections_missing_the_sort_field_go_last(store, make_detection):
+    store.merge_detections([make_detection(distance=20), make_detection(distance=30)])
+    store.get_sort_index("distance")
+    
+    store.add_detection(make_detection(distance=None))
+    store.add_detection(make_detection(distance=10))
+    
+    assert [d["distance"] for d in store.get_sort_index("distance")] == [10, 20, 30, None]
+
+def test_descending_pages(store, make_detection):
+    store.merge_detections([make_detection(id=f"D{i}", timestamp=1000.0 + i) for i in range(25)])
+    
+    assert [d["id"] for d in store.get_detection_page(0, 3)] == ["D24", "D23", "D22"]
+    assert [d["id"] for d in store.get_detection_page(23, 5)] == ["D1", "D0"]
+    assert [d["id"] for d in store.get_detection_page(0, 2, descending=False)] == ["D0", "D1"]
+
+def test_time_range_queries(store, make_detection):
+    store.merge_detections([make_detection(timestamp=1000.0 + i * 10) for i in range(10)])
+    
+    assert store.count_detections_in_range(1020, 1050) == 4
+    assert [d["timestamp"] for d in store.iter_detections(1075, None)] == [1080.0, 1090.0]
+
+def test_clear_old_data_records_who_asked(store, make_detection, monkeypatch):
+    recorded = []
+    monkeypatch.setattr(data_manager_module.AUDIT, "record",
+                        lambda action, user=None, **details: recorded.append((action, user, details)))
+    store.merge_detections([make_detection(timestamp=1000.0), make_detection()])
+    
+    store.clear_old_data(30, user=SYSTEM_USER)
+    
+    assert recorded == [("clear_old_data", "system", {"days_to_keep": 30, "removed": 1})]
+    assert store.count_detections() == 1
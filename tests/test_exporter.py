@@ -0,0 +1,68 @@
+import csv
+import os
+from src.utils.exporter import CSVExportWorker
+
+def run_export(records, path, total=0):
+    worker = CSVExportWorker(records, str(path), total=total)
+    worker.start()
+    worker.join(timeout=5)
+    return worker
+
+def test_export_writes_every_record(store, make_detection, tmp_path):
+    store.merge_detections([make_detection(id=f"D{i}", timestamp=1000.0 + i, verified=i == 0) for i in range(3)])
+    path = tmp_path / "log.csv"
+    worker = run_export(store.iter_detections(), path, total=store.count_detections())
+    
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == CSVExportWorker.HEADERS
+    assert [row[1] for row in rows[1:]] == ["D0", "D1", "D2"]
+    assert rows[1][-1] == "YES"
+    assert (worker.written, worker.error, worker.progress()) == (3, None, 1.0)
+
+def test_total_matches_the_intensity_filter(store, make_detection):
+    store.merge_detections([make_detection(timestamp=1000.0 + i, intensity=i / 10) for i in range(10)])
+    
+    assert store.count_detections_in_range(1002, None, 0.5) == len(list(store.iter_detections(1002, None, 0.5))) == 5
+    assert store.count_detections_in_range(1002) == 8
+
+def test_cancelled_export_removes_the_file(make_detection, tmp_path):
+    path = tmp_path / "log.csv"
+    holder = {}
+    
+    def records():
+        for i in range(100):
+            if i == 10:
+                holder["worker"].cancel()
+            yield make_detection()
+    
+    worker = CSVExportWorker(records(), str(path))
+    holder["worker"] = worker
+    worker.start()
+    worker.join(timeout=5)
+    
+    assert worker.cancelled and worker.error is None
+    assert worker.written == 10
+    assert not path.exists()
+
+def test_failed_export_removes_the_partial_file(make_detection, tmp_path):
+    path = tmp_path / "log.csv"
+    
+    def records():
+        yield make_detection()
+        yield {"id": "broken"}
+    
+    worker = run_export(records(), path)
+    
+    assert isinstance(worker.error, KeyError)
+    assert worker.written == 1
+    assert not path.exists()
+
+def test_export_that_cannot_open_its_file_leaves_it_alone(tmp_path):
+    target = tmp_path / "existing"
+    target.mkdir()
+    
+    worker = run_export(iter([]), target)
+    
+    assert worker.error is not None
+    assert os.path.isdir(target)
@@ -0,0 +1,62 @@
+import json
+import logging
+import pytest
+from src.config import Config
+from src.utils.latency import LatencyTracker
+from src.utils.log_pipeline import stop_listeners
+
+@pytest.fixture
+def tracker(monkeypatch):
+    """A tracker whose completed records are kept in a list instead of written out"""
+    tracker = LatencyTracker(max_tracked=3)
+    tracker.records = []
+    monkeypatch.setattr(tracker, "write_metrics", tracker.records.append)
+    return tracker
+
+def test_stages_are_measured_from_ingest(tracker):
+    tracker.stamp("A", "ingest", 100.0)
+    tracker.stamp("A", "persist", 100.01)
+    tracker.stamp("A", "dequeue", 100.2)
+    tracker.stamp("A", "dequeue", 100.3)  # Only the first arrival counts
+    tracker.stamp("A", "draw", 100.5)
+    
+    assert tracker.records == [{"id": "A", "total_ms": 500.0, "persist_ms": 10.0, "dequeue_ms": 200.0, "draw_ms": 500.0}]
+    assert tracker.completed == 1 and tracker.in_flight == {}
+    assert list(tracker.histograms["dequeue"]) == [pytest.approx(200.0)]
+
+def test_untracked_and_evicted_detections_are_ignored(tracker):
+    tracker.stamp("never-ingested", "draw", 100.0)
+    for i in range(4):
+        tracker.stamp(f"D{i}", "ingest", 100.0 + i)
+    tracker.stamp("D0", "draw", 105.0)  # Evicted once more than max_tracked were in flight
+    
+    assert list(tracker.in_flight) == ["D1", "D2", "D3"]
+    assert tracker.records == [] and tracker.completed == 0
+
+def test_slow_detections_are_logged_as_slo_violations(tracker, caplog):
+    slo = Config.LATENCY_SLO_MS / 1000
+    with caplog.at_level(logging.WARNING, logger="src.utils.latency"):
+        tracker.stamp("fast", "ingest", 100.0)
+        tracker.stamp("fast", "draw", 100.0 + slo / 2)
+        tracker.stamp("slow", "ingest", 100.0)
+        tracker.stamp("slow", "draw", 100.0 + slo * 2)
+    
+    assert tracker.violations == 1
+    assert [record.getMessage().split()[1] for record in caplog.records] == ["slow"]
+    assert tracker.summary()["slo_violations"] == 1
+
+def test_records_are_appended_to_the_metrics_file(tmp_path, monkeypatch):
+    path = tmp_path / "latency_metrics.log"
+    monkeypatch.setattr(Config, "LATENCY_METRICS_FILE", str(path))
+    tracker = LatencyTracker()
+    try:
+        tracker.stamp("A", "ingest", 100.0)
+        tracker.stamp("A", "draw", 100.25)
+        stop_listeners()  # Flush the background writer
+    finally:
+        tracker.metrics_logger.handlers.clear()
+    
+    (line,) = path.read_text().splitlines()
+    record = json.loads(line)
+    assert (record["id"], record["total_ms"], record["draw_ms"]) == ("A", 250.0, 250.0)
+    assert "time" in record
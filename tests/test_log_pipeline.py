@@ -0,0 +1,68 @@
+import gzip
+import json
+import logging
+import os
+import sys
+import threading
+from src.utils.log_pipeline import JSONLineFormatter, compressed_rotating_handler, queued_handler, stop_listeners
+
+def make_record(message, *args, exc_info=None):
+    return logging.LogRecord("gilda.test", logging.ERROR, __file__, 1, message, args, exc_info)
+
+def test_rotated_files_are_gzipped(tmp_path):
+    log_file = str(tmp_path / "nested" / "app.log")
+    handler = compressed_rotating_handler(log_file, max_bytes=100, backup_count=2)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        for i in range(10):
+            handler.emit(make_record("line %d " + "x" * 40, i))
+    finally:
+        handler.close()
+    
+    assert sorted(os.listdir(tmp_path / "nested")) == ["app.log", "app.log.1.gz", "app.log.2.gz"]
+    with gzip.open(log_file + ".1.gz", "rt", encoding="utf-8") as f:
+        rotated = f.read().splitlines()
+    assert rotated[-1].startswith("line 7 ")
+    with open(log_file, encoding="utf-8") as f:
+        assert f.read().startswith("line 8 ")
+
+def test_json_lines_carry_the_traceback():
+    try:
+        raise ValueError("bad reading")
+    except ValueError:
+        record = make_record("failed on %s", "NODE-1", exc_info=sys.exc_info())
+    
+    entry = json.loads(JSONLineFormatter().format(record))
+    assert (entry["level"], entry["logger"], entry["message"]) == ("ERROR", "gilda.test", "failed on NODE-1")
+    assert "ValueError: bad reading" in entry["exception"]
+    assert "\n" not in JSONLineFormatter().format(record)
+
+class CollectingHandler(logging.Handler):
+    """Keeps formatted records with the thread that handled them"""
+    
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+    
+    def emit(self, record):
+        self.lines.append((self.format(record), threading.current_thread().name))
+
+def test_queued_records_keep_their_values_at_call_time():
+    target = CollectingHandler()
+    target.setFormatter(JSONLineFormatter())
+    handler = queued_handler(target)
+    
+    readings = [1, 2]
+    record = make_record("readings %s", readings)
+    handler.handle(record)
+    readings.append(3)
+    try:
+        raise KeyError("node")
+    except KeyError:
+        handler.handle(make_record("lookup failed", exc_info=sys.exc_info()))
+    stop_listeners()
+    
+    (first, first_thread), (second, _) = target.lines
+    assert json.loads(first)["message"] == "readings [1, 2]"
+    assert first_thread != threading.current_thread().name
+    assert "KeyError: 'node'" in json.loads(second)["exception"]
@@ -0,0 +1,102 @@
+import pytest
+from src.config import Config
+from src.utils import memory_watch
+from src.utils.audit import SYSTEM_USER
+from src.utils.memory_watch import MemoryWatch, MB
+
+class FakeStore:
+    """Records retention passes; always has expired detections to drop"""
+    
+    def __init__(self):
+        self.cleared = []
+    
+    def count_detections_in_range(self, start_time=None, end_time=None):
+        return 5
+    
+    def clear_old_data(self, days_to_keep=30, user=None):
+        self.cleared.append((days_to_keep, user))
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def watch(monkeypatch):
+    """A MemoryWatch over a fake store, with RSS set by the test"""
+    rss = {"bytes": 100 * MB}
+    clock = FakeClock()
+    monkeypatch.setattr(memory_watch, "current_rss_bytes", lambda: rss["bytes"])
+    monkeypatch.setattr(memory_watch.time, "monotonic", clock)
+    store = FakeStore()
+    watch = MemoryWatch(lambda: store)
+    watch.store, watch.rss, watch.clock = store, rss, clock
+    return watch
+
+def check(watch, rss_mb):
+    watch.rss["bytes"] = rss_mb * MB
+    watch.enforce_budgets(rss_mb * MB)
+
+def test_under_budget_runs_routine_retention_once_per_interval(watch):
+    check(watch, 100)
+    watch.clock.now += Config.MEMORY_RETENTION_INTERVAL / 2
+    check(watch, 100)
+    assert watch.store.cleared == [(Config.DATA_RETENTION_DAYS, SYSTEM_USER)]
+    
+    watch.clock.now += Config.MEMORY_RETENTION_INTERVAL
+    check(watch, 100)
+    assert len(watch.store.cleared) == 2
+
+def test_soft_budget_only_warns(watch, caplog):
+    check(watch, Config.MEMORY_WARN_MB + 1)
+    check(watch, Config.MEMORY_WARN_MB + 2)
+    
+    warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert watch.over_warning
+    assert len(warnings) == 1 and "budget" in warnings[0]
+    assert watch.retention_days == Config.DATA_RETENTION_DAYS
+
+def test_hard_limit_halves_retention_only_while_memory_keeps_growing(watch):
+    limit = Config.MEMORY_LIMIT_MB
+    check(watch, 100)
+    check(watch, limit + 10)  # Forced pass at the configured retention
+    assert watch.store.cleared[-1] == (Config.DATA_RETENTION_DAYS, SYSTEM_USER)
+    assert watch.retention_rss == (limit + 10) * MB
+    
+    check(watch, limit + 11)  # Within 5% of the last forced pass: no new pass
+    assert len(watch.store.cleared) == 2
+    assert watch.retention_days == Config.DATA_RETENTION_DAYS
+    
+    check(watch, (limit + 10) * 1.1)
+    assert watch.retention_days == Config.DATA_RETENTION_DAYS // 2
+    assert watch.store.cleared[-1] == (Config.DATA_RETENTION_DAYS // 2, SYSTEM_USER)
+
+def test_retention_never_drops_below_the_floor(watch):
+    rss = Config.MEMORY_LIMIT_MB + 1
+    for _ in range(20):
+        rss *= 1.1
+        check(watch, rss)
+    
+    assert watch.retention_days == Config.MEMORY_MIN_RETENTION_DAYS
+
+def test_retention_is_restored_below_the_budget(watch):
+    rss = Config.MEMORY_LIMIT_MB + 1
+    for _ in range(3):
+        rss *= 1.1
+        check(watch, rss)
+    assert watch.retention_days < Config.DATA_RETENTION_DAYS
+    
+    while watch.retention_days < Config.DATA_RETENTION_DAYS:
+        days = watch.retention_days
+        check(watch, 100)
+        assert watch.retention_days == min(Config.DATA_RETENTION_DAYS, days * 2)
+    assert watch.retention_rss is None
+
+def test_nothing_happens_before_the_store_loads(monkeypatch):
+    monkeypatch.setattr(memory_watch, "current_rss_bytes", lambda: (Config.MEMORY_LIMIT_MB + 1) * MB)
+    watch = MemoryWatch(lambda: None)
+    
+    watch.enforce_budgets((Config.MEMORY_LIMIT_MB + 1) * MB)
+    assert watch.last_retention is None
@@ -0,0 +1,99 @@
+import gc
+import json
+import socket
+import urllib.error
+import urllib.request
+import pytest
+from src.utils.metrics import MetricsRegistry, MetricsExporter, weak_callback
+
+def sample_lines(registry):
+    return [line for line in registry.format_prometheus().splitlines() if not line.startswith("#")]
+
+def test_counter_and_gauge_format():
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs run").inc(3)
+    registry.gauge("queue_depth", "Jobs waiting").set(7)
+    
+    text = registry.format_prometheus()
+    assert "# HELP jobs_total Jobs run\n# TYPE jobs_total counter\njobs_total 3\n" in text
+    assert "# TYPE queue_depth gauge\nqueue_depth 7\n" in text
+
+def test_labels_are_escaped_and_kept_apart():
+    registry = MetricsRegistry()
+    registry.counter("logins_total", "Logins", labels={"result": "success"}).inc()
+    registry.counter("logins_total", "Logins", labels={"result": 'bad "quote"\n'}).inc(2)
+    
+    assert sample_lines(registry) == [
+        'logins_total{result="success"} 1',
+        'logins_total{result="bad \\"quote\\"\\n"} 2'
+    ]
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("save_seconds", "Save time", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value)
+    
+    assert sample_lines(registry) == [
+        'save_seconds_bucket{le="0.1"} 1',
+        'save_seconds_bucket{le="1.0"} 3',
+        'save_seconds_bucket{le="+Inf"} 4',
+        'save_seconds_sum 6.05',
+        'save_seconds_count 4'
+    ]
+
+def test_kind_conflicts_are_rejected():
+    registry = MetricsRegistry()
+    registry.counter("things", "Things")
+    with pytest.raises(ValueError):
+        registry.gauge("things", "Things")
+
+def test_failing_callback_skips_only_its_sample():
+    registry = MetricsRegistry()
+    registry.gauge("broken", "Raises", func=lambda: 1 / 0)
+    registry.gauge("fine", "Works", func=lambda: 2)
+    
+    assert sample_lines(registry) == ["fine 2"]
+
+def test_weak_callback_does_not_keep_owner_alive():
+    class Owner:
+        items = [1, 2, 3]
+    
+    registry = MetricsRegistry()
+    owner = Owner()
+    registry.gauge("owned_items", "Items", func=weak_callback(owner, lambda o: len(o.items)))
+    assert sample_lines(registry) == ["owned_items 3"]
+    
+    del owner
+    gc.collect()
+    assert sample_lines(registry) == []
+
+def test_snapshot_file(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs run").inc()
+    path = tmp_path / "metrics" / "snapshot.json"
+    registry.write_snapshot(str(path))
+    
+    snapshot = json.loads(path.read_text())
+    assert snapshot["metrics"]["jobs_total"]["samples"] == [{"name": "jobs_total", "labels": {}, "value": 1}]
+
+def test_exporter_serves_metrics_on_loopback(tmp_path):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    
+    registry = MetricsRegistry()
+    registry.counter("jobs_total", "Jobs run").inc(5)
+    exporter = MetricsExporter(registry, port=port, snapshot_file=str(tmp_path / "m.json"), interval=0)
+    exporter.start()
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "jobs_total 5" in response.read().decode()
+        
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/other", timeout=5)
+    finally:
+        exporter.stop()
+    
+    assert (tmp_path / "m.json").exists()  # Final snapshot on stop
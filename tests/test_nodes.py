@@ -0,0 +1,78 @@
+import time
+from src.config import Config
+from src.utils.nodes import SensorNode, merge_recent
+
+def detection(detection_id, timestamp):
+    return {"id": detection_id, "timestamp": timestamp}
+
+def test_buffer_keeps_newest_first_within_capacity():
+    node = SensorNode("NODE-1", capacity=3)
+    for i in range(5):
+        node.add(detection(f"D{i}", 100 + i))
+    
+    assert [d["id"] for d in node.recent] == ["D4", "D3", "D2"]
+
+def test_reset_keeps_the_newest():
+    node = SensorNode("NODE-1", capacity=2)
+    node.reset([detection("old", 1), detection("newest", 30), detection("newer", 20)])
+    
+    assert [d["id"] for d in node.recent] == ["newest", "newer"]
+
+def test_discard():
+    node = SensorNode("NODE-1")
+    node.add(detection("A", 1))
+    node.add(detection("B", 2))
+    node.discard("A")
+    node.discard("missing")
+    
+    assert [d["id"] for d in node.recent] == ["B"]
+
+def test_merge_recent_across_nodes():
+    first = SensorNode("NODE-1")
+    second = SensorNode("NODE-2")
+    first.reset([detection("A1", 10), detection("A2", 40)])
+    second.reset([detection("B1", 20), detection("B2", 30)])
+    
+    assert [d["id"] for d in merge_recent([first, second], 3)] == ["A2", "B2", "B1"]
+
+def test_health_follows_heartbeat_age():
+    node = SensorNode("NODE-1")
+    assert node.health() == "unknown"
+    
+    node.heartbeat(now=1000.0)
+    assert node.health(now=1000.0 + Config.NODE_HEARTBEAT_WARN - 1) == "active"
+    assert node.health(now=1000.0 + Config.NODE_HEARTBEAT_WARN) == "warning"
+    assert node.health(now=1000.0 + Config.NODE_HEARTBEAT_TIMEOUT) == "error"
+
+def test_detections_count_as_heartbeats():
+    node = SensorNode("NODE-1")
+    node.add(detection("A", time.time()))
+    
+    assert node.health() == "active"
+
+def test_quiet_is_separate_from_health():
+    node = SensorNode("NODE-1")
+    node.add(detection("A", 5000.0))
+    node.heartbeat()
+    
+    assert not node.is_quiet(now=5000.0 + Config.NODE_QUIET_AFTER - 1)
+    assert node.is_quiet(now=5000.0 + Config.NODE_QUIET_AFTER)
+    assert node.health() == "active"
+
+def test_store_routes_detections_to_nodes(store, make_detection):
+    store.merge_detections([
+        make_detection(id="A", node_id="NODE-1", timestamp=100.0),
+        make_detection(id="B", node_id="NODE-2", timestamp=300.0),
+        make_detection(id="C", node_id="NODE-1", timestamp=200.0)
+    ])
+    
+    assert [node.node_id for node in store.get_nodes()] == ["NODE-1", "NODE-2"]
+    assert [d["id"] for d in store.get_recent(2)] == ["B", "C"]
+    
+    store.add_detection(make_detection(node_id="NODE-2"))
+    assert store.get_recent(1)[0]["node_id"] == "NODE-2"
+
+def test_local_node_heartbeat(store):
+    store.heartbeat_local_node()
+    
+    assert store.get_node(Config.DEFAULT_NODE_ID).health() == "active"
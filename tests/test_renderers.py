@@ -0,0 +1,98 @@
+import pytest
+from src.config import Config
+from src.components.renderers import RecordingCanvas, RadarRenderer, MapRenderer, intensity_color
+
+def items_of(canvas, kind):
+    return [item for item in canvas.items.values() if item["type"] == kind]
+
+def test_intensity_color_bands():
+    assert intensity_color(0.9) == Config.ERROR_COLOR
+    assert intensity_color(0.6) == Config.WARNING_COLOR
+    assert intensity_color(0.2) == Config.SUCCESS_COLOR
+
+def test_radar_draws_rings_spokes_and_sweep():
+    canvas = RecordingCanvas(400, 400)
+    RadarRenderer(canvas).draw([])
+    
+    assert len(items_of(canvas, "oval")) == 3
+    assert len(items_of(canvas, "line")) == 8 + 1  # Spokes plus the sweep line
+    assert len(canvas.find_withtag("sweep")) == 4  # Sweep line and three trail arcs
+
+def test_radar_places_points_by_bearing_and_range():
+    canvas = RecordingCanvas(400, 400)
+    points = [
+        {"angle": 90, "distance": 100, "intensity": 0.9},
+        {"angle": 0, "distance": 50, "intensity": 0.2}
+    ]
+    positions = RadarRenderer(canvas).draw(points)
+    
+    # Radius is 180 px around (200, 200); angles run clockwise from east, as on the canvas
+    assert positions[0] == pytest.approx((200, 380))
+    assert positions[1] == pytest.approx((290, 200))
+    
+    markers = items_of(canvas, "oval")[3:]
+    assert [marker["options"]["fill"] for marker in markers] == [Config.ERROR_COLOR, Config.SUCCESS_COLOR]
+    assert markers[0]["coords"] == pytest.approx([195, 375, 205, 385])
+
+def test_radar_redraw_replaces_previous_frame():
+    canvas = RecordingCanvas(400, 400)
+    renderer = RadarRenderer(canvas)
+    renderer.draw([{"angle": 10, "distance": 20, "intensity": 0.5}])
+    first = len(canvas.items)
+    renderer.draw([{"angle": 10, "distance": 20, "intensity": 0.5}])
+    
+    assert len(canvas.items) == first
+
+def test_radar_sweep_moves_existing_items():
+    canvas = RecordingCanvas(400, 400)
+    renderer = RadarRenderer(canvas)
+    renderer.draw([])
+    before = set(canvas.items)
+    canvas.reset_counts()
+    
+    renderer.update_sweep_items(90)
+    
+    assert set(canvas.items) == before
+    assert canvas.primitive_count() == 0
+    assert canvas.coords(renderer.sweep_line) == pytest.approx([200, 200, 200, 380])
+
+def test_radar_skips_unsized_canvas():
+    canvas = RecordingCanvas(1, 1)
+    renderer = RadarRenderer(canvas)
+    
+    assert renderer.draw([{"angle": 0, "distance": 10, "intensity": 0.5}]) == []
+    assert canvas.items == {}
+    renderer.update_sweep_items(45)  # No sweep to move
+
+def test_map_draws_detections_over_background():
+    canvas = RecordingCanvas(800, 600)
+    renderer = MapRenderer(canvas)
+    renderer.draw_background(800, 600)
+    background = len(canvas.items)
+    
+    renderer.draw_detection(100, 50, 0.95)
+    marker = canvas.items[max(canvas.items)]
+    
+    assert len(canvas.items) == background + 1
+    assert marker["type"] == "oval"
+    assert marker["coords"] == [94, 44, 106, 56]
+    assert marker["options"]["fill"] == Config.ERROR_COLOR
+
+def test_map_background_is_redrawn_not_stacked():
+    canvas = RecordingCanvas(800, 600)
+    renderer = MapRenderer(canvas)
+    renderer.draw_background(800, 600)
+    first = len(canvas.items)
+    renderer.draw_background(800, 600)
+    
+    assert len(canvas.items) == first
+
+def test_map_node_marker_follows_given_position():
+    canvas = RecordingCanvas(800, 600)
+    MapRenderer(canvas).draw_positions(150, 120)
+    
+    node = items_of(canvas, "oval")[0]
+    assert node["coords"] == [138, 108, 162, 132]
+    assert node["options"]["fill"] == Config.SUCCESS_COLOR
+    labels = [item["options"]["text"] for item in items_of(canvas, "text")]
+    assert "NODE" in labels and "ENEMY LOC" in labels
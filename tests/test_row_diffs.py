@@ -0,0 +1,100 @@
+from src.components.widgets import DataTable
+
+class FakeTree:
+    """Stands in for a ttk.Treeview, keeping rows as an ordered list of (iid, values)"""
+    
+    def __init__(self):
+        self.rows = []
+    
+    def get_children(self, item=""):
+        return tuple(iid for iid, _ in self.rows)
+    
+    def exists(self, iid):
+        return iid in self.get_children()
+    
+    def insert(self, parent, index, iid=None, values=()):
+        index = len(self.rows) if index == "end" else index
+        self.rows.insert(index, (iid, values))
+    
+    def delete(self, *iids):
+        self.rows = [row for row in self.rows if row[0] not in iids]
+    
+    def item(self, iid, values=None):
+        self.rows = [(row_iid, values if row_iid == iid else row_values) for row_iid, row_values in self.rows]
+    
+    def set_children(self, item, *iids):
+        values = dict(self.rows)
+        self.rows = [(iid, values[iid]) for iid in iids]
+
+def make_table():
+    """A DataTable patching a fake tree, so the diff logic runs without a display"""
+    table = DataTable.__new__(DataTable)
+    table.tree = FakeTree()
+    return table
+
+def test_first_diff_adds_every_row(store, make_detection):
+    store.merge_detections([make_detection(id="A", timestamp=100.0), make_detection(id="B", timestamp=200.0)])
+    diff = store.get_recent_detection_diff()
+    
+    assert [(position, row_id) for position, row_id, _ in diff["added"]] == [(0, "B"), (1, "A")]
+    assert diff["removed"] == [] and diff["changed"] == []
+    assert list(diff["snapshot"]) == ["B", "A"]
+
+def test_unchanged_rows_are_not_reformatted(store, make_detection, monkeypatch):
+    store.merge_detections([make_detection(id="A"), make_detection(id="B")])
+    snapshot = store.get_recent_detection_diff()["snapshot"]
+    
+    formatted = []
+    monkeypatch.setattr(store, "format_recent_row", lambda d: formatted.append(d["id"]) or d["id"])
+    diff = store.get_recent_detection_diff(snapshot)
+    
+    assert (diff["added"], diff["removed"], diff["changed"]) == ([], [], [])
+    assert formatted == []
+
+def test_diff_reports_updates_and_removals(store, make_detection):
+    store.merge_detections([make_detection(id="A", intensity=0.5), make_detection(id="B")])
+    snapshot = store.get_recent_detection_diff()["snapshot"]
+    
+    store.update_detection("A", {"intensity": 0.9})
+    store.delete_detection("B")
+    diff = store.get_recent_detection_diff(snapshot)
+    
+    assert diff["removed"] == ["B"]
+    assert [row_id for row_id, _ in diff["changed"]] == ["A"]
+    assert "Int: 0.9" in diff["changed"][0][1]
+
+def test_map_diff_follows_the_time_range(store, make_detection):
+    store.merge_detections([make_detection(id=f"D{i}", timestamp=1000.0 + i * 100) for i in range(5)])
+    snapshot = store.get_map_detection_diff(time_range=(1000, 1250))["snapshot"]
+    assert list(snapshot) == ["D2", "D1", "D0"]
+    
+    diff = store.get_map_detection_diff(snapshot, time_range=(1150, 1400))
+    assert diff["removed"] == ["D1", "D0"]
+    assert [(position, row_id) for position, row_id, _ in diff["added"]] == [(0, "D4"), (1, "D3")]
+
+def test_table_follows_the_store(store, make_detection):
+    store.merge_detections([make_detection(id=f"D{i}", timestamp=1000.0 + i) for i in range(3)])
+    table = make_table()
+    
+    diff = store.get_recent_detection_diff()
+    table.apply_diff(diff)
+    assert table.tree.get_children() == ("D2", "D1", "D0")
+    
+    store.delete_detection("D1")
+    store.merge_detections([make_detection(id="D3", timestamp=1003.0)])
+    diff = store.get_recent_detection_diff(diff["snapshot"])
+    table.apply_diff(diff)
+    assert table.tree.get_children() == ("D3", "D2", "D0")
+    assert table.tree.rows[0][1] == (store.format_recent_row(store.get_detection_by_id("D3")),)
+
+def test_table_moves_rows_whose_position_changed(store, make_detection):
+    store.merge_detections([make_detection(id=f"D{i}", timestamp=1000.0 + i) for i in range(3)])
+    table = make_table()
+    diff = store.get_recent_detection_diff()
+    table.apply_diff(diff)
+    
+    store.update_detection("D0", {"timestamp": 2000.0})
+    diff = store.get_recent_detection_diff(diff["snapshot"])
+    table.apply_diff(diff)
+    
+    assert table.tree.get_children() == ("D0", "D2", "D1")
@@ -0,0 +1,110 @@
+import pytest
+from src.utils import session as session_module
+from src.utils.session import SessionManager, ACTIVE_SESSIONS, EXPIRED_SESSIONS
+
+class FakeClock:
+    """Stands in for the time module so tests control time.monotonic()"""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def monotonic(self):
+        return self.now
+
+class FakeRoot:
+    """Records after() callbacks instead of running a Tk event loop"""
+    
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+    
+    def after(self, delay, callback):
+        self.next_id += 1
+        self.pending[self.next_id] = (delay, callback)
+        return self.next_id
+    
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+    
+    def fire(self):
+        """Run the scheduled callbacks, as Tk would once their delay has passed"""
+        pending, self.pending = self.pending, {}
+        for _, callback in pending.values():
+            callback()
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(session_module, "time", clock)
+    return clock
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+def test_start_and_end(clock, root):
+    session = SessionManager(root, timeout=60, extend_throttle=5)
+    session.start("operator")
+    
+    assert session.is_active()
+    assert session.remaining() == 60
+    assert ACTIVE_SESSIONS.value == 1
+    assert [delay for delay, _ in root.pending.values()] == [60001]
+    
+    session.end()
+    assert not session.is_active()
+    assert session.remaining() == 0
+    assert ACTIVE_SESSIONS.value == 0
+    assert root.pending == {}
+
+def test_extend_is_throttled(clock, root):
+    session = SessionManager(root, timeout=60, extend_throttle=5)
+    session.start("operator")
+    
+    clock.now += 2
+    session.extend()
+    assert session.remaining() == 58  # Within the throttle interval
+    
+    clock.now += 4
+    session.extend()
+    assert session.remaining() == 60
+    
+    clock.now += 1
+    session.extend(force=True)
+    assert session.remaining() == 60
+
+def test_activity_postpones_expiry_without_rescheduling(clock, root):
+    expired = []
+    session = SessionManager(root, on_expire=lambda: expired.append(True), timeout=60, extend_throttle=5)
+    session.start("operator")
+    
+    clock.now += 30
+    session.extend()
+    assert len(root.pending) == 1  # The deadline moved, the callback did not
+    
+    clock.now += 30
+    root.fire()
+    assert session.is_active()
+    assert [delay for delay, _ in root.pending.values()] == [30001]
+    
+    clock.now += 30
+    before = EXPIRED_SESSIONS.value
+    root.fire()
+    assert not session.is_active()
+    assert expired == [True]
+    assert EXPIRED_SESSIONS.value == before + 1
+
+def test_extend_without_session_does_nothing(clock, root):
+    session = SessionManager(root, timeout=60)
+    session.extend(force=True)
+    
+    assert not session.is_active()
+    assert session.expires_at is None
+
+def test_restart_replaces_pending_expiry(clock, root):
+    session = SessionManager(root, timeout=60)
+    session.start("operator")
+    session.start("admin")
+    
+    assert session.user == "admin"
+    assert len(root.pending) == 1
@@ -0,0 +1,48 @@
+from src.utils.spatial_index import SpatialIndex
+
+def make_index():
+    index = SpatialIndex(cell_size=10)
+    for item_id, x, y in [("a", 1, 1), ("b", 9.5, 9.5), ("c", 10, 10), ("d", -5, 25), ("e", 95, 95)]:
+        index.insert(item_id, x, y)
+    return index
+
+def test_query_returns_points_inside_the_rectangle():
+    index = make_index()
+    
+    assert sorted(index.query(0, 0, 10, 10)) == ["a", "b", "c"]
+    assert sorted(index.query(10, 10, 0, 0)) == ["a", "b", "c"]  # Corners in either order
+    assert sorted(index.query(-10, 20, 0, 30)) == ["d"]
+    assert index.query(40, 40, 50, 50) == []
+
+def test_query_wider_than_the_occupied_cells():
+    index = make_index()
+    
+    assert sorted(index.query(-1e6, -1e6, 1e6, 1e6)) == ["a", "b", "c", "d", "e"]
+
+def test_nearest_within_distance():
+    index = make_index()
+    
+    assert index.nearest(9, 9, 2) == "b"
+    assert index.nearest(11, 11, 2) == "c"
+    assert index.nearest(50, 50, 5) is None
+
+def test_insert_moves_an_existing_point():
+    index = make_index()
+    index.insert("a", 95, 96)
+    
+    assert len(index) == 5
+    assert index.get_position("a") == (95, 96)
+    assert sorted(index.query(90, 90, 100, 100)) == ["a", "e"]
+    assert index.query(0, 0, 5, 5) == []
+
+def test_remove_and_clear():
+    index = make_index()
+    
+    assert index.remove("e") is True
+    assert index.remove("e") is False
+    assert index.get_position("e") is None
+    assert (9, 9) not in index.cells  # Empty cells are dropped
+    
+    index.clear()
+    assert len(index) == 0
+    assert index.query(-1e6, -1e6, 1e6, 1e6) == []
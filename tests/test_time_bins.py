@@ -0,0 +1,92 @@
+import time
+from datetime import datetime
+from src.utils.time_bins import TimeBins, RETENTION
+
+def test_add_counts_every_resolution():
+    bins = TimeBins()
+    bins.add(1000030)
+    bins.add(1000050)
+    
+    assert sum(bins.bins["minute"].values()) == 2
+    assert sum(bins.bins["hour"].values()) == 2
+    assert sum(bins.bins["day"].values()) == 2
+
+def test_remove_drops_empty_bins():
+    bins = TimeBins()
+    bins.add(1000030)
+    bins.add(1000030)
+    bins.remove(1000030)
+    assert sum(bins.bins["minute"].values()) == 1
+    
+    bins.remove(1000030)
+    assert all(not bucket for bucket in bins.bins.values())
+
+def test_counts_fill_empty_bins():
+    bins = TimeBins()
+    start = 1200000
+    bins.add(start + 5)
+    bins.add(start + 125)
+    
+    counts = bins.counts("minute", start, start + 179)
+    assert [count for _, count in counts] == [1, 0, 1]
+    assert [key - counts[0][0] for key, _ in counts] == [0, 60, 120]
+
+def test_day_bins_start_at_local_midnight(local_timezone):
+    local_timezone("Asia/Kolkata")
+    bins = TimeBins()
+    noon = datetime(2024, 5, 10, 12, 0).timestamp()
+    bins.add(noon)
+    bins.add(datetime(2024, 5, 10, 23, 59).timestamp())
+    bins.add(datetime(2024, 5, 11, 0, 1).timestamp())
+    
+    days = bins.counts("day", noon, noon + 86400)
+    assert [(datetime.fromtimestamp(key).strftime("%d %H:%M"), count) for key, count in days] == [
+        ("10 00:00", 2), ("11 00:00", 1)
+    ]
+
+def test_hour_bins_follow_half_hour_offsets(local_timezone):
+    local_timezone("Asia/Kolkata")
+    bins = TimeBins()
+    bins.add(datetime(2024, 5, 10, 9, 45).timestamp())
+    
+    (key,) = bins.bins["hour"]
+    assert datetime.fromtimestamp(key).strftime("%H:%M") == "09:00"
+
+def test_day_bins_span_dst_changes(local_timezone):
+    local_timezone("America/New_York")
+    bins = TimeBins()
+    start = datetime(2024, 11, 3, 0, 30).timestamp()  # Clocks go back at 02:00
+    for hour in range(26):
+        bins.add(start + hour * 3600)
+    
+    # The day has 25 hours, so only the 26th hourly detection falls on the next day
+    days = bins.counts("day", start, start + 25 * 3600)
+    assert [count for _, count in days] == [25, 1]
+    assert days[1][0] - days[0][0] == 25 * 3600
+
+def test_prune_drops_expired_bins():
+    bins = TimeBins()
+    now = time.time()
+    bins.add(now - RETENTION["minute"] - 3600)
+    bins.add(now)
+    bins.prune(now)
+    
+    assert sum(bins.bins["minute"].values()) == 1
+    assert sum(bins.bins["hour"].values()) == 2
+
+def test_resolution_for_keeps_bins_bounded():
+    assert TimeBins.resolution_for(3600) == "minute"
+    assert TimeBins.resolution_for(86400) == "hour"
+    assert TimeBins.resolution_for(30 * 86400) == "day"
+
+def test_rebuild_matches_incremental_adds():
+    timestamps = [1000000 + i * 997 for i in range(500)]
+    incremental = TimeBins()
+    for timestamp in reversed(timestamps):
+        incremental.add(timestamp)
+    
+    rebuilt = TimeBins()
+    rebuilt.rebuild([{"timestamp": timestamp} for timestamp in timestamps])
+    rebuilt_bins = {name: dict(bucket) for name, bucket in rebuilt.bins.items()}
+    incremental.prune()
+    assert rebuilt_bins == {name: dict(bucket) for name, bucket in incremental.bins.items()}
@@ -0,0 +1,49 @@
+from traceback import FrameSummary
+from src.utils.watchdog import StallWatchdog
+
+TKINTER = "/usr/lib/python3/tkinter/__init__.py"
+APP = "/opt/gilda/src"
+
+def frame(filename, name, lineno=1):
+    return FrameSummary(filename, lineno, name, line="")
+
+def test_names_the_page_callback_under_the_timer_wrappers():
+    stack = [
+        frame(f"{APP}/main.py", "main"),
+        frame(TKINTER, "mainloop"),
+        frame(TKINTER, "__call__"),
+        frame(TKINTER, "callit"),
+        frame(f"{APP}/pages/base_page.py", "_run_timer"),
+        frame(f"{APP}/utils/profiling.py", "wrapper"),
+        frame(f"{APP}/utils/render_stats.py", "wrapper"),
+        frame(f"{APP}/pages/radar_page.py", "update_radar", 210),
+        frame(f"{APP}/utils/data_manager.py", "get_recent_detections"),
+    ]
+    
+    assert StallWatchdog.find_callback(stack) == f"update_radar ({APP}/pages/radar_page.py:210)"
+
+def test_falls_back_to_the_innermost_wrapper():
+    stack = [
+        frame(TKINTER, "__call__"),
+        frame(f"{APP}/pages/base_page.py", "<lambda>", 42),
+    ]
+    
+    assert StallWatchdog.find_callback(stack) == f"<lambda> ({APP}/pages/base_page.py:42)"
+
+def test_outside_a_tk_callback_names_the_innermost_app_frame():
+    stack = [
+        frame(f"{APP}/main.py", "main"),
+        frame(f"{APP}/utils/data_manager.py", "save_data", 88),
+        frame("/usr/lib/python3/json/encoder.py", "iterencode"),
+    ]
+    
+    assert StallWatchdog.find_callback(stack) == f"save_data ({APP}/utils/data_manager.py:88)"
+
+def test_callback_with_only_tkinter_frames_below_it():
+    stack = [
+        frame(f"{APP}/main.py", "main", 7),
+        frame(TKINTER, "__call__"),
+        frame(TKINTER, "update_idletasks"),
+    ]
+    
+    assert StallWatchdog.find_callback(stack) == f"main ({APP}/main.py:7)"